@@ -0,0 +1,120 @@
+import asyncio
+import json
+import logging
+from typing import Any, AsyncIterator, Dict, Optional
+from urllib.parse import urljoin
+
+import aiohttp
+
+from agents.tracing import get_tracer, inject
+from agents.streaming import forward, streaming_active, RESULT, ERROR
+from .types import AgentCard, card_from_dict
+
+logger = logging.getLogger(__name__)
+
+class A2AClient:
+    """Keep-alive HTTP client shared by every remote agent proxy.
+
+    One ``aiohttp.ClientSession`` (and its connection pool) is opened lazily
+    and reused for all calls, so repeated messages to the same agent reuse
+    warm TCP connections instead of reconnecting each time.
+    """
+
+    def __init__(self, max_connections: int = 100, max_per_host: int = 20,
+                 keepalive_timeout: float = 30.0, timeout: float = 300.0):
+        self.max_connections = max_connections
+        self.max_per_host = max_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_per_host,
+                keepalive_timeout=self.keepalive_timeout
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                json_serialize=lambda data: json.dumps(data, default=str)
+            )
+        return self._session
+
+    async def send(self, base_url: str, message: Dict[str, Any]) -> Dict[str, Any]:
+        async with self._get_session().post(urljoin(base_url, "messages"), json=message) as response:
+            response.raise_for_status()
+            return await response.json()
+
+    async def stream(self, base_url: str, message: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        async with self._get_session().post(urljoin(base_url, "messages/stream"), json=message) as response:
+            response.raise_for_status()
+            async for line in response.content:
+                if line.strip():
+                    yield json.loads(line)
+
+    async def fetch_card(self, base_url: str) -> Dict[str, Any]:
+        async with self._get_session().get(urljoin(base_url, ".well-known/agent.json")) as response:
+            response.raise_for_status()
+            return await response.json()
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+_default_client: Optional[A2AClient] = None
+
+def get_client() -> A2AClient:
+    global _default_client
+    if _default_client is None:
+        _default_client = A2AClient()
+    return _default_client
+
+class RemoteAgent:
+    """Stands in for an agent served by ``a2a.server`` on another process or host.
+
+    It exposes the same ``process_message`` coroutine as a local agent, so
+    the registry can hand either one to callers.
+    """
+
+    is_remote = True
+
+    def __init__(self, name: str, url: str, client: Optional[A2AClient] = None):
+        self.name = name
+        self.url = url if url.endswith("/") else url + "/"
+        self.client = client or get_client()
+        self.registry = None
+        self.in_flight = 0
+        self.agent_card: Optional[AgentCard] = None
+
+    async def process_message(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        self.in_flight += 1
+        with get_tracer().start_span(f"a2a.send {self.name}", {"a2a.url": self.url}, "client"):
+            try:
+                if streaming_active():
+                    return await self._relay_stream(message)
+                return await self.client.send(self.url, inject(message))
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.error(f"Remote agent {self.name} at {self.url} failed: {e}")
+                return {"status": "error", "message": f"Remote agent {self.name} unavailable: {e}"}
+            finally:
+                self.in_flight -= 1
+
+    async def _relay_stream(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        # A caller is streaming: pass the remote agent's progress events through
+        async for event in self.client.stream(self.url, inject(message)):
+            if event["type"] == RESULT:
+                return event["data"]
+            if event["type"] == ERROR:
+                return {"status": "error", "message": event["data"].get("message", "")}
+            forward(event)
+        return {"status": "error", "message": f"Remote agent {self.name} closed the stream without a result"}
+
+    async def stream_message(self, message: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        async for event in self.client.stream(self.url, inject(message)):
+            yield event
+
+    async def get_agent_card(self) -> AgentCard:
+        self.agent_card = card_from_dict(await self.client.fetch_card(self.url))
+        return self.agent_card
@@ -0,0 +1,170 @@
+import argparse
+import asyncio
+import functools
+import json
+import logging
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional
+
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+_dumps = functools.partial(json.dumps, default=str)
+
+class A2AServer:
+    """Serves one agent over HTTP at its card URL.
+
+    Routes:
+      GET  /.well-known/agent.json  agent card
+      GET  /health                  liveness
+      POST /messages                one JSON message, one JSON result
+      POST /messages/stream         one JSON message, newline-delimited JSON events
+    """
+
+    def __init__(self, agent, host: str = "localhost", port: Optional[int] = None):
+        self.agent = agent
+        self.host = host
+        self.port = port or agent.port
+        self._runner: Optional[web.AppRunner] = None
+
+    def build_app(self) -> web.Application:
+        app = web.Application(client_max_size=16 * 1024 * 1024)
+        app.router.add_get("/.well-known/agent.json", self._handle_card)
+        app.router.add_get("/health", self._handle_health)
+        app.router.add_post("/messages", self._handle_message)
+        app.router.add_post("/messages/stream", self._handle_stream)
+        return app
+
+    async def start(self):
+        self._runner = web.AppRunner(self.build_app())
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        logger.info(f"Serving {self.agent.name} on http://{self.host}:{self.port}/")
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _handle_card(self, request: web.Request) -> web.Response:
+        return web.json_response(asdict(self.agent.agent_card), dumps=_dumps)
+
+    async def _handle_health(self, request: web.Request) -> web.Response:
+        return web.json_response({"status": "ok", "agent": self.agent.name})
+
+    async def _read_message(self, request: web.Request) -> Dict[str, Any]:
+        try:
+            message = await request.json()
+        except json.JSONDecodeError:
+            raise web.HTTPBadRequest(text="Message body must be JSON")
+        if not isinstance(message, dict):
+            raise web.HTTPBadRequest(text="Message body must be a JSON object")
+        if "traceparent" in request.headers and "traceparent" not in message:
+            message["traceparent"] = request.headers["traceparent"]
+        return message
+
+    async def _handle_message(self, request: web.Request) -> web.Response:
+        message = await self._read_message(request)
+        try:
+            result = await self.agent.process_message(message)
+        except Exception as e:
+            logger.error(f"{self.agent.name} failed to process message: {e}")
+            result = {"status": "error", "message": str(e)}
+        return web.json_response(result, dumps=_dumps)
+
+    async def _handle_stream(self, request: web.Request) -> web.StreamResponse:
+        message = await self._read_message(request)
+        response = web.StreamResponse(headers={"Content-Type": "application/x-ndjson"})
+        await response.prepare(request)
+
+        try:
+            async for event in self.agent.stream_message(message):
+                await response.write((_dumps(event) + "\n").encode("utf-8"))
+        except Exception as e:
+            logger.error(f"{self.agent.name} failed while streaming: {e}")
+            error = {"type": "error", "agent": self.agent.name, "data": {"message": str(e)}}
+            await response.write((_dumps(error) + "\n").encode("utf-8"))
+
+        await response.write_eof()
+        return response
+
+class DiscoveryServer:
+    """Serves the registry's view of every agent.
+
+    Routes:
+      GET /.well-known/agents.json  all cards with per-replica load
+      GET /skills/{skill}           least-loaded agent offering a skill id or tag
+    """
+
+    def __init__(self, registry, host: str = "localhost", port: int = 9000):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._runner: Optional[web.AppRunner] = None
+
+    def build_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/.well-known/agents.json", self._handle_agents)
+        app.router.add_get("/skills/{skill}", self._handle_skill)
+        return app
+
+    async def start(self):
+        self._runner = web.AppRunner(self.build_app())
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        logger.info(f"Serving agent discovery on http://{self.host}:{self.port}/")
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _handle_agents(self, request: web.Request) -> web.Response:
+        return web.json_response(self.registry.describe(), dumps=_dumps)
+
+    async def _handle_skill(self, request: web.Request) -> web.Response:
+        try:
+            agent = self.registry.find_by_skill(request.match_info["skill"])
+        except KeyError as e:
+            raise web.HTTPNotFound(text=str(e))
+        except ValueError as e:
+            raise web.HTTPConflict(text=str(e))
+        return web.json_response({
+            "name": agent.name,
+            "url": getattr(agent, "url", None) or agent.agent_card.url,
+            "in_flight": agent.in_flight
+        })
+
+async def serve_agents(keys: List[str], host: str = "localhost") -> List[A2AServer]:
+    """Start an HTTP server for each registry key on the agent's own port."""
+    from agents.registry import get_default_registry
+
+    registry = get_default_registry()
+    servers = [A2AServer(registry.get(key), host) for key in keys]
+    for server in servers:
+        await server.start()
+    return servers
+
+async def main(keys: List[str], host: str, discovery_port: Optional[int]):
+    servers = await serve_agents(keys, host)
+    if discovery_port:
+        from agents.registry import get_default_registry
+        discovery = DiscoveryServer(get_default_registry(), host, discovery_port)
+        await discovery.start()
+        servers.append(discovery)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        for server in servers:
+            await server.stop()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve A2A agents over HTTP")
+    parser.add_argument("agents", nargs="*", help="Registry keys to serve (default: all)")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--discovery-port", type=int, default=9000, help="Port for the discovery endpoint (0 to disable)")
+    args = parser.parse_args()
+
+    from agents.registry import get_default_registry
+    asyncio.run(main(args.agents or get_default_registry().keys(), args.host, args.discovery_port))
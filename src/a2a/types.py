@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import List
+from typing import Any, Dict, List
 
 @dataclass
 class AgentSkill:
@@ -23,3 +23,15 @@ class AgentCard:
     defaultOutputModes: List[str]
     capabilities: AgentCapabilities
     skills: List[AgentSkill]
+
+def card_from_dict(data: Dict[str, Any]) -> AgentCard:
+    return AgentCard(
+        name=data["name"],
+        description=data["description"],
+        url=data["url"],
+        version=data["version"],
+        defaultInputModes=data.get("defaultInputModes", []),
+        defaultOutputModes=data.get("defaultOutputModes", []),
+        capabilities=AgentCapabilities(**data.get("capabilities", {"streaming": False})),
+        skills=[AgentSkill(**skill) for skill in data.get("skills", [])]
+    )
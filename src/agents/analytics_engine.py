@@ -0,0 +1,257 @@
+import math
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Set
+
+RESOLUTIONS = OrderedDict([("day", 86400), ("hour", 3600), ("minute", 60)])
+DEFAULT_RETENTION = {"minute": 24 * 60, "hour": 14 * 24, "day": 400}
+
+class QuantileSketch:
+    """Log-bucketed quantile sketch with bounded relative error.
+
+    Values fall into buckets whose bounds grow by ``gamma``, so any quantile
+    is answered within ``relative_accuracy`` of the true value, and two
+    sketches merge by adding bucket counts.
+    """
+
+    __slots__ = ("gamma", "log_gamma", "buckets", "zeros", "count", "total", "maximum")
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets: Dict[int, int] = {}
+        self.zeros = 0
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def add(self, value: float):
+        self.count += 1
+        self.total += value
+        self.maximum = max(self.maximum, value)
+        if value <= 0:
+            self.zeros += 1
+            return
+        index = math.ceil(math.log(value) / self.log_gamma)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def scaled(self, fraction: float) -> "QuantileSketch":
+        """Copy with every count weighted by ``fraction``, for a share of a bucket's values."""
+        part = QuantileSketch.__new__(QuantileSketch)
+        part.gamma, part.log_gamma = self.gamma, self.log_gamma
+        part.buckets = {index: count * fraction for index, count in self.buckets.items()}
+        part.zeros = self.zeros * fraction
+        part.count = self.count * fraction
+        part.total = self.total * fraction
+        part.maximum = self.maximum
+        return part
+
+    def merge(self, other: "QuantileSketch"):
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.zeros += other.zeros
+        self.count += other.count
+        self.total += other.total
+        self.maximum = max(self.maximum, other.maximum)
+
+    def quantile(self, q: float) -> float:
+        if self.count == 0:
+            return 0.0
+        # Scaled sketches can hold fractional counts below one
+        rank = q * max(self.count - 1, 0)
+        seen = self.zeros
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen > rank:
+                return min(2 * self.gamma ** index / (self.gamma + 1), self.maximum)
+        return self.maximum
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "avg": self.total / self.count if self.count > 0 else 0,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99),
+            "max": self.maximum
+        }
+
+class AnalyticsBucket:
+    __slots__ = ("events", "errors", "orders", "orders_succeeded", "agent_latency", "stage_latency")
+
+    def __init__(self):
+        self.events = 0
+        self.errors = 0
+        self.orders = 0
+        self.orders_succeeded = 0
+        self.agent_latency: Dict[str, QuantileSketch] = {}
+        self.stage_latency: Dict[str, QuantileSketch] = {}
+
+    def scaled(self, fraction: float) -> "AnalyticsBucket":
+        part = AnalyticsBucket()
+        part.events = self.events * fraction
+        part.errors = self.errors * fraction
+        part.orders = self.orders * fraction
+        part.orders_succeeded = self.orders_succeeded * fraction
+        part.agent_latency = {name: sketch.scaled(fraction) for name, sketch in self.agent_latency.items()}
+        part.stage_latency = {name: sketch.scaled(fraction) for name, sketch in self.stage_latency.items()}
+        return part
+
+    def merge(self, other: "AnalyticsBucket"):
+        self.events += other.events
+        self.errors += other.errors
+        self.orders += other.orders
+        self.orders_succeeded += other.orders_succeeded
+        for mine, theirs in ((self.agent_latency, other.agent_latency), (self.stage_latency, other.stage_latency)):
+            for name, sketch in theirs.items():
+                mine.setdefault(name, QuantileSketch()).merge(sketch)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "events": self.events,
+            "errors": self.errors,
+            "error_rate": self.errors / self.events if self.events > 0 else 0,
+            "orders": self.orders,
+            "orders_succeeded": self.orders_succeeded,
+            "success_rate": self.orders_succeeded / self.orders if self.orders > 0 else None,
+            "agent_latency": {name: sketch.summary() for name, sketch in self.agent_latency.items()},
+            "stage_latency": {name: sketch.summary() for name, sketch in self.stage_latency.items()}
+        }
+
+class AnalyticsEngine:
+    """Pre-aggregated minute, hour and day rollups of log events.
+
+    Every event is added to one bucket per resolution, and old buckets are
+    dropped once they fall outside that resolution's retention. A window
+    query covers whole days with day buckets, the remaining whole hours
+    with hour buckets and the ragged edges with minute buckets, so its
+    cost depends on the window length rather than the number of events.
+    Where finer buckets have expired the edge falls back to the enclosing
+    coarser bucket, counting only the share of it that overlaps the window
+    (events are assumed to be spread evenly), and the result is marked
+    ``approximate``.
+
+    Events carry their metrics in ``data``: ``duration`` feeds the agent's
+    latency sketch, ``stages`` maps stage names to seconds, and
+    ``order_status`` marks the event as a finished order. Agent latencies
+    also come in through ``record_latency``, which LoggerAgent feeds from
+    the process_message span of every traced agent; ``latency_agents``
+    lists the agents with latency figures.
+    """
+
+    def __init__(self, retention: Optional[Dict[str, int]] = None):
+        self.retention = {**DEFAULT_RETENTION, **(retention or {})}
+        self.buckets: Dict[str, "OrderedDict[int, AnalyticsBucket]"] = {name: OrderedDict() for name in RESOLUTIONS}
+        self._latest: Dict[str, int] = {}
+        self.latency_agents: Set[str] = set()
+
+    def record(self, timestamp: datetime, agent: str, level: str, data: Dict[str, Any]):
+        epoch = self._epoch(timestamp)
+        duration = data.get("duration")
+        stages = data.get("stages") or {}
+        order_status = data.get("order_status")
+        if isinstance(duration, (int, float)):
+            self.latency_agents.add(agent)
+
+        for name, size in RESOLUTIONS.items():
+            key = int(epoch // size)
+            if not self._retained(name, key):
+                # Late event for a bucket that has already expired
+                continue
+            bucket = self._bucket(name, key)
+            bucket.events += 1
+            if level == "error":
+                bucket.errors += 1
+            if isinstance(duration, (int, float)):
+                bucket.agent_latency.setdefault(agent, QuantileSketch()).add(duration)
+            for stage, seconds in stages.items():
+                bucket.stage_latency.setdefault(stage, QuantileSketch()).add(seconds)
+            if order_status is not None:
+                bucket.orders += 1
+                if order_status == "order_completed":
+                    bucket.orders_succeeded += 1
+
+    def record_latency(self, timestamp: datetime, agent: str, duration: float):
+        """Add a measured duration to ``agent``'s latency sketch without counting an event."""
+        epoch = self._epoch(timestamp)
+        self.latency_agents.add(agent)
+        for name, size in RESOLUTIONS.items():
+            key = int(epoch // size)
+            if self._retained(name, key):
+                self._bucket(name, key).agent_latency.setdefault(agent, QuantileSketch()).add(duration)
+
+    def _bucket(self, resolution: str, key: int) -> AnalyticsBucket:
+        buckets = self.buckets[resolution]
+        bucket = buckets.get(key)
+        if bucket is None:
+            bucket = buckets[key] = AnalyticsBucket()
+            self._latest[resolution] = max(key, self._latest.get(resolution, key))
+            # Keys arrive in near time order, so only the oldest entries can expire
+            # An event older than the retention can expire its own bucket, emptying the dict
+            while buckets and not self._retained(resolution, next(iter(buckets))):
+                buckets.popitem(last=False)
+        return bucket
+
+    def _retained(self, resolution: str, key: int) -> bool:
+        latest = self._latest.get(resolution)
+        return latest is None or key > latest - self.retention[resolution]
+
+    def query(self, start: datetime, end: datetime) -> Dict[str, Any]:
+        """Aggregate everything recorded in ``[start, end)``."""
+        total = AnalyticsBucket()
+        cursor = int(self._epoch(start)) // 60 * 60
+        finish = self._epoch(end)
+
+        names = list(RESOLUTIONS)
+        approximate = False
+        while cursor < finish:
+            # Coarsest bucket that lies wholly inside the window, else a minute
+            name = next(
+                (name for name, size in RESOLUTIONS.items() if cursor % size == 0 and cursor + size <= finish),
+                "minute"
+            )
+            # Fall back to the nearest coarser bucket once finer ones have expired
+            candidates = [n for n in reversed(names[:names.index(name) + 1]) if self._retained(n, cursor // RESOLUTIONS[n])]
+            name = candidates[0] if candidates else name
+
+            size = RESOLUTIONS[name]
+            key = cursor // size
+            bucket_end = (key + 1) * size
+            bucket = self.buckets[name].get(key)
+            if bucket is not None:
+                covered = min(finish, bucket_end) - cursor
+                if name != "minute" and covered < size:
+                    # A fallback bucket reaching outside the window; count only its overlapping share
+                    bucket = bucket.scaled(covered / size)
+                    approximate = True
+                total.merge(bucket)
+            cursor = bucket_end
+
+        return {"start": start.isoformat(), "end": end.isoformat(), **total.summary(), "approximate": approximate}
+
+    def series(self, resolution: str, start: datetime, end: datetime) -> List[Dict[str, Any]]:
+        size = RESOLUTIONS[resolution]
+        buckets = self.buckets[resolution]
+        points = []
+        for key in range(int(self._epoch(start)) // size, math.ceil(self._epoch(end) / size)):
+            bucket = buckets.get(key)
+            points.append({
+                "start": datetime.fromtimestamp(key * size, timezone.utc).isoformat(),
+                "events": bucket.events if bucket else 0,
+                "errors": bucket.errors if bucket else 0,
+                "orders": bucket.orders if bucket else 0,
+                "success_rate": bucket.orders_succeeded / bucket.orders if bucket and bucket.orders > 0 else None
+            })
+        return points
+
+    def window_summaries(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        now = now or datetime.now(timezone.utc)
+        windows = {"last_hour": timedelta(hours=1), "last_day": timedelta(days=1), "last_week": timedelta(days=7)}
+        return {name: self.query(now - span, now) for name, span in windows.items()}
+
+    @staticmethod
+    def _epoch(moment: datetime) -> float:
+        # Naive timestamps are local time, matching datetime.now() in the log store
+        return moment.timestamp()
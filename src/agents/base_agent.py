@@ -1,48 +1,68 @@
+import functools
 import logging
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from typing import Dict, List, Any
-
-@dataclass
-class AgentSkill:
-    id: str
-    name: str
-    description: str
-    tags: List[str]
-    examples: List[str]
-
-@dataclass
-class AgentCapabilities:
-    streaming: bool
-
-@dataclass
-class AgentCard:
-    name: str
-    description: str
-    url: str
-    version: str
-    defaultInputModes: List[str]
-    defaultOutputModes: List[str]
-    capabilities: AgentCapabilities
-    skills: List[AgentSkill]
+from typing import AsyncIterator, Dict, Any
+from a2a.types import AgentCard, AgentSkill, AgentCapabilities
+from .tracing import traced_process_message
+from .streaming import stream_call
+
+def _track_in_flight(method):
+    # The registry routes to the replica with the fewest messages in progress
+    @functools.wraps(method)
+    async def wrapper(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        self.in_flight += 1
+        try:
+            return await method(self, message)
+        finally:
+            self.in_flight -= 1
+
+    wrapper.__instrumented__ = True
+    return wrapper
 
 class BaseA2AAgent(ABC):
+    # Every process_message runs inside a tracing span unless a subclass opts out
+    trace_messages = True
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        method = cls.__dict__.get("process_message")
+        if method is None or getattr(method, "__instrumented__", False):
+            return
+        if cls.trace_messages:
+            method = traced_process_message(method)
+        cls.process_message = _track_in_flight(method)
+
     def __init__(self, name: str, description: str, port: int):
         self.name = name
         self.description = description
         self.port = port
+        self.registry = None
+        self.in_flight = 0
         self.agent_card = self._create_agent_card()
         self.logger = self._setup_logger()
 
     def _setup_logger(self) -> logging.Logger:
         logger = logging.getLogger(self.name)
         logger.setLevel(logging.INFO)
-        handler = logging.StreamHandler()
-        formatter = logging.Formatter(f'[{self.name}] %(levelname)s: %(message)s')
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
+        if not logger.handlers:
+            handler = logging.StreamHandler()
+            formatter = logging.Formatter(f'[{self.name}] %(levelname)s: %(message)s')
+            handler.setFormatter(formatter)
+            logger.addHandler(handler)
         return logger
 
+    def _get_registry(self):
+        if self.registry is None:
+            from .registry import get_default_registry
+            self.registry = get_default_registry()
+        return self.registry
+
+    def get_peer(self, key: str) -> "BaseA2AAgent":
+        return self._get_registry().get(key)
+
+    def get_peer_for_skill(self, skill: str) -> "BaseA2AAgent":
+        return self._get_registry().find_by_skill(skill)
+
     @abstractmethod
     def _create_agent_card(self) -> AgentCard:
         pass
@@ -50,3 +70,8 @@ class BaseA2AAgent(ABC):
     @abstractmethod
     async def process_message(self, message: Dict[str, Any]) -> Dict[str, Any]:
         pass
+
+    async def stream_message(self, message: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """Yield progress events while ``message`` is processed, ending with a ``result`` event."""
+        async for event in stream_call(self.name, lambda: self.process_message(message)):
+            yield event.to_dict()
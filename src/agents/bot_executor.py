@@ -0,0 +1,192 @@
+import asyncio
+import contextvars
+import itertools
+import logging
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class BotJob:
+    job_id: str
+    timeout: float
+    future: asyncio.Future
+    user_id: str = "default"
+    # Parsed items to order; None orders the bot's default Global Favorites
+    items: Optional[List[str]] = None
+    status: str = "queued"
+    bot: Any = None
+    attempts: int = 0
+    submitted_at: float = field(default_factory=time.monotonic)
+    started_at: Optional[float] = None
+    # The submitter's context, so spans from the bot thread join its trace
+    context: contextvars.Context = field(default_factory=contextvars.copy_context)
+
+class OrderBotExecutor:
+    """Runs blocking Selenium order bots on a dedicated thread pool.
+
+    Jobs wait in an asyncio queue and ``workers`` coroutines each feed one
+    pool thread, so at most ``workers`` Chrome instances run at once and
+    the event loop never blocks on WebDriver. A job that exceeds its
+    timeout, or is cancelled, has its bot cancelled, which quits the
+    browser (on a helper thread, since ``driver.quit()`` blocks until Chrome
+    exits) so the thread unwinds at its next WebDriver call. A run that
+    fails is retried up to ``retries`` times with a fresh bot under the same
+    job id, which resumes from the failed run's last checkpoint. Once a job
+    has finished without completing, its checkpoint in ``checkpoints`` is
+    deleted, since nothing will resume from it.
+    """
+
+    def __init__(self, bot_factory: Callable[[], Any], workers: int = 2, timeout: float = 300.0,
+                 max_queue: int = 100, shutdown_grace: float = 10.0, max_finished: int = 1000, retries: int = 1,
+                 checkpoints=None):
+        if workers < 1:
+            raise ValueError("Executor needs at least one worker")
+        self.bot_factory = bot_factory
+        self.workers = workers
+        self.timeout = timeout
+        self.max_queue = max_queue
+        self.shutdown_grace = shutdown_grace
+        self.retries = retries
+        self.checkpoints = checkpoints
+        self.jobs: Dict[str, BotJob] = {}
+        self._finished = deque()
+        self.max_finished = max_finished
+        self._ids = itertools.count(1)
+        self._queue: Optional[asyncio.Queue] = None
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._tasks: List[asyncio.Task] = []
+        self._stopping: Set[asyncio.Future] = set()
+        self.stats = {"submitted": 0, "completed": 0, "failed": 0, "timed_out": 0, "cancelled": 0, "retries": 0, "run_time": 0.0}
+
+    def _ensure_started(self):
+        if self._pool is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+            self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="order-bot")
+            self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def submit(self, timeout: Optional[float] = None, user_id: str = "default",
+                     items: Optional[List[str]] = None) -> str:
+        """Queue a bot run ordering ``items`` for ``user_id`` and return its job id; waits if the queue is full."""
+        self._ensure_started()
+        job = BotJob(f"bot_job_{next(self._ids)}", timeout or self.timeout, asyncio.get_running_loop().create_future(),
+                     user_id, items)
+        self.jobs[job.job_id] = job
+        self.stats["submitted"] += 1
+        await self._queue.put(job)
+        return job.job_id
+
+    async def result(self, job_id: str) -> Dict[str, Any]:
+        return await asyncio.shield(self.jobs[job_id].future)
+
+    async def run(self, timeout: Optional[float] = None, user_id: str = "default",
+                  items: Optional[List[str]] = None) -> Dict[str, Any]:
+        return await self.result(await self.submit(timeout, user_id, items))
+
+    def cancel(self, job_id: str) -> bool:
+        job = self.jobs.get(job_id)
+        if job is None or job.future.done():
+            return False
+        if job.bot is not None:
+            self._cancel_bot(job.bot)
+        self._finish(job, "cancelled")
+        return True
+
+    def _cancel_bot(self, bot):
+        stopping = asyncio.get_running_loop().run_in_executor(None, bot.cancel)
+        self._stopping.add(stopping)
+        stopping.add_done_callback(self._stopping.discard)
+
+    async def _worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self._queue.get()
+            try:
+                if job.future.done():
+                    continue
+                await self._run_job(loop, job)
+            except Exception as e:
+                logger.error(f"Bot job {job.job_id} failed: {e}")
+                self._finish(job, "failed", error=str(e))
+            finally:
+                self._queue.task_done()
+
+    async def _run_job(self, loop: asyncio.AbstractEventLoop, job: BotJob):
+        job.status = "running"
+        job.started_at = time.monotonic()
+        # Attempts share a run id, which keys the checkpoint they resume from
+        run_id = f"{job.job_id}_{uuid.uuid4().hex[:8]}"
+
+        try:
+            while not job.future.done():
+                job.bot = self.bot_factory()
+                job.attempts += 1
+                run = loop.run_in_executor(self._pool, job.context.copy().run, job.bot.run_order_process,
+                                           run_id, job.user_id, job.items)
+
+                try:
+                    ok = await asyncio.wait_for(asyncio.shield(run), job.timeout)
+                except asyncio.TimeoutError:
+                    logger.warning(f"Bot job {job.job_id} timed out after {job.timeout}s")
+                    self._cancel_bot(job.bot)
+                    self._finish(job, "timed_out")
+                else:
+                    if ok:
+                        self._finish(job, "completed")
+                    elif job.attempts > self.retries:
+                        self._finish(job, "failed")
+                    elif not job.future.done():
+                        logger.info(f"Bot job {job.job_id} failed on attempt {job.attempts}, retrying from its checkpoint")
+                        self.stats["retries"] += 1
+
+                # The thread stays busy until the cancelled bot unwinds; hold the worker slot until then
+                await asyncio.wait({run}, timeout=self.shutdown_grace)
+        finally:
+            if self.checkpoints is not None and job.status != "completed":
+                # No attempt is left to resume from it
+                await asyncio.to_thread(self.checkpoints.delete, run_id)
+
+    def _finish(self, job: BotJob, status: str, error: Optional[str] = None):
+        if job.future.done():
+            return
+        job.status = status
+        self.stats[status] += 1
+        duration = time.monotonic() - job.started_at if job.started_at else 0.0
+        self.stats["run_time"] += duration
+
+        result = {"status": status, "job_id": job.job_id, "duration": duration, "attempts": job.attempts}
+        if job.bot is not None:
+            result["steps"] = job.bot.timer.report()["steps"]
+            if job.bot.resumed:
+                result["resumed"] = job.bot.resumed
+        if error:
+            result["error"] = error
+        job.future.set_result(result)
+
+        self._finished.append(job.job_id)
+        while len(self._finished) > self.max_finished:
+            self.jobs.pop(self._finished.popleft(), None)
+
+    async def close(self):
+        for job in list(self.jobs.values()):
+            self.cancel(job.job_id)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        await asyncio.gather(*self._stopping, return_exceptions=True)
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "workers": self.workers,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "running": sum(1 for job in self.jobs.values() if job.status == "running")
+        }
@@ -0,0 +1,138 @@
+import logging
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROFILE_ROOT = os.path.join(os.path.expanduser("~"), ".cache", "mcdonalds-a2a", "chrome-profile")
+
+IMAGE_PATTERNS = ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.ico"]
+FONT_PATTERNS = ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"]
+MEDIA_PATTERNS = ["*.mp4", "*.webm", "*.m3u8", "*.mp3"]
+TRACKER_PATTERNS = [
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*doubleclick.net*",
+    "*connect.facebook.net*",
+    "*segment.io*",
+    "*segment.com/analytics*",
+    "*hotjar.com*",
+    "*optimizely.com*",
+    "*newrelic.com*",
+    "*nr-data.net*",
+    "*sentry.io*",
+    "*branch.io*",
+    "*amplitude.com*"
+]
+
+# Bytes and timings for the current document, from the Resource Timing API.
+# timeOrigin identifies the document so per-step deltas survive navigations.
+PAGE_METRICS_SCRIPT = """
+const nav = performance.getEntriesByType('navigation')[0];
+const resources = performance.getEntriesByType('resource');
+let bytes = nav ? nav.transferSize : 0;
+for (const r of resources) bytes += r.transferSize || 0;
+return {
+    origin: performance.timeOrigin,
+    bytes: bytes,
+    requests: resources.length + (nav ? 1 : 0),
+    dom_content_loaded: nav ? nav.domContentLoadedEventEnd / 1000 : null,
+    load: nav && nav.loadEventEnd > 0 ? nav.loadEventEnd / 1000 : null
+};
+"""
+
+@dataclass
+class BrowserProfile:
+    """Chrome settings tuned for automated ordering rather than for people.
+
+    Blocking happens at the network layer through CDP, so blocked requests
+    never leave the browser. With ``user_data_dir`` set, each user gets a
+    persistent profile underneath it, one per worker thread (Chrome cannot
+    share one between running instances), which keeps the HTTP cache warm
+    across runs without ever handing one user's cookies to another.
+    """
+
+    headless: bool = True
+    page_load_strategy: str = "eager"
+    block_images: bool = True
+    block_fonts: bool = True
+    block_media: bool = True
+    block_trackers: bool = True
+    blocked_urls: List[str] = field(default_factory=list)
+    user_data_dir: Optional[str] = DEFAULT_PROFILE_ROOT
+    window_size: str = "1366,900"
+    # Stretches the bot's page waits, which default to the fixed sleeps they replaced
+    settle_scale: float = 1.0
+
+    def ready_states(self) -> Tuple[str, ...]:
+        """Document readyStates to treat as loaded; eager loading returns at DOMContentLoaded."""
+        if self.page_load_strategy in ("eager", "none"):
+            return ("interactive", "complete")
+        return ("complete",)
+
+    def blocked_url_patterns(self) -> List[str]:
+        patterns = list(self.blocked_urls)
+        if self.block_images:
+            patterns += IMAGE_PATTERNS
+        if self.block_fonts:
+            patterns += FONT_PATTERNS
+        if self.block_media:
+            patterns += MEDIA_PATTERNS
+        if self.block_trackers:
+            patterns += TRACKER_PATTERNS
+        return patterns
+
+    def profile_dir(self, user_id: str = "default") -> Optional[str]:
+        if not self.user_data_dir:
+            return None
+        user = re.sub(r"[^\w.-]", "_", user_id)
+        path = os.path.abspath(os.path.join(self.user_data_dir, user, threading.current_thread().name))
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def apply_to_options(self, options, user_id: str = "default"):
+        options.page_load_strategy = self.page_load_strategy
+        if self.headless:
+            options.add_argument("--headless=new")
+            options.add_argument(f"--window-size={self.window_size}")
+
+        profile_dir = self.profile_dir(user_id)
+        if profile_dir:
+            options.add_argument(f"--user-data-dir={profile_dir}")
+
+    def apply_to_driver(self, driver):
+        patterns = self.blocked_url_patterns()
+        if not patterns:
+            return
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        except Exception as e:
+            logger.warning(f"Could not enable request blocking: {e}")
+
+class PageMetrics:
+    """Attributes transferred bytes and load times to bot steps."""
+
+    def __init__(self):
+        self._origin = None
+        self._bytes = 0
+
+    def sample(self, driver) -> Dict[str, Any]:
+        try:
+            metrics = driver.execute_script(PAGE_METRICS_SCRIPT)
+        except Exception as e:
+            logger.debug(f"Could not read page metrics: {e}")
+            return {}
+
+        # A new document resets the counters, so everything it loaded belongs to this step
+        previous = self._bytes if metrics["origin"] == self._origin else 0
+        self._origin, self._bytes = metrics["origin"], metrics["bytes"]
+        return {
+            "bytes": metrics["bytes"] - previous,
+            "requests": metrics["requests"],
+            "dom_content_loaded": metrics["dom_content_loaded"],
+            "load": metrics["load"]
+        }
@@ -1,9 +1,24 @@
+from typing import Dict, Any
 from .base_agent import BaseA2AAgent, AgentCard, AgentSkill, AgentCapabilities
+from .checkout_graph import CheckoutGraph, CheckoutStep, CheckoutStepError
+from .checkout_services import LocalAuthService, LocalAddressService, LocalPaymentService, LocalRestaurantService
+from .streaming import emit, CHECKOUT_STEP
 from datetime import datetime, timedelta
 
 class CheckoutAgent(BaseA2AAgent):
-    def __init__(self):
+    def __init__(self, auth_service=None, address_service=None, payment_service=None, restaurant_service=None):
         super().__init__("CheckoutAgent", "Secure checkout and payment processing", 9005)
+        self.auth_service = auth_service or LocalAuthService()
+        self.address_service = address_service or LocalAddressService()
+        self.payment_service = payment_service or LocalPaymentService()
+        self.restaurant_service = restaurant_service or LocalRestaurantService()
+        self.checkout_graph = CheckoutGraph([
+            CheckoutStep("authenticate", self._authenticate, timeout=10.0),
+            CheckoutStep("verify_address", self._verify_address, ["authenticate"], timeout=5.0),
+            CheckoutStep("validate_payment", self._validate_payment, ["authenticate"], timeout=5.0),
+            CheckoutStep("confirm_order", self._confirm_order, ["verify_address", "validate_payment"], timeout=10.0),
+            CheckoutStep("place_order", self._place_order, ["confirm_order"], timeout=15.0)
+        ])
 
     def _create_agent_card(self) -> AgentCard:
         skills = [
@@ -38,26 +53,42 @@ class CheckoutAgent(BaseA2AAgent):
         cart_id = message.get("cart_id", "")
         self.logger.info(f"Processing checkout for cart: {cart_id}")
 
-        try:
-            checkout_steps = [
-                "Authenticating user credentials",
-                "Verifying delivery address in Chicago",
-                "Processing payment method",
-                "Confirming order details",
-                "Placing order with restaurant"
-            ]
+        # Without either, retries of different orders would share one key and replay each other's results
+        if not cart_id and not message.get("idempotency_key"):
+            return {
+                "status": "checkout_failed",
+                "error": "Checkout needs a cart_id or an idempotency_key"
+            }
 
-            for step in checkout_steps:
-                self.logger.info(f"Checkout step: {step}")
-                await asyncio.sleep(0.5)
+        try:
+            context = {
+                "cart_id": cart_id,
+                "user_id": message.get("user_id", "default_user"),
+                "address": message.get("address", "110 N Carpenter Street, Chicago, IL"),
+                "payment_method": message.get("payment_method", "card_on_file"),
+                "total_amount": message.get("total_amount", "$12.99")
+            }
+            idempotency_key = message.get("idempotency_key") or f"checkout:{cart_id}"
 
-            order_id = f"MC_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            results = await self.checkout_graph.run(
+                context,
+                idempotency_key,
+                lambda step, result: emit(CHECKOUT_STEP, self.name, step=step)
+            )
 
             return {
                 "status": "checkout_completed",
-                "order_id": order_id,
+                "order_id": results["place_order"]["order_id"],
                 "estimated_delivery": (datetime.now() + timedelta(minutes=30)).isoformat(),
-                "total_amount": "$12.99"
+                "total_amount": context["total_amount"]
+            }
+
+        except CheckoutStepError as e:
+            self.logger.error(f"Checkout failed: {str(e)}")
+            return {
+                "status": "checkout_failed",
+                "failed_step": e.step,
+                "error": str(e)
             }
 
         except Exception as e:
@@ -66,3 +97,26 @@ class CheckoutAgent(BaseA2AAgent):
                 "status": "checkout_failed",
                 "error": str(e)
             }
+
+    async def _authenticate(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        self.logger.info("Checkout step: Authenticating user credentials")
+        return await self.auth_service.authenticate(context["user_id"])
+
+    async def _verify_address(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        self.logger.info("Checkout step: Verifying delivery address in Chicago")
+        return await self.address_service.verify(context["address"])
+
+    async def _validate_payment(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        self.logger.info("Checkout step: Processing payment method")
+        return await self.payment_service.validate_method(context["payment_method"])
+
+    async def _confirm_order(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        self.logger.info("Checkout step: Confirming order details")
+        return await self.payment_service.authorize(context["total_amount"], context["idempotency_key"])
+
+    async def _place_order(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        self.logger.info("Checkout step: Placing order with restaurant")
+        return await self.restaurant_service.place_order(context["cart_id"], context["idempotency_key"])
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"step_latency": self.checkout_graph.get_stats()}
@@ -0,0 +1,141 @@
+import asyncio
+import bisect
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+class CheckoutStepError(Exception):
+    def __init__(self, step: str, error: BaseException):
+        super().__init__(f"Checkout step '{step}' failed: {error}")
+        self.step = step
+        self.error = error
+
+@dataclass
+class CheckoutStep:
+    name: str
+    run: Callable[[Dict[str, Any]], Awaitable[Any]]
+    depends_on: List[str] = field(default_factory=list)
+    timeout: float = 10.0
+
+class LatencyHistogram:
+    BOUNDS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.BOUNDS, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def snapshot(self) -> Dict[str, Any]:
+        buckets = {f"le_{bound}": count for bound, count in zip(self.BOUNDS, self.counts)}
+        buckets["le_inf"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "avg": self.total / self.count if self.count > 0 else 0,
+            "buckets": buckets
+        }
+
+class CheckoutGraph:
+    """Runs checkout steps as a dependency graph.
+
+    Every step starts as soon as the steps it depends on have finished, so
+    independent steps run concurrently. Each step has its own timeout, and
+    results are remembered per idempotency key: retrying a checkout with the
+    same key skips steps that already succeeded instead of repeating them.
+    """
+
+    def __init__(self, steps: List[CheckoutStep], max_remembered: int = 1000):
+        self.steps = {step.name: step for step in steps}
+        self.order = self._topological_order()
+        self.max_remembered = max_remembered
+        self.histograms = {name: LatencyHistogram() for name in self.steps}
+        self._completed: "OrderedDict[Tuple[str, str], Any]" = OrderedDict()
+
+    def _topological_order(self) -> List[str]:
+        order: List[str] = []
+        state: Dict[str, str] = {}
+
+        def visit(name: str):
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "visiting":
+                raise ValueError(f"Checkout steps have a dependency cycle at '{name}'")
+            if name not in self.steps:
+                raise ValueError(f"Unknown checkout step dependency '{name}'")
+            state[name] = "visiting"
+            for dependency in self.steps[name].depends_on:
+                visit(dependency)
+            state[name] = "done"
+            order.append(name)
+
+        for name in self.steps:
+            visit(name)
+        return order
+
+    async def run(
+        self,
+        context: Dict[str, Any],
+        idempotency_key: str,
+        on_step_done: Optional[Callable[[str, Any], None]] = None
+    ) -> Dict[str, Any]:
+        results: Dict[str, Any] = {}
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async def run_step(step: CheckoutStep):
+            await asyncio.gather(*(tasks[dependency] for dependency in step.depends_on))
+
+            remembered = (idempotency_key, step.name)
+            if remembered in self._completed:
+                results[step.name] = self._completed[remembered]
+                if on_step_done is not None:
+                    on_step_done(step.name, results[step.name])
+                return
+
+            started = time.monotonic()
+            try:
+                result = await asyncio.wait_for(
+                    step.run({**context, "results": results, "idempotency_key": f"{idempotency_key}:{step.name}"}),
+                    timeout=step.timeout
+                )
+            except asyncio.CancelledError:
+                raise
+            except asyncio.TimeoutError as e:
+                raise CheckoutStepError(step.name, TimeoutError(f"timed out after {step.timeout}s")) from e
+            except BaseException as e:
+                raise CheckoutStepError(step.name, e) from e
+            finally:
+                self.histograms[step.name].observe(time.monotonic() - started)
+
+            results[step.name] = result
+            self._remember(remembered, result)
+            if on_step_done is not None:
+                on_step_done(step.name, result)
+
+        for name in self.order:
+            tasks[name] = asyncio.create_task(run_step(self.steps[name]))
+
+        done, pending = await asyncio.wait(tasks.values(), return_when=asyncio.FIRST_EXCEPTION)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+        for name in self.order:
+            task = tasks[name]
+            if task in done and task.exception() is not None:
+                raise task.exception()
+
+        return results
+
+    def _remember(self, key: Tuple[str, str], result: Any):
+        self._completed[key] = result
+        while len(self._completed) > self.max_remembered:
+            self._completed.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {name: histogram.snapshot() for name, histogram in self.histograms.items()}
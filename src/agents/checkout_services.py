@@ -0,0 +1,52 @@
+import asyncio
+import uuid
+from datetime import datetime
+from typing import Any, Dict
+
+class LocalAuthService:
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+
+    async def authenticate(self, user_id: str) -> Dict[str, Any]:
+        await asyncio.sleep(self.latency)
+        return {"user_id": user_id, "authenticated": True}
+
+class LocalAddressService:
+    def __init__(self, service_area: str = "Chicago", latency: float = 0.0):
+        self.service_area = service_area
+        self.latency = latency
+
+    async def verify(self, address: str) -> Dict[str, Any]:
+        await asyncio.sleep(self.latency)
+        if self.service_area.lower() not in address.lower():
+            raise ValueError(f"Address outside delivery area: {address}")
+        return {"address": address, "verified": True}
+
+class LocalPaymentService:
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.authorizations: Dict[str, Dict[str, Any]] = {}
+
+    async def validate_method(self, method: str) -> Dict[str, Any]:
+        await asyncio.sleep(self.latency)
+        return {"method": method, "valid": True}
+
+    async def authorize(self, amount: str, idempotency_key: str) -> Dict[str, Any]:
+        await asyncio.sleep(self.latency)
+        if idempotency_key not in self.authorizations:
+            self.authorizations[idempotency_key] = {
+                "authorization_id": f"AUTH_{len(self.authorizations) + 1:06d}",
+                "amount": amount
+            }
+        return self.authorizations[idempotency_key]
+
+class LocalRestaurantService:
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.orders: Dict[str, str] = {}
+
+    async def place_order(self, cart_id: str, idempotency_key: str) -> Dict[str, Any]:
+        await asyncio.sleep(self.latency)
+        if idempotency_key not in self.orders:
+            self.orders[idempotency_key] = f"MC_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+        return {"order_id": self.orders[idempotency_key], "cart_id": cart_id}
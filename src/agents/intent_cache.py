@@ -0,0 +1,156 @@
+import json
+import os
+import re
+import time
+import logging
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+STOPWORDS = {"a", "an", "the", "me", "my", "i", "for", "please", "get", "some", "to", "of", "and", "order"}
+
+def normalize_request(text: str) -> str:
+    text = text.lower().replace("'", "").replace("\u2019", "")
+    return " ".join(re.findall(r"[a-z0-9]+", text))
+
+def request_tokens(text: str) -> Set[str]:
+    return {token for token in normalize_request(text).split() if token not in STOPWORDS}
+
+class IntentCache:
+    """Two-level cache for parsed menu intents.
+
+    Level one is an exact match on the normalized request plus menu version.
+    Level two finds the most similar cached request by token-set Jaccard
+    similarity, using an inverted token index so only requests sharing a
+    word are compared. Entries are evicted LRU beyond ``max_entries`` and
+    expire after ``ttl`` seconds; the cache is persisted as JSON.
+    """
+
+    def __init__(
+        self,
+        path: str = os.path.join(".cache", "intent_cache.json"),
+        max_entries: int = 512,
+        ttl: float = 7 * 24 * 3600,
+        similarity_threshold: float = 0.8
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.similarity_threshold = similarity_threshold
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._token_index: Dict[str, Set[str]] = defaultdict(set)
+        self.stats = {"exact_hits": 0, "similar_hits": 0, "misses": 0, "latency_saved": 0.0}
+        self._load()
+
+    @staticmethod
+    def _key(normalized: str, menu_version: str) -> str:
+        return f"{menu_version}:{normalized}"
+
+    def get(self, user_input: str, menu_version: str) -> Optional[Dict[str, Any]]:
+        normalized = normalize_request(user_input)
+        key = self._key(normalized, menu_version)
+
+        entry = self._live_entry(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.stats["exact_hits"] += 1
+            self.stats["latency_saved"] += entry["latency"]
+            return entry["result"]
+
+        tokens = request_tokens(user_input)
+        candidates = set()
+        for token in tokens:
+            candidates.update(self._token_index.get(token, ()))
+
+        best_key, best_score = None, 0.0
+        for candidate in candidates:
+            entry = self._entries.get(candidate)
+            if entry is None or entry["menu_version"] != menu_version:
+                continue
+            cached_tokens = set(entry["tokens"])
+            score = len(tokens & cached_tokens) / len(tokens | cached_tokens)
+            if score > best_score:
+                best_key, best_score = candidate, score
+
+        if best_key is not None and best_score >= self.similarity_threshold:
+            entry = self._live_entry(best_key)
+            if entry is not None:
+                self._entries.move_to_end(best_key)
+                self.stats["similar_hits"] += 1
+                self.stats["latency_saved"] += entry["latency"]
+                return entry["result"]
+
+        self.stats["misses"] += 1
+        return None
+
+    def put(self, user_input: str, menu_version: str, result: Dict[str, Any], latency: float):
+        normalized = normalize_request(user_input)
+        key = self._key(normalized, menu_version)
+        self._remove(key)
+        self._insert(key, {
+            "menu_version": menu_version,
+            "tokens": sorted(request_tokens(user_input)),
+            "result": result,
+            "latency": latency,
+            "created_at": time.time()
+        })
+
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+        self._save()
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.stats["exact_hits"] + self.stats["similar_hits"] + self.stats["misses"]
+        hits = self.stats["exact_hits"] + self.stats["similar_hits"]
+        return {
+            **self.stats,
+            "hit_rate": hits / lookups if lookups > 0 else 0,
+            "entries": len(self._entries)
+        }
+
+    def _live_entry(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is not None and time.time() - entry["created_at"] > self.ttl:
+            self._remove(key)
+            return None
+        return entry
+
+    def _insert(self, key: str, entry: Dict[str, Any]):
+        self._entries[key] = entry
+        for token in entry["tokens"]:
+            self._token_index[token].add(key)
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for token in entry["tokens"]:
+            keys = self._token_index.get(token)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._token_index[token]
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        now = time.time()
+        for key, entry in entries.items():
+            if now - entry.get("created_at", 0) <= self.ttl:
+                self._insert(key, entry)
+
+    def _save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not persist intent cache: {e}")
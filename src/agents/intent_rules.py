@@ -0,0 +1,148 @@
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+NUGGETS = "Spicy Black Garlic Chicken McNuggets"
+MCFLURRY = "Pistachio McFlurry"
+MEDIUM_FRIES = "Medium Fries"
+LOADED_FRIES = "Cheese & Bacon Loaded Fries"
+
+# The global-menu rotation ordered for "the usual"; MenuUnderstandingAgent's LLM path uses the same list
+USUAL_ORDER = [NUGGETS, MCFLURRY, MEDIUM_FRIES]
+
+# phrase -> (menu items, weight). Multi-word phrases win over single keywords
+# because the trie always takes the longest match.
+DEFAULT_RULES: Dict[str, Tuple[List[str], float]] = {
+    "spicy": ([NUGGETS], 0.9),
+    "hot": ([NUGGETS], 0.6),
+    "nuggets": ([NUGGETS], 0.8),
+    "mcnuggets": ([NUGGETS], 0.9),
+    "chicken nuggets": ([NUGGETS], 0.9),
+    "black garlic": ([NUGGETS], 0.95),
+    "dessert": ([MCFLURRY], 0.9),
+    "sweet": ([MCFLURRY], 0.6),
+    "mcflurry": ([MCFLURRY], 0.9),
+    "ice cream": ([MCFLURRY], 0.85),
+    "pistachio": ([MCFLURRY], 0.95),
+    "side": ([LOADED_FRIES], 0.8),
+    "sides": ([LOADED_FRIES], 0.8),
+    "loaded fries": ([LOADED_FRIES], 0.95),
+    "fries": ([MEDIUM_FRIES], 0.8),
+    "usual": (USUAL_ORDER, 0.9),
+    "wednesday special": (USUAL_ORDER, 0.95),
+    "global menu": (USUAL_ORDER, 0.85),
+}
+
+QUANTITY_WORDS = {"a": 1, "an": 1, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "couple": 2, "double": 2}
+
+MODIFIERS = {"no", "without", "extra", "large", "small", "medium"}
+
+# Modifiers that remove the next phrase's items from the order instead of qualifying them
+NEGATIONS = {"no", "without"}
+
+# Words that carry no menu meaning and do not count against coverage
+FILLER_WORDS = {
+    "get", "me", "my", "i", "want", "would", "like", "something", "for", "lunch", "dinner",
+    "order", "please", "the", "some", "with", "and", "mcdonalds", "today", "of", "to"
+}
+
+@dataclass
+class ParsedIntent:
+    items: List[str]
+    quantities: Dict[str, int]
+    modifiers: Dict[str, List[str]]
+    confidence: float
+    matched_phrases: List[str] = field(default_factory=list)
+    excluded: List[str] = field(default_factory=list)
+
+class IntentEngine:
+    """Keyword/synonym trie that resolves common order requests locally.
+
+    Requests are tokenized once and scanned left to right, taking the
+    longest phrase match at each position. A number or quantity word right
+    before a phrase sets its quantity, and modifier words attach to the next
+    matched phrase, except "no" and "without", which exclude its items from
+    the order wherever they appear. Confidence is the highest phrase weight, discounted when
+    many non-filler tokens went unrecognized.
+    """
+
+    def __init__(self, rules: Optional[Dict[str, Tuple[List[str], float]]] = None):
+        self.rules = rules or DEFAULT_RULES
+        self._trie: Dict = {}
+        for phrase, (items, weight) in self.rules.items():
+            node = self._trie
+            for token in phrase.split():
+                node = node.setdefault(token, {})
+            node[None] = (phrase, items, weight)
+
+    def parse(self, text: str) -> Optional[ParsedIntent]:
+        tokens = re.findall(r"[a-z0-9]+", text.lower().replace("'", ""))
+        items: List[str] = []
+        quantities: Dict[str, int] = {}
+        modifiers: Dict[str, List[str]] = {}
+        matched: List[str] = []
+        excluded: List[str] = []
+        best_weight = 0.0
+        recognized = 0
+        content_tokens = sum(1 for token in tokens if token not in FILLER_WORDS)
+        pending_quantity = None
+        pending_modifiers: List[str] = []
+
+        position = 0
+        while position < len(tokens):
+            token = tokens[position]
+            match = self._longest_match(tokens, position)
+
+            if match is not None:
+                phrase, phrase_items, weight, length = match
+                matched.append(phrase)
+                best_weight = max(best_weight, weight)
+                recognized += length
+                negated = any(modifier in NEGATIONS for modifier in pending_modifiers)
+                for item in phrase_items:
+                    if negated:
+                        if item not in excluded:
+                            excluded.append(item)
+                        continue
+                    if item not in items:
+                        items.append(item)
+                    quantities[item] = max(quantities.get(item, 1), pending_quantity or 1)
+                    if pending_modifiers:
+                        modifiers.setdefault(item, []).extend(pending_modifiers)
+                pending_quantity = None
+                pending_modifiers = []
+                position += length
+                continue
+
+            if token.isdigit():
+                pending_quantity = int(token)
+                recognized += 1
+            elif token in QUANTITY_WORDS:
+                pending_quantity = QUANTITY_WORDS[token]
+                recognized += 1
+            elif token in MODIFIERS:
+                pending_modifiers.append(token)
+                recognized += 1
+            position += 1
+
+        items = [item for item in items if item not in excluded]
+        if not items:
+            return None
+        quantities = {item: quantities[item] for item in items}
+        modifiers = {item: values for item, values in modifiers.items() if item in items}
+
+        coverage = min(1.0, recognized / content_tokens) if content_tokens else 1.0
+        confidence = best_weight * (0.7 + 0.3 * coverage)
+        return ParsedIntent(items, quantities, modifiers, confidence, matched, excluded)
+
+    def _longest_match(self, tokens: List[str], start: int):
+        node = self._trie
+        best = None
+        for position in range(start, len(tokens)):
+            node = node.get(tokens[position])
+            if node is None:
+                break
+            if None in node:
+                phrase, items, weight = node[None]
+                best = (phrase, items, weight, position - start + 1)
+        return best
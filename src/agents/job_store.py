@@ -0,0 +1,182 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    cron TEXT NOT NULL,
+    timezone TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    next_run REAL NOT NULL,
+    last_run REAL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_next_run ON jobs(next_run);
+CREATE TABLE IF NOT EXISTS runs (
+    job_id TEXT NOT NULL,
+    scheduled_for REAL NOT NULL,
+    status TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    result TEXT,
+    lease_until REAL,
+    PRIMARY KEY (job_id, scheduled_for)
+);
+"""
+
+def _to_timestamp(moment: Optional[datetime]) -> Optional[float]:
+    return moment.timestamp() if moment is not None else None
+
+def _to_datetime(timestamp: Optional[float]) -> Optional[datetime]:
+    return datetime.fromtimestamp(timestamp, timezone.utc) if timestamp is not None else None
+
+class JobStore:
+    """SQLite-backed schedules and run history.
+
+    A run is identified by ``(job_id, scheduled_for)``; ``claim_run`` inserts
+    that key as ``running`` with a lease, which keeps a run from firing twice
+    even if the process restarts between firing and saving the next run
+    time. The owner renews the lease while the run is in progress, so a
+    ``running`` row whose lease has lapsed was left by a crashed process and
+    can be claimed again. ``next_run`` is indexed for ordered loading at
+    startup.
+
+    The connection is shared across threads so the scheduler can keep
+    sqlite off the event loop; a lock serializes access to it.
+    """
+
+    def __init__(self, path: str = os.path.join(".cache", "scheduler.db")):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        self.connection.executescript(SCHEMA)
+        columns = {row["name"] for row in self.connection.execute("PRAGMA table_info(runs)")}
+        if "lease_until" not in columns:
+            # Databases created before run leases existed
+            self.connection.execute("ALTER TABLE runs ADD COLUMN lease_until REAL")
+        self.connection.commit()
+
+    def save_job(self, job_id: str, cron: str, timezone_name: str, payload: Dict[str, Any],
+                 next_run: datetime, last_run: Optional[datetime] = None):
+        with self._lock, self.connection:
+            self.connection.execute(
+                """
+                INSERT INTO jobs (job_id, cron, timezone, payload, next_run, last_run)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(job_id) DO UPDATE SET
+                    cron = excluded.cron,
+                    timezone = excluded.timezone,
+                    payload = excluded.payload,
+                    next_run = excluded.next_run,
+                    last_run = excluded.last_run
+                """,
+                (job_id, cron, timezone_name, json.dumps(payload), _to_timestamp(next_run), _to_timestamp(last_run))
+            )
+
+    def update_run_times(self, job_id: str, next_run: datetime, last_run: Optional[datetime]):
+        with self._lock, self.connection:
+            self.connection.execute(
+                "UPDATE jobs SET next_run = ?, last_run = ? WHERE job_id = ?",
+                (_to_timestamp(next_run), _to_timestamp(last_run), job_id)
+            )
+
+    def delete_job(self, job_id: str):
+        with self._lock, self.connection:
+            self.connection.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+
+    def load_jobs(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self.connection.execute("SELECT * FROM jobs ORDER BY next_run").fetchall()
+        return [self._job_from_row(row) for row in rows]
+
+    def claim_run(self, job_id: str, scheduled_for: datetime, lease: float = 600.0) -> bool:
+        """Claim a run for ``lease`` seconds.
+
+        Succeeds for a run that has no row yet, or for a ``running`` row
+        whose lease has lapsed because its owner died mid-run.
+        """
+        now = time.time()
+        with self._lock, self.connection:
+            cursor = self.connection.execute(
+                "INSERT OR IGNORE INTO runs (job_id, scheduled_for, status, started_at, lease_until) VALUES (?, ?, 'running', ?, ?)",
+                (job_id, _to_timestamp(scheduled_for), now, now + lease)
+            )
+            if cursor.rowcount == 1:
+                return True
+            cursor = self.connection.execute(
+                """
+                UPDATE runs SET started_at = ?, lease_until = ?
+                WHERE job_id = ? AND scheduled_for = ? AND status = 'running'
+                    AND (lease_until IS NULL OR lease_until < ?)
+                """,
+                (now, now + lease, job_id, _to_timestamp(scheduled_for), now)
+            )
+        return cursor.rowcount == 1
+
+    def renew_lease(self, job_id: str, scheduled_for: datetime, lease: float = 600.0):
+        with self._lock, self.connection:
+            self.connection.execute(
+                "UPDATE runs SET lease_until = ? WHERE job_id = ? AND scheduled_for = ? AND status = 'running'",
+                (time.time() + lease, job_id, _to_timestamp(scheduled_for))
+            )
+
+    def expired_runs(self) -> List[Dict[str, Any]]:
+        """Runs still marked ``running`` whose lease has lapsed."""
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT job_id, scheduled_for FROM runs WHERE status = 'running' AND (lease_until IS NULL OR lease_until < ?)",
+                (time.time(),)
+            ).fetchall()
+        return [{"job_id": row["job_id"], "scheduled_for": _to_datetime(row["scheduled_for"])} for row in rows]
+
+    def record_missed(self, job_id: str, scheduled_for: datetime):
+        with self._lock, self.connection:
+            self.connection.execute(
+                "INSERT OR IGNORE INTO runs (job_id, scheduled_for, status, started_at, finished_at) VALUES (?, ?, 'missed', ?, ?)",
+                (job_id, _to_timestamp(scheduled_for), time.time(), time.time())
+            )
+
+    def finish_run(self, job_id: str, scheduled_for: datetime, status: str, result: Any = None):
+        with self._lock, self.connection:
+            self.connection.execute(
+                "UPDATE runs SET status = ?, finished_at = ?, result = ? WHERE job_id = ? AND scheduled_for = ?",
+                (status, time.time(), json.dumps(result, default=str), job_id, _to_timestamp(scheduled_for))
+            )
+
+    def recent_runs(self, job_id: str, limit: int = 10) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT * FROM runs WHERE job_id = ? ORDER BY scheduled_for DESC LIMIT ?",
+                (job_id, limit)
+            ).fetchall()
+        return [
+            {
+                "job_id": row["job_id"],
+                "scheduled_for": _to_datetime(row["scheduled_for"]).isoformat(),
+                "status": row["status"],
+                "result": json.loads(row["result"]) if row["result"] else None
+            }
+            for row in rows
+        ]
+
+    @staticmethod
+    def _job_from_row(row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            "job_id": row["job_id"],
+            "cron": row["cron"],
+            "timezone": row["timezone"],
+            "payload": json.loads(row["payload"]),
+            "next_run": _to_datetime(row["next_run"]),
+            "last_run": _to_datetime(row["last_run"])
+        }
+
+    def close(self):
+        with self._lock:
+            self.connection.close()
@@ -0,0 +1,218 @@
+import asyncio
+import gzip
+import json
+import logging
+import os
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class LogSink:
+    """Background writer that batches log entries into gzip JSONL segments.
+
+    ``submit`` only enqueues, so callers on the event loop never wait on
+    disk. A single writer task drains the queue in batches of up to
+    ``batch_size`` (or whatever arrived within ``flush_interval``) and
+    serializes and appends each batch to the current segment in a worker
+    thread. Segments rotate by uncompressed size or age. When the queue is
+    full the ``"drop"`` policy discards the entry and counts it; ``"block"``
+    makes the caller wait for space. A batch that fails to write is kept in
+    a backlog of at most ``max_backlog`` entries (oldest dropped first) and
+    retried, together with newer entries, every ``retry_interval`` seconds.
+    """
+
+    def __init__(
+        self,
+        directory: str = os.path.join(".cache", "logs"),
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_queue: int = 10_000,
+        policy: str = "drop",
+        max_segment_bytes: int = 16 * 1024 * 1024,
+        max_segment_age: float = 3600.0,
+        max_backlog: int = 50_000,
+        retry_interval: float = 5.0
+    ):
+        if policy not in ("drop", "block"):
+            raise ValueError(f"Unknown log sink policy: {policy}")
+        self.directory = directory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.policy = policy
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segment_age = max_segment_age
+        self.max_backlog = max_backlog
+        self.retry_interval = retry_interval
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer: Optional[asyncio.Task] = None
+        self._segment_path: Optional[str] = None
+        self._segment_bytes = 0
+        self._segment_opened = 0.0
+        self._segment_index = 0
+        self._backlog: Deque[Dict[str, Any]] = deque()
+        self._retry_at = 0.0
+        self.stats = {
+            "submitted": 0,
+            "written": 0,
+            "dropped": 0,
+            "batches": 0,
+            "segments": 0,
+            "write_errors": 0,
+            "retries": 0,
+            "write_time": 0.0
+        }
+
+    @property
+    def running(self) -> bool:
+        return self._writer is not None and not self._writer.done()
+
+    def start(self):
+        if self.running:
+            return
+        if self._writer is not None and not self._writer.cancelled() and self._writer.exception() is not None:
+            logger.error(f"Log writer stopped unexpectedly, restarting: {self._writer.exception()}")
+        os.makedirs(self.directory, exist_ok=True)
+        # A restarted writer keeps draining the same queue, so nothing already queued is lost
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._writer = asyncio.create_task(self._run())
+
+    async def submit(self, entry: Dict[str, Any]) -> bool:
+        if not self.running:
+            self.start()
+
+        self.stats["submitted"] += 1
+        if self.policy == "block":
+            await self._queue.put(entry)
+            return True
+
+        try:
+            self._queue.put_nowait(entry)
+            return True
+        except asyncio.QueueFull:
+            self.stats["dropped"] += 1
+            return False
+
+    async def close(self):
+        """Flush everything queued so far and stop the writer."""
+        if not self.running:
+            return
+        await self._queue.put(None)
+        await self._writer
+
+    async def _run(self):
+        closing = False
+        while not closing:
+            batch: List[Dict[str, Any]] = []
+            if self._backlog:
+                # Wake up for the retry even if nothing new arrives
+                try:
+                    first = await asyncio.wait_for(self._queue.get(), max(0.0, self._retry_at - time.monotonic()))
+                except asyncio.TimeoutError:
+                    await self._flush(batch)
+                    continue
+            else:
+                first = await self._queue.get()
+            if first is None:
+                break
+            batch.append(first)
+
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                if self._queue.empty():
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        entry = await asyncio.wait_for(self._queue.get(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    entry = self._queue.get_nowait()
+
+                if entry is None:
+                    closing = True
+                    break
+                batch.append(entry)
+
+            await self._flush(batch)
+
+        if self._backlog:
+            await self._flush([], force=True)
+        if self._backlog:
+            self.stats["dropped"] += len(self._backlog)
+            logger.error(f"Dropping {len(self._backlog)} log entries that could not be written before close")
+            self._backlog.clear()
+
+    async def _flush(self, batch: List[Dict[str, Any]], force: bool = False):
+        self._backlog.extend(batch)
+        if not self._backlog:
+            return
+        if not force and time.monotonic() < self._retry_at:
+            self._trim_backlog()
+            return
+
+        pending = list(self._backlog)
+        if self._retry_at:
+            self.stats["retries"] += 1
+        started = time.monotonic()
+        try:
+            await asyncio.to_thread(self._write, pending)
+        except OSError as e:
+            self.stats["write_errors"] += 1
+            self._retry_at = time.monotonic() + self.retry_interval
+            # The failed write may have left a truncated gzip member; retry into a fresh segment
+            self._segment_path = None
+            logger.error(f"Failed to write {len(pending)} log entries, retrying in {self.retry_interval}s: {e}")
+            self._trim_backlog()
+            return
+        finally:
+            self.stats["write_time"] += time.monotonic() - started
+
+        self._backlog.clear()
+        self._retry_at = 0.0
+        self.stats["written"] += len(pending)
+        self.stats["batches"] += 1
+
+    def _trim_backlog(self):
+        while len(self._backlog) > self.max_backlog:
+            self._backlog.popleft()
+            self.stats["dropped"] += 1
+
+    def _write(self, batch: List[Dict[str, Any]]):
+        payload = "".join(json.dumps(entry, default=str) + "\n" for entry in batch).encode("utf-8")
+        if self._needs_rotation(len(payload)):
+            self._rotate()
+        # Each batch is a separate gzip member; readers see one continuous stream
+        with gzip.open(self._segment_path, "ab") as segment:
+            segment.write(payload)
+        self._segment_bytes += len(payload)
+
+    def _needs_rotation(self, incoming: int) -> bool:
+        if self._segment_path is None:
+            return True
+        if self._segment_bytes > 0 and self._segment_bytes + incoming > self.max_segment_bytes:
+            return True
+        return time.monotonic() - self._segment_opened > self.max_segment_age
+
+    def _rotate(self):
+        self._segment_index += 1
+        name = f"logs-{datetime.now().strftime('%Y%m%d-%H%M%S')}-{self._segment_index:04d}.jsonl.gz"
+        self._segment_path = os.path.join(self.directory, name)
+        self._segment_bytes = 0
+        self._segment_opened = time.monotonic()
+        self.stats["segments"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "backlog": len(self._backlog),
+            "policy": self.policy,
+            "segment": self._segment_path
+        }
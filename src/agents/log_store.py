@@ -0,0 +1,151 @@
+from collections import Counter, deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional
+
+# Rough fixed cost of a record: the object, its timestamp and index entries
+RECORD_OVERHEAD = 200
+# Rough cost of a number, bool or None, and of one container slot
+SCALAR_SIZE = 8
+
+def estimate_size(value: Any) -> int:
+    """Approximate in-memory size of a log payload without serializing it."""
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(SCALAR_SIZE + len(str(key)) + estimate_size(item) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return sum(SCALAR_SIZE + estimate_size(item) for item in value)
+    return SCALAR_SIZE
+
+class LogRecord:
+    __slots__ = ("seq", "timestamp", "agent", "level", "message", "data", "size")
+
+    def __init__(self, seq: int, timestamp: datetime, agent: str, level: str, message: str, data: Dict[str, Any]):
+        self.seq = seq
+        self.timestamp = timestamp
+        self.agent = agent
+        self.level = level
+        self.message = message
+        self.data = data
+        self.size = RECORD_OVERHEAD + len(agent) + len(level) + len(message) + (estimate_size(data) if data else 0)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "entry_id": self.seq,
+            "timestamp": self.timestamp.isoformat(),
+            "agent": self.agent,
+            "level": self.level,
+            "message": self.message,
+            "data": self.data
+        }
+
+class LogStore:
+    """Bounded in-memory log storage with agent and level indexes.
+
+    Records live in a fixed-size ring buffer. The oldest records are
+    evicted once ``max_records`` is reached, or once the approximate size of
+    the retained records (message and an estimate of the data plus a
+    fixed per-record overhead) exceeds ``max_bytes``, so a burst of large
+    payloads cannot grow memory unbounded. Each index holds record
+    sequence numbers in insertion order, so evicting the oldest record only
+    ever pops from the left of its two index queues. Lifetime counters are
+    updated on append, which keeps ``get_counts`` independent of how many
+    records have been stored.
+    """
+
+    def __init__(self, max_records: int = 100_000, max_bytes: int = 64 * 1024 * 1024):
+        if max_records < 1:
+            raise ValueError("max_records must be at least 1")
+        self.max_records = max_records
+        self.max_bytes = max_bytes
+        self._buffer: List[Optional[LogRecord]] = [None] * max_records
+        self._next_seq = 1
+        self._oldest_seq = 1
+        self.retained_bytes = 0
+        self._by_agent: Dict[str, Deque[int]] = {}
+        self._by_level: Dict[str, Deque[int]] = {}
+        self.total_events = 0
+        self.evicted = 0
+        self.level_counts: Counter = Counter()
+        self.agent_counts: Counter = Counter()
+        self.last_record: Optional[LogRecord] = None
+
+    def __len__(self) -> int:
+        return self._next_seq - self._oldest_seq
+
+    def append(self, agent: str, level: str, message: str, data: Optional[Dict[str, Any]] = None,
+               timestamp: Optional[datetime] = None) -> LogRecord:
+        if len(self) >= self.max_records:
+            self._evict_oldest()
+
+        seq = self._next_seq
+        self._next_seq += 1
+        record = LogRecord(seq, timestamp or datetime.now(), agent, level, message, data or {})
+        self._buffer[seq % self.max_records] = record
+        self._by_agent.setdefault(agent, deque()).append(seq)
+        self._by_level.setdefault(level, deque()).append(seq)
+        self.retained_bytes += record.size
+
+        # The newest record is always kept, even if it alone exceeds max_bytes
+        while self.retained_bytes > self.max_bytes and len(self) > 1:
+            self._evict_oldest()
+
+        self.total_events += 1
+        self.level_counts[level] += 1
+        self.agent_counts[agent] += 1
+        self.last_record = record
+        return record
+
+    def _evict_oldest(self):
+        slot = self._oldest_seq % self.max_records
+        record = self._buffer[slot]
+        self._buffer[slot] = None
+        self._oldest_seq += 1
+        self._unindex(record)
+        self.retained_bytes -= record.size
+        self.evicted += 1
+
+    def _unindex(self, record: LogRecord):
+        for index, key in ((self._by_agent, record.agent), (self._by_level, record.level)):
+            sequence = index[key]
+            sequence.popleft()
+            if not sequence:
+                del index[key]
+
+    def get(self, seq: int) -> Optional[LogRecord]:
+        record = self._buffer[seq % self.max_records]
+        return record if record is not None and record.seq == seq else None
+
+    def query(self, agent: Optional[str] = None, level: Optional[str] = None, limit: int = 100) -> List[LogRecord]:
+        """Return up to ``limit`` retained records, newest first."""
+        if agent is None and level is None:
+            newest = self._next_seq - 1
+            return [self.get(seq) for seq in range(newest, max(self._oldest_seq, newest - limit + 1) - 1, -1)]
+
+        if agent is not None and level is not None:
+            # Walk the smaller index and filter on the other field
+            by_agent = self._by_agent.get(agent, ())
+            by_level = self._by_level.get(level, ())
+            candidates, field, value = (by_agent, "level", level) if len(by_agent) <= len(by_level) else (by_level, "agent", agent)
+        else:
+            candidates = self._by_agent.get(agent, ()) if agent is not None else self._by_level.get(level, ())
+            field, value = None, None
+
+        results = []
+        for seq in reversed(candidates):
+            record = self.get(seq)
+            if field is None or getattr(record, field) == value:
+                results.append(record)
+                if len(results) >= limit:
+                    break
+        return results
+
+    def get_counts(self) -> Dict[str, Any]:
+        return {
+            "total_events": self.total_events,
+            "retained": len(self),
+            "retained_bytes": self.retained_bytes,
+            "evicted": self.evicted,
+            "levels": dict(self.level_counts),
+            "agents": len(self.agent_counts)
+        }
@@ -1,10 +1,21 @@
 from .base_agent import BaseA2AAgent, AgentCard, AgentSkill, AgentCapabilities
-from datetime import datetime
+from .tracing import add_span_listener
+from .log_store import LogStore
+from .log_sink import LogSink
+from .analytics_engine import AnalyticsEngine, RESOLUTIONS
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional
 
 class LoggerAgent(BaseA2AAgent):
-    def __init__(self):
+    # Every agent logs through here; a span per log entry would only add noise
+    trace_messages = False
+
+    def __init__(self, max_records: int = 100_000, max_bytes: int = 64 * 1024 * 1024, sink: Optional[LogSink] = None):
         super().__init__("LoggerAgent", "Centralized logging and monitoring", 9007)
-        self.log_storage = []
+        self.log_storage = LogStore(max_records, max_bytes)
+        self.sink = sink or LogSink()
+        self.analytics = AnalyticsEngine()
+        add_span_listener(self)
 
     def _create_agent_card(self) -> AgentCard:
         skills = [
@@ -35,27 +46,60 @@ class LoggerAgent(BaseA2AAgent):
             skills=skills
         )
 
+    def on_span(self, span):
+        """Record the latency of every traced agent's process_message."""
+        agent = span.attributes.get("agent.name")
+        if agent:
+            self.analytics.record_latency(datetime.now(), agent, span.duration)
+
     async def process_message(self, message: Dict[str, Any]) -> Dict[str, Any]:
-        log_entry = {
-            "timestamp": datetime.now().isoformat(),
-            "agent": message.get("agent", "unknown"),
-            "level": message.get("level", "info"),
-            "message": message.get("message", ""),
-            "data": message.get("data", {})
-        }
+        if message.get("command") == "query_logs":
+            records = self.log_storage.query(message.get("agent"), message.get("level"), message.get("limit", 100))
+            return {"status": "success", "logs": [record.to_dict() for record in records]}
 
-        self.log_storage.append(log_entry)
-        self.logger.info(f"Logged: {log_entry}")
+        if message.get("command") == "query_analytics":
+            try:
+                end = datetime.fromisoformat(message["end"]) if message.get("end") else datetime.now()
+                start = datetime.fromisoformat(message["start"]) if message.get("start") else end - timedelta(days=7)
+            except ValueError as e:
+                return {"status": "error", "message": f"Invalid analytics window: {e}"}
 
-        return {"status": "logged", "entry_id": len(self.log_storage)}
+            result = {"status": "success", "summary": self.analytics.query(start, end)}
+            if message.get("resolution") in RESOLUTIONS:
+                result["series"] = self.analytics.series(message["resolution"], start, end)
+            return result
+
+        record = self.log_storage.append(
+            message.get("agent", "unknown"),
+            message.get("level", "info"),
+            message.get("message", ""),
+            message.get("data", {})
+        )
+        self.analytics.record(record.timestamp, record.agent, record.level, record.data)
+        await self.sink.submit(record.to_dict())
+
+        return {"status": "logged", "entry_id": record.seq}
 
     def get_analytics(self) -> Dict[str, Any]:
-        total_logs = len(self.log_storage)
-        error_logs = len([log for log in self.log_storage if log["level"] == "error"])
+        store = self.log_storage
+        total_logs = store.total_events
 
         return {
             "total_events": total_logs,
-            "error_rate": error_logs / total_logs if total_logs > 0 else 0,
-            "agents_active": len(set(log["agent"] for log in self.log_storage)),
-            "last_activity": self.log_storage[-1]["timestamp"] if self.log_storage else None
+            "error_rate": store.level_counts["error"] / total_logs if total_logs > 0 else 0,
+            "agents_active": len(store.agent_counts),
+            "last_activity": store.last_record.timestamp.isoformat() if store.last_record else None,
+            "retained_events": len(store),
+            "evicted_events": store.evicted,
+            "retained_bytes": store.retained_bytes,
+            "latency_coverage": {
+                "measured": sorted(self.analytics.latency_agents),
+                "unmeasured": sorted(set(store.agent_counts) - self.analytics.latency_agents)
+            },
+            "windows": self.analytics.window_summaries(datetime.now()),
+            "sink": self.sink.get_stats()
         }
+
+    def get_success_rate_series(self, hours: int = 24) -> list:
+        now = datetime.now()
+        return self.analytics.series("hour", now - timedelta(hours=hours), now)
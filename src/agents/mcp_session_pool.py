@@ -0,0 +1,206 @@
+import asyncio
+import inspect
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class MCPSession:
+    toolset: Any
+    tools: List[Any]
+    created_at: float = field(default_factory=time.monotonic)
+    last_used: float = field(default_factory=time.monotonic)
+    uses: int = 0
+
+class MCPSessionPool:
+    """Process-wide pool of warm MCP toolsets with lease/return semantics.
+
+    ``factory`` opens a new toolset and returns ``(toolset, tools)``. Idle
+    sessions older than ``idle_timeout`` seconds are closed by a background
+    task that runs every ``evict_interval`` seconds once the pool is started
+    (by ``start`` or the first checkout), and every reused session goes
+    through ``health_check`` before it is handed out. Sessions
+    released with ``failed=True`` were left in an unknown browser state and
+    are closed instead of being reused.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Awaitable[Tuple[Any, List[Any]]]],
+        size: int = 2,
+        idle_timeout: float = 300.0,
+        health_check: Optional[Callable[[MCPSession], Awaitable[bool]]] = None,
+        evict_interval: Optional[float] = None
+    ):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self.factory = factory
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self.evict_interval = evict_interval if evict_interval is not None else min(idle_timeout, 60.0)
+        self.health_check = health_check or self._default_health_check
+        self._idle: List[MCPSession] = []
+        self._open_count = 0
+        self._condition = asyncio.Condition()
+        self._evictor: Optional[asyncio.Task] = None
+        self.stats = {
+            "checkouts": 0,
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "health_failures": 0,
+            "failed_releases": 0,
+            "wait_time_total": 0.0,
+            "wait_time_max": 0.0
+        }
+
+    @staticmethod
+    async def _default_health_check(session: MCPSession) -> bool:
+        return bool(session.tools)
+
+    @asynccontextmanager
+    async def lease(self):
+        session = await self.checkout()
+        failed = True
+        try:
+            yield session
+            failed = False
+        finally:
+            await self.release(session, failed=failed)
+
+    def start(self):
+        """Start evicting idle sessions in the background; a no-op while already running."""
+        # A task from an event loop that has since finished is done and replaced
+        if self._evictor is None or self._evictor.done():
+            self._evictor = asyncio.create_task(self._evict_periodically())
+
+    async def checkout(self) -> MCPSession:
+        self.start()
+        started = time.monotonic()
+
+        while True:
+            session = None
+            async with self._condition:
+                expired = self._pop_expired()
+                if not expired:
+                    while not self._idle and self._open_count >= self.size:
+                        await self._condition.wait()
+                    if self._idle:
+                        session = self._idle.pop()
+                    else:
+                        self._open_count += 1
+
+            if expired:
+                for stale in expired:
+                    await self._discard(stale)
+                continue
+
+            if session is None:
+                try:
+                    toolset, tools = await self.factory()
+                except Exception:
+                    async with self._condition:
+                        self._open_count -= 1
+                        self._condition.notify()
+                    raise
+                session = MCPSession(toolset=toolset, tools=tools)
+                self.stats["misses"] += 1
+                break
+
+            if await self._is_healthy(session):
+                self.stats["hits"] += 1
+                break
+
+            self.stats["health_failures"] += 1
+            await self._discard(session)
+
+        waited = time.monotonic() - started
+        self.stats["checkouts"] += 1
+        self.stats["wait_time_total"] += waited
+        self.stats["wait_time_max"] = max(self.stats["wait_time_max"], waited)
+        session.uses += 1
+        return session
+
+    async def release(self, session: MCPSession, failed: bool = False):
+        if failed:
+            self.stats["failed_releases"] += 1
+            await self._discard(session)
+            return
+        session.last_used = time.monotonic()
+        async with self._condition:
+            self._idle.append(session)
+            self._condition.notify()
+
+    async def evict_idle(self) -> int:
+        async with self._condition:
+            expired = self._pop_expired()
+        for session in expired:
+            await self._discard(session)
+        return len(expired)
+
+    async def close(self):
+        if self._evictor is not None and not self._evictor.done():
+            self._evictor.cancel()
+            try:
+                await self._evictor
+            except asyncio.CancelledError:
+                pass
+        async with self._condition:
+            idle, self._idle = self._idle, []
+        for session in idle:
+            await self._discard(session)
+
+    def get_stats(self) -> Dict[str, Any]:
+        checkouts = self.stats["checkouts"]
+        return {
+            **self.stats,
+            "hit_rate": self.stats["hits"] / checkouts if checkouts > 0 else 0,
+            "avg_wait_time": self.stats["wait_time_total"] / checkouts if checkouts > 0 else 0,
+            "idle": len(self._idle),
+            "in_use": self._open_count - len(self._idle),
+            "size": self.size
+        }
+
+    async def _evict_periodically(self):
+        while True:
+            await asyncio.sleep(self.evict_interval)
+            try:
+                evicted = await self.evict_idle()
+            except Exception as e:
+                logger.warning(f"Idle MCP session eviction failed: {e}")
+                continue
+            if evicted:
+                logger.info(f"Closed {evicted} idle MCP session(s)")
+
+    def _pop_expired(self) -> List[MCPSession]:
+        now = time.monotonic()
+        expired = [s for s in self._idle if now - s.last_used > self.idle_timeout]
+        if expired:
+            self._idle = [s for s in self._idle if now - s.last_used <= self.idle_timeout]
+            self.stats["evictions"] += len(expired)
+        return expired
+
+    async def _is_healthy(self, session: MCPSession) -> bool:
+        try:
+            return await self.health_check(session)
+        except Exception as e:
+            logger.warning(f"MCP session health check failed: {e}")
+            return False
+
+    async def _discard(self, session: MCPSession):
+        try:
+            close = getattr(session.toolset, "close", None)
+            if close is not None:
+                result = close()
+                if inspect.isawaitable(result):
+                    await result
+        except Exception as e:
+            logger.warning(f"Error closing MCP session: {e}")
+        finally:
+            async with self._condition:
+                self._open_count -= 1
+                self._condition.notify()
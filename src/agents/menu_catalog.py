@@ -0,0 +1,106 @@
+import re
+import threading
+import time
+import unicodedata
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+from .menu_snapshot import MenuItem
+
+def normalize(text: str) -> str:
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    text = text.lower().replace("&", " and ")
+    return " ".join(re.findall(r"[a-z0-9]+", text))
+
+def trigrams(text: str) -> Set[str]:
+    grams = set()
+    for token in normalize(text).split():
+        padded = f"  {token} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+class MenuCatalog:
+    """Trigram index over scraped menu item names.
+
+    Only items sharing at least one trigram with the query are scored, so a
+    lookup touches a small fraction of a large menu. Scores are Dice
+    coefficients between trigram sets, in [0, 1].
+    """
+
+    def __init__(self, items: List[MenuItem]):
+        self.items = items
+        self.built_at = time.time()
+        self._grams: List[Set[str]] = []
+        self._index: Dict[str, List[int]] = defaultdict(list)
+
+        for position, item in enumerate(items):
+            grams = trigrams(item.name)
+            self._grams.append(grams)
+            for gram in grams:
+                self._index[gram].append(position)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def search(self, query: str, limit: int = 5) -> List[Tuple[MenuItem, float]]:
+        query_grams = trigrams(query)
+        if not query_grams:
+            return []
+
+        shared = Counter()
+        for gram in query_grams:
+            for position in self._index.get(gram, ()):
+                shared[position] += 1
+
+        scored = [
+            (self.items[position], 2 * count / (len(query_grams) + len(self._grams[position])))
+            for position, count in shared.items()
+        ]
+        scored.sort(key=lambda match: match[1], reverse=True)
+        return scored[:limit]
+
+    def resolve(self, query: str, min_score: float = 0.5) -> Optional[MenuItem]:
+        matches = self.search(query, limit=1)
+        if matches and matches[0][1] >= min_score:
+            return matches[0][0]
+        return None
+
+    def with_keyword(self, keyword: str) -> List[MenuItem]:
+        keyword = normalize(keyword)
+        return [
+            item for item in self.items
+            if keyword in normalize(item.section or "") or keyword in normalize(item.text)
+        ]
+
+class MenuCatalogCache:
+    # Shared by every order bot, each on its own executor thread
+    def __init__(self, ttl: float = 3600.0):
+        self.ttl = ttl
+        self._catalogs: Dict[str, MenuCatalog] = {}
+        self.stats = {"hits": 0, "misses": 0}
+        self._lock = threading.Lock()
+
+    def get(self, restaurant: str) -> Optional[MenuCatalog]:
+        with self._lock:
+            catalog = self._catalogs.get(restaurant)
+            if catalog is not None and time.time() - catalog.built_at <= self.ttl:
+                self.stats["hits"] += 1
+                return catalog
+
+            self._catalogs.pop(restaurant, None)
+            self.stats["misses"] += 1
+            return None
+
+    def put(self, restaurant: str, catalog: MenuCatalog):
+        with self._lock:
+            self._catalogs[restaurant] = catalog
+
+    def invalidate(self, restaurant: str):
+        with self._lock:
+            self._catalogs.pop(restaurant, None)
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.stats)
+
+menu_catalog_cache = MenuCatalogCache()
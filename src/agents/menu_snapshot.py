@@ -0,0 +1,94 @@
+import logging
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+from .selector_cache import xpath_literal
+
+logger = logging.getLogger(__name__)
+
+# Collects every add-to-cart button with its item container in one call.
+# Buttons are tagged with a stable data-mcd-add id so Python can click them
+# later through a plain CSS selector.
+SNAPSHOT_SCRIPT = """
+const buttons = document.evaluate(
+    "//button[contains(@aria-label, 'Add') or contains(text(), '+') or contains(@data-testid, 'add')]",
+    document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+window.__mcdNextId = window.__mcdNextId || 0;
+
+function sectionOf(element) {
+    for (let node = element.parentElement; node && node !== document.body; node = node.parentElement) {
+        const heading = node.querySelector(":scope > h2, :scope > h3, :scope > [role='heading']");
+        if (heading) {
+            return heading.innerText.trim();
+        }
+    }
+    return null;
+}
+
+const items = [];
+for (let i = 0; i < buttons.snapshotLength; i++) {
+    const button = buttons.snapshotItem(i);
+    const container = button.closest("[class*='item'], [data-testid*='item']");
+    if (!container) {
+        continue;
+    }
+    if (!button.dataset.mcdAdd) {
+        button.dataset.mcdAdd = String(window.__mcdNextId++);
+    }
+    const text = (container.innerText || '').trim();
+    const lines = text.split('\\n').map(function(line) { return line.trim(); }).filter(Boolean);
+    const price = text.match(/\\$\\s?\\d+(?:\\.\\d{2})?/);
+    items.push({
+        id: button.dataset.mcdAdd,
+        name: lines.length ? lines[0] : '',
+        price: price ? price[0] : null,
+        section: sectionOf(container),
+        text: text.toLowerCase()
+    });
+}
+return items;
+"""
+
+@dataclass
+class MenuItem:
+    id: str
+    name: str
+    price: Optional[str]
+    section: Optional[str]
+    text: str
+    scroll_y: Optional[int] = None
+
+    @property
+    def locator(self) -> str:
+        return f"button[data-mcd-add='{self.id}']"
+
+    @property
+    def name_xpath(self) -> str:
+        """Locator that survives page reloads, unlike the data-mcd-add tag."""
+        return (
+            "//*[(contains(@class, 'item') or contains(@data-testid, 'item'))"
+            f" and .//*[normalize-space(text())={xpath_literal(self.name)}]]"
+            "//button[contains(@aria-label, 'Add') or contains(text(), '+') or contains(@data-testid, 'add')]"
+        )
+
+class MenuSnapshot:
+    """Extracts structured menu items with one WebDriver call per scroll step."""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.round_trips = 0
+
+    def capture(self) -> List[MenuItem]:
+        self.round_trips += 1
+        raw_items = self.driver.execute_script(SNAPSHOT_SCRIPT) or []
+        return [MenuItem(**item) for item in raw_items]
+
+    def capture_scrolling(self, waiter, positions: Iterable[int]) -> List[MenuItem]:
+        """Scroll through ``positions`` and merge snapshots of lazily rendered items."""
+        items: Dict[str, MenuItem] = {}
+        for position in positions:
+            waiter.scroll_to(position)
+            for item in self.capture():
+                item.scroll_y = position
+                items.setdefault(item.id, item)
+        logger.info(f"Captured {len(items)} menu items in {self.round_trips} snapshot call(s)")
+        return list(items.values())
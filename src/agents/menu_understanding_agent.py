@@ -1,9 +1,62 @@
+import json
+import time
+import hashlib
+from typing import Dict, Any, Optional
 from .base_agent import BaseA2AAgent, AgentCard, AgentSkill, AgentCapabilities
+from .intent_cache import IntentCache
+from .intent_rules import DEFAULT_RULES, NUGGETS, MCFLURRY, USUAL_ORDER, IntentEngine
+from .tracing import get_tracer, current_span
 from google.adk.agents.llm_agent import LlmAgent
 
+MENU_PARSER_INSTRUCTION = (
+    "You are a McDonald's Global Menu expert. Parse user requests into specific menu items. "
+    "Available items include: Spicy Black Garlic Chicken McNuggets (Japan), "
+    "Pistachio McFlurry (Italy), Cheese & Bacon Loaded Fries (Australia), "
+    "plus standard McDonald's menu. Return a JSON list of specific items to order."
+)
+
+MENU_PARSING_PROMPT = """
+        Parse this McDonald's order request into specific menu items:
+        "{user_input}"
+
+        Consider:
+        - If they say "spicy" -> suggest Spicy Black Garlic Chicken McNuggets
+        - If they say "usual" or "wednesday special" -> suggest global menu rotation items
+        - If they want dessert -> suggest Pistachio McFlurry
+        - If they want sides -> suggest Cheese & Bacon Loaded Fries
+
+        Return JSON format: {{"parsed_items": ["item1", "item2"], "reasoning": "why these items"}}
+        """
+
+def menu_version(rules=DEFAULT_RULES) -> str:
+    """Cached intents are only reused while the instruction, prompt rules and menu data are unchanged."""
+    digest = hashlib.sha1()
+    for part in (MENU_PARSER_INSTRUCTION, MENU_PARSING_PROMPT, json.dumps(rules, sort_keys=True)):
+        digest.update(part.encode("utf-8"))
+    return digest.hexdigest()[:12]
+
+MENU_VERSION = menu_version()
+
 class MenuUnderstandingAgent(BaseA2AAgent):
-    def __init__(self):
+    def __init__(
+        self,
+        llm_agent=None,
+        response_cache: Optional[IntentCache] = None,
+        intent_engine: Optional[IntentEngine] = None,
+        rule_confidence_threshold: float = 0.75
+    ):
         super().__init__("MenuUnderstandingAgent", "AI-powered menu understanding", 9004)
+        self.menu_agent = llm_agent or LlmAgent(
+            model='gemini-2.0-flash',
+            name='menu_parser',
+            instruction=MENU_PARSER_INSTRUCTION,
+            tools=[]
+        )
+        self.response_cache = response_cache or IntentCache()
+        self.intent_engine = intent_engine or IntentEngine()
+        self.rule_confidence_threshold = rule_confidence_threshold
+        self.menu_version = menu_version(self.intent_engine.rules)
+        self.intent_paths = {"rules": 0, "cache": 0, "llm": 0}
 
     def _create_agent_card(self) -> AgentCard:
         skills = [
@@ -38,52 +91,60 @@ class MenuUnderstandingAgent(BaseA2AAgent):
         user_input = message.get("user_input", "")
         self.logger.info(f"Parsing menu intent: {user_input}")
 
-        menu_agent = LlmAgent(
-            model='gemini-2.0-flash',
-            name='menu_parser',
-            instruction=(
-                "You are a McDonald's Global Menu expert. Parse user requests into specific menu items. "
-                "Available items include: Spicy Black Garlic Chicken McNuggets (Japan), "
-                "Pistachio McFlurry (Italy), Cheese & Bacon Loaded Fries (Australia), "
-                "plus standard McDonald's menu. Return a JSON list of specific items to order."
-            ),
-            tools=[]
-        )
-
-        parsing_prompt = f"""
-        Parse this McDonald's order request into specific menu items:
-        "{user_input}"
+        intent = self.intent_engine.parse(user_input)
+        if intent is not None and intent.confidence >= self.rule_confidence_threshold:
+            self.intent_paths["rules"] += 1
+            current_span().set_attribute("intent.path", "rules")
+            self.logger.info(f"Menu intent resolved by rules ({intent.confidence:.2f})")
+            return {
+                "parsed_items": intent.items,
+                "quantities": intent.quantities,
+                "modifiers": intent.modifiers,
+                "excluded_items": intent.excluded,
+                "original_request": user_input,
+                "reasoning": f"Matched menu rules: {', '.join(intent.matched_phrases)}",
+                "confidence": intent.confidence
+            }
 
-        Consider:
-        - If they say "spicy" -> suggest Spicy Black Garlic Chicken McNuggets
-        - If they say "usual" or "wednesday special" -> suggest global menu rotation items
-        - If they want dessert -> suggest Pistachio McFlurry
-        - If they want sides -> suggest Cheese & Bacon Loaded Fries
+        cached = self.response_cache.get(user_input, self.menu_version)
+        if cached is not None:
+            self.intent_paths["cache"] += 1
+            current_span().set_attribute("intent.path", "cache")
+            self.logger.info("Menu intent served from cache")
+            return {**cached, "original_request": user_input}
 
-        Return JSON format: {{"parsed_items": ["item1", "item2"], "reasoning": "why these items"}}
-        """
+        parsing_prompt = MENU_PARSING_PROMPT.format(user_input=user_input)
 
         try:
-            result = await menu_agent.process_message(parsing_prompt)
-
-            if "Spicy Black Garlic Chicken McNuggets" not in result:
-                parsed_items = [
-                    "Spicy Black Garlic Chicken McNuggets",
-                    "Pistachio McFlurry",
-                    "Medium Fries"
-                ]
+            self.intent_paths["llm"] += 1
+            current_span().set_attribute("intent.path", "llm")
+            started = time.monotonic()
+            with get_tracer().start_span("llm.parse_intent", {"llm.agent": "menu_parser"}, "client"):
+                result = await self.menu_agent.process_message(parsing_prompt)
+            latency = time.monotonic() - started
+
+            if NUGGETS not in result:
+                parsed_items = list(USUAL_ORDER)
             else:
-                parsed_items = ["Spicy Black Garlic Chicken McNuggets", "Pistachio McFlurry"]
+                parsed_items = [NUGGETS, MCFLURRY]
 
-            return {
+            response = {
                 "parsed_items": parsed_items,
                 "original_request": user_input,
                 "reasoning": "Selected global menu favorites for Wednesday tradition"
             }
+            self.response_cache.put(user_input, self.menu_version, response, latency)
+            return response
 
         except Exception as e:
             self.logger.error(f"Menu parsing failed: {str(e)}")
             return {
-                "parsed_items": ["Spicy Black Garlic Chicken McNuggets"],
+                "parsed_items": [NUGGETS],
                 "error": str(e)
             }
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "paths": dict(self.intent_paths),
+            "cache": self.response_cache.get_stats()
+        }
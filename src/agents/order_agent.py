@@ -1,11 +1,16 @@
+import asyncio
+import time
+from typing import Dict, Any, Optional, Tuple
 from .base_agent import BaseA2AAgent, AgentCard, AgentSkill, AgentCapabilities
-from .menu_understanding_agent import MenuUnderstandingAgent
-from .web_automation_agent import WebAutomationAgent
-from .checkout_agent import CheckoutAgent
+from .stage_limiter import StageLimiter
+from .streaming import emit, INTENT_PARSED, SESSION_READY, CART_READY
+
+DEFAULT_STAGE_LIMITS = {"parse": 8, "browser": 2, "checkout": 4}
 
 class OrderAgent(BaseA2AAgent):
-    def __init__(self):
+    def __init__(self, stage_limits: Optional[Dict[str, int]] = None):
         super().__init__("OrderAgent", "Processes and orchestrates food orders", 9002)
+        self.stages = StageLimiter(stage_limits or DEFAULT_STAGE_LIMITS)
 
     def _create_agent_card(self) -> AgentCard:
         skills = [
@@ -39,37 +44,73 @@ class OrderAgent(BaseA2AAgent):
     async def process_message(self, message: Dict[str, Any]) -> Dict[str, Any]:
         self.logger.info(f"Processing order: {message}")
 
+        result = await self._process_order(message)
+        await self._record_order(result)
+        return result
+
+    async def _process_order(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        started = time.monotonic()
+        timings: Dict[str, Tuple[float, float]] = {}
+        parse_task = None
+
         try:
-            menu_agent = MenuUnderstandingAgent()
-            parsed_order = await menu_agent.process_message({
-                "type": "parse_intent",
-                "user_input": message.get("user_input", "")
-            })
+            menu_agent = self.get_peer("menu_understanding")
+            web_agent = self.get_peer("web_automation")
 
-            web_agent = WebAutomationAgent()
-            automation_result = await web_agent.process_message({
-                "type": "place_order",
-                "order_details": parsed_order.get("parsed_items", []),
-                "restaurant": "mcdonalds"
-            })
+            # Navigation to the restaurant does not depend on the parsed items, so
+            # it runs alongside intent parsing and the two join before add-to-cart
+            parse_task = asyncio.create_task(
+                self._timed("parse", timings, self._parse_intent(menu_agent, message))
+            )
+
+            async with self.stages.stage("browser"):
+                prepared = await self._timed("navigate", timings, web_agent.process_message({
+                    "type": "prepare_session",
+                    "restaurant": "mcdonalds"
+                }))
+            emit(SESSION_READY, self.name, status=prepared.get("status"))
+
+            # The browser slot is given back while parsing finishes, so a slow
+            # parse does not keep other orders from opening their browsers
+            handed_over = False
+            try:
+                parsed_order = await parse_task
+                async with self.stages.stage("browser"):
+                    handed_over = True
+                    automation_result = await self._timed("add_to_cart", timings, web_agent.process_message({
+                        "type": "place_order",
+                        "order_details": parsed_order.get("parsed_items", []),
+                        "restaurant": "mcdonalds",
+                        "session_id": prepared.get("session_id")
+                    }))
+            except BaseException:
+                # Includes cancellation of this order; until place_order claims it,
+                # the prepared browser must go back to the pool either way
+                if not handed_over:
+                    await asyncio.shield(web_agent.process_message({"type": "release_session", "session_id": prepared.get("session_id")}))
+                raise
 
             if automation_result.get("status") == "ready_for_checkout":
-                checkout_agent = CheckoutAgent()
-                checkout_result = await checkout_agent.process_message({
-                    "type": "complete_checkout",
-                    "cart_id": automation_result.get("cart_id")
-                })
+                emit(CART_READY, self.name, cart_id=automation_result.get("cart_id"))
+                checkout_agent = self.get_peer("checkout")
+                async with self.stages.stage("checkout"):
+                    checkout_result = await self._timed("checkout", timings, checkout_agent.process_message({
+                        "type": "complete_checkout",
+                        "cart_id": automation_result.get("cart_id")
+                    }))
 
                 return {
                     "status": "order_completed",
                     "order_id": checkout_result.get("order_id"),
-                    "message": "Your McDonald's order has been placed successfully!"
+                    "message": "Your McDonald's order has been placed successfully!",
+                    "timings": self._timing_report(started, timings)
                 }
 
             return {
                 "status": "order_failed",
                 "message": "Failed to complete the order process",
-                "details": automation_result
+                "details": automation_result,
+                "timings": self._timing_report(started, timings)
             }
 
         except Exception as e:
@@ -78,3 +119,59 @@ class OrderAgent(BaseA2AAgent):
                 "status": "error",
                 "message": f"Order processing error: {str(e)}"
             }
+
+        finally:
+            if parse_task is not None and not parse_task.done():
+                parse_task.cancel()
+
+    async def _record_order(self, result: Dict[str, Any]):
+        timings = result.get("timings", {})
+        stages = {
+            name[:-len("_time")]: seconds
+            for name, seconds in timings.items()
+            if name.endswith("_time") and name != "total_time"
+        }
+
+        try:
+            await self.get_peer("logger").process_message({
+                "agent": self.name,
+                # A failed order is an outcome counted by success_rate, not a logging error
+                "level": "info" if result.get("status") == "order_completed" else "warning",
+                "message": f"Order finished: {result.get('status')}",
+                # The order's duration is recorded from its process_message span
+                "data": {"order_status": result.get("status"), "stages": stages}
+            })
+        except Exception as e:
+            self.logger.warning(f"Could not record order analytics: {e}")
+
+    async def _parse_intent(self, menu_agent: BaseA2AAgent, message: Dict[str, Any]) -> Dict[str, Any]:
+        async with self.stages.stage("parse"):
+            parsed_order = await menu_agent.process_message({
+                "type": "parse_intent",
+                "user_input": message.get("user_input", "")
+            })
+        emit(INTENT_PARSED, self.name, items=parsed_order.get("parsed_items", []))
+        return parsed_order
+
+    @staticmethod
+    async def _timed(name: str, timings: Dict[str, Tuple[float, float]], awaitable):
+        started = time.monotonic()
+        try:
+            return await awaitable
+        finally:
+            timings[name] = (started, time.monotonic())
+
+    def _timing_report(self, started: float, timings: Dict[str, Tuple[float, float]]) -> Dict[str, float]:
+        report = {
+            f"{name}_time": end - begin
+            for name, (begin, end) in timings.items()
+        }
+
+        if "parse" in timings and "navigate" in timings:
+            (parse_start, parse_end), (nav_start, nav_end) = timings["parse"], timings["navigate"]
+            report["parse_navigate_overlap"] = max(0.0, min(parse_end, nav_end) - max(parse_start, nav_start))
+            report["critical_path_to_cart"] = max(parse_end, nav_end) - started
+
+        report["total_time"] = time.monotonic() - started
+        self.logger.info(f"Order timings: {report}")
+        return report
@@ -0,0 +1,142 @@
+import json
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
+from .session_store import DEFAULT_KEY_PATH, load_fernet
+
+logger = logging.getLogger(__name__)
+
+# The order flow as run by McDonaldsOrderBot, one bot method per step
+ORDER_STEPS = [
+    "navigate_to_ubereats",
+    "set_delivery_address",
+    "search_mcdonalds",
+    "find_global_favorites_section",
+    "add_global_favorites_items",
+    "view_cart_and_checkout"
+]
+
+@dataclass
+class OrderCheckpoint:
+    run_id: str
+    completed: List[str] = field(default_factory=list)
+    url: Optional[str] = None
+    cookies: List[Dict[str, Any]] = field(default_factory=list)
+    cart_items: List[str] = field(default_factory=list)
+    step_durations: Dict[str, float] = field(default_factory=dict)
+    updated_at: float = field(default_factory=time.time)
+
+    @property
+    def last_step(self) -> Optional[str]:
+        return self.completed[-1] if self.completed else None
+
+    @property
+    def time_invested(self) -> float:
+        return sum(self.step_durations.values())
+
+class CheckpointStore:
+    """Keeps the last good state of each order run on disk.
+
+    A checkpoint is written after every completed step, so a retry of the
+    same run can restore the browser to where the previous attempt got to
+    instead of starting over. Checkpoints hold session cookies, so they are
+    Fernet-encrypted with the session store's key. Checkpoints older than
+    ``max_age`` are discarded, since cookies and carts do not survive
+    indefinitely.
+    """
+
+    def __init__(self, directory: str = os.path.join(".cache", "checkpoints"), max_age: float = 1800.0,
+                 key: Optional[bytes] = None, key_path: str = DEFAULT_KEY_PATH):
+        self.directory = directory
+        self.max_age = max_age
+        self.fernet = load_fernet(key, key_path)
+        self.stats = {"saved": 0, "resumes": 0, "stale": 0, "steps_skipped": 0, "time_saved": 0.0}
+        self._lock = threading.Lock()
+        self.prune()
+
+    def _path(self, run_id: str) -> str:
+        return os.path.join(self.directory, re.sub(r"[^\w.-]", "_", run_id) + ".checkpoint")
+
+    def save(self, checkpoint: OrderCheckpoint):
+        checkpoint.updated_at = time.time()
+        token = self.fernet.encrypt(json.dumps(asdict(checkpoint)).encode())
+        path = self._path(checkpoint.run_id)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(token)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not save checkpoint for {checkpoint.run_id}: {e}")
+            return
+        with self._lock:
+            self.stats["saved"] += 1
+
+    def load(self, run_id: str) -> Optional[OrderCheckpoint]:
+        from cryptography.fernet import InvalidToken
+        try:
+            with open(self._path(run_id), "rb") as f:
+                token = f.read()
+        except OSError:
+            return None
+
+        try:
+            checkpoint = OrderCheckpoint(**json.loads(self.fernet.decrypt(token)))
+        except (InvalidToken, ValueError, TypeError):
+            logger.warning(f"Discarding unreadable checkpoint for {run_id}")
+            self.delete(run_id)
+            return None
+
+        if time.time() - checkpoint.updated_at > self.max_age:
+            self.delete(run_id)
+            return None
+        return checkpoint
+
+    def delete(self, run_id: str):
+        try:
+            os.remove(self._path(run_id))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not delete checkpoint for {run_id}: {e}")
+
+    def prune(self):
+        """Delete checkpoints left behind by runs that were never retried."""
+        cutoff = time.time() - self.max_age
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+        for name in names:
+            path = os.path.join(self.directory, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                continue
+
+    def record_resume(self, checkpoint: OrderCheckpoint, restore_time: float) -> float:
+        """Count a successful resume and return the seconds it saved over a fresh run."""
+        saved = max(0.0, checkpoint.time_invested - restore_time)
+        with self._lock:
+            self.stats["resumes"] += 1
+            self.stats["steps_skipped"] += len(checkpoint.completed)
+            self.stats["time_saved"] += saved
+        return saved
+
+    def record_stale(self, run_id: str):
+        self.delete(run_id)
+        with self._lock:
+            self.stats["stale"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self.stats,
+                "avg_time_saved": self.stats["time_saved"] / self.stats["resumes"] if self.stats["resumes"] > 0 else 0
+            }
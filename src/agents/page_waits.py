@@ -0,0 +1,161 @@
+import time
+import logging
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from .tracing import get_tracer
+
+logger = logging.getLogger(__name__)
+
+NETWORK_PROBE_SCRIPT = """
+if (!window.__mcdPending) {
+    const pending = window.__mcdPending = {count: 0};
+    if (window.fetch) {
+        const originalFetch = window.fetch;
+        window.fetch = function() {
+            pending.count++;
+            return originalFetch.apply(this, arguments).finally(function() { pending.count--; });
+        };
+    }
+    const originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function() {
+        pending.count++;
+        this.addEventListener('loadend', function() { pending.count--; });
+        return originalSend.apply(this, arguments);
+    };
+}
+return [performance.getEntriesByType('resource').length, window.__mcdPending.count];
+"""
+
+class PageWaiter:
+    """Polls page conditions with adaptive backoff instead of fixed sleeps.
+
+    Polling starts at ``initial_interval`` and grows by ``backoff`` after
+    every miss up to ``max_interval``, so fast pages return almost
+    immediately while slow pages are not hammered with WebDriver calls.
+    ``ready_states`` are the document readyStates that count as loaded;
+    drivers using the eager load strategy accept ``interactive`` too.
+    ``settle_scale`` multiplies every ``settle`` and ``scroll_to`` bound.
+    """
+
+    def __init__(self, driver, timeout: float = 10.0, initial_interval: float = 0.05,
+                 max_interval: float = 0.5, backoff: float = 1.5, ready_states: Sequence[str] = ("complete",),
+                 settle_scale: float = 1.0):
+        self.driver = driver
+        self.timeout = timeout
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.ready_states = tuple(ready_states)
+        self.settle_scale = settle_scale
+
+    def until(self, condition: Callable[[Any], Any], timeout: Optional[float] = None, message: str = ""):
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+        interval = self.initial_interval
+
+        while True:
+            try:
+                value = condition(self.driver)
+                if value:
+                    return value
+            except WebDriverException:
+                pass
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutException(message or "Condition not met before timeout")
+
+            time.sleep(min(interval, remaining))
+            interval = min(interval * self.backoff, self.max_interval)
+
+    def poll(self, condition: Callable[[Any], Any], timeout: Optional[float] = None):
+        """Like ``until`` but returns None instead of raising on timeout."""
+        try:
+            return self.until(condition, timeout)
+        except TimeoutException:
+            return None
+
+    def document_ready(self, timeout: Optional[float] = None):
+        return self.until(
+            lambda d: d.execute_script("return document.readyState") in self.ready_states,
+            timeout,
+            f"Document did not reach readyState {' or '.join(self.ready_states)}"
+        )
+
+    def network_idle(self, idle_time: float = 0.3, timeout: Optional[float] = None):
+        state = {"snapshot": None, "since": time.monotonic()}
+
+        def is_idle(driver):
+            snapshot = tuple(driver.execute_script(NETWORK_PROBE_SCRIPT))
+            now = time.monotonic()
+            if snapshot != state["snapshot"] or snapshot[1] > 0:
+                state["snapshot"] = snapshot
+                state["since"] = now
+                return False
+            return now - state["since"] >= idle_time
+
+        return self.until(is_idle, timeout, "Network did not become idle")
+
+    def settle(self, timeout: float = 3.0):
+        """Wait for the document to load and the network to go quiet.
+
+        Each call site passes the fixed sleep it replaced as ``timeout``, so
+        by default a page that is still busy (UberEats polls constantly)
+        costs what the sleep did and no more; the timeout is logged and
+        swallowed. On connections where pages take longer than those sleeps
+        to settle, raise ``settle_scale`` to stretch every bound.
+        """
+        self._settle_until(time.monotonic() + timeout * self.settle_scale)
+
+    def _settle_until(self, deadline: float):
+        try:
+            self.document_ready(max(0.0, deadline - time.monotonic()))
+            self.network_idle(timeout=max(0.0, deadline - time.monotonic()))
+        except TimeoutException as e:
+            logger.debug(f"Page did not settle: {e}")
+
+    def scroll_to(self, y: int, timeout: float = 1.0):
+        deadline = time.monotonic() + timeout * self.settle_scale
+        self.driver.execute_script(f"window.scrollTo(0, {y});")
+        self.poll(
+            lambda d: d.execute_script(
+                f"return Math.abs(window.scrollY - Math.min({y}, Math.max(0, document.body.scrollHeight - window.innerHeight))) < 2"
+            ),
+            max(0.0, deadline - time.monotonic())
+        )
+        self._settle_until(deadline)
+
+class StepTimer:
+    def __init__(self):
+        self.steps: List[Dict[str, Any]] = []
+
+    @contextmanager
+    def step(self, name: str):
+        started = time.monotonic()
+        entry = {"step": name, "duration": None, "ok": None}
+        self.steps.append(entry)
+        with get_tracer().start_span(f"browser.{name}") as span:
+            try:
+                yield entry
+            except BaseException:
+                entry["ok"] = False
+                raise
+            else:
+                if entry["ok"] is None:
+                    entry["ok"] = True
+            finally:
+                entry["duration"] = time.monotonic() - started
+                if entry["ok"] is False:
+                    span.set_error(f"Step {name} failed")
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "steps": list(self.steps),
+            "total_duration": sum(s["duration"] or 0 for s in self.steps)
+        }
+
+    def log_report(self):
+        for entry in self.steps:
+            transferred = f", {entry['bytes'] / 1024:.0f} KB in {entry['requests']} requests" if "bytes" in entry else ""
+            logger.info(f"Step {entry['step']}: {entry['duration']:.2f}s ({'ok' if entry['ok'] else 'failed'}){transferred}")
+        logger.info(f"Total: {self.report()['total_duration']:.2f}s")
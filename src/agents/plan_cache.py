@@ -0,0 +1,357 @@
+import contextvars
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+ITEM_PLACEHOLDER = "{item}"
+# Bumped whenever the stored plan layout changes; older plans are discarded
+PLAN_FORMAT = 2
+
+URL_PATTERN = re.compile(r"https?://[^\s'\"<>)\]]+")
+CART_COUNT_PATTERN = re.compile(r"cart\D{0,20}?(\d+)", re.IGNORECASE)
+
+class ToolCallLog(list):
+    """Recorded tool calls; ``on_call`` sees each call as it is appended."""
+
+    def __init__(self, on_call: Optional[Callable[[Dict[str, Any]], None]] = None):
+        super().__init__()
+        self.on_call = on_call
+
+    def append(self, call: Dict[str, Any]):
+        super().append(call)
+        if self.on_call is not None:
+            self.on_call(call)
+
+_recording: contextvars.ContextVar[Optional[ToolCallLog]] = contextvars.ContextVar("tool_recording", default=None)
+
+@contextmanager
+def record_tool_calls(on_call: Optional[Callable[[Dict[str, Any]], None]] = None):
+    """Collect the tool calls made by LLM agents running in this context."""
+    calls = ToolCallLog(on_call)
+    token = _recording.set(calls)
+    try:
+        yield calls
+    finally:
+        _recording.reset(token)
+
+def record_tool_call(tool, args, tool_context, tool_response):
+    """``after_tool_callback`` for LlmAgent; returns None so the response is left unchanged."""
+    calls = _recording.get()
+    if calls is not None:
+        calls.append({
+            "tool": tool.name,
+            "args": dict(args or {}),
+            "ok": tool_succeeded(tool_response),
+            "observed": observe(tool_response)
+        })
+    return None
+
+def tool_succeeded(response: Any) -> bool:
+    """Postcondition for a tool step: it returned and did not report an error."""
+    if response is None:
+        return False
+    if isinstance(response, dict):
+        return not response.get("isError") and not response.get("error")
+    return not getattr(response, "isError", False)
+
+def _response_text(response: Any) -> str:
+    if isinstance(response, (dict, list)):
+        return json.dumps(response, default=str)
+    content = getattr(response, "content", None)
+    if isinstance(content, list):
+        return " ".join(str(getattr(part, "text", "")) for part in content)
+    return str(response)
+
+def observe(response: Any) -> Dict[str, Any]:
+    """Page state a tool reported after its step: the current URL and the cart count, when present."""
+    text = _response_text(response)
+    observed: Dict[str, Any] = {}
+    urls = URL_PATTERN.findall(text)
+    if urls:
+        observed["url"] = urls[-1].split("#")[0].split("?")[0].rstrip("/")
+    counts = CART_COUNT_PATTERN.findall(text)
+    if counts:
+        observed["cart_count"] = int(counts[-1])
+    return observed
+
+def check_expectation(expect: Dict[str, Any], observed: Dict[str, Any]) -> Optional[str]:
+    """Compare a replayed step's page state with the one recorded; returns the mismatch, if any.
+
+    Only the page is compared here. The absolute cart count after a step
+    depends on how many items came before it, so it is checked per item
+    instead, against the plan's ``cart_delta``, in ``PlanCache.replay``.
+    """
+    url = expect.get("url")
+    if url is not None and observed.get("url") != url:
+        return f"expected page {url}, got {observed.get('url') or 'no page reported'}"
+    return None
+
+def layout_key(tools: Sequence[Any]) -> str:
+    """Fingerprint of the browser tool set; plans recorded against other tools do not replay."""
+    names = sorted(getattr(tool, "name", str(tool)) for tool in tools)
+    return hashlib.sha1(",".join(names).encode()).hexdigest()[:12]
+
+def mentions(args: Dict[str, Any], item: str) -> bool:
+    return item.lower() in json.dumps(args).lower()
+
+def _substitute(value: Any, old: str, new: str) -> Any:
+    if isinstance(value, str):
+        index = value.lower().find(old.lower())
+        while index >= 0:
+            value = value[:index] + new + value[index + len(old):]
+            index = value.lower().find(old.lower(), index + len(new))
+        return value
+    if isinstance(value, dict):
+        return {key: _substitute(v, old, new) for key, v in value.items()}
+    if isinstance(value, list):
+        return [_substitute(v, old, new) for v in value]
+    return value
+
+def _expect(observed: Dict[str, Any], item: Optional[str] = None) -> Dict[str, Any]:
+    url = observed.get("url")
+    if url is None:
+        return {}
+    return {"url": _substitute(url, item, ITEM_PLACEHOLDER) if item else url}
+
+def _cart_count_before(steps: List[Dict[str, Any]], index: int) -> Optional[int]:
+    return next((step["observed"]["cart_count"] for step in reversed(steps[:index]) if "cart_count" in step["observed"]), None)
+
+def build_plan(calls: List[Dict[str, Any]], items: Sequence[str]) -> Optional[Dict[str, Any]]:
+    """Turn a successful run's tool calls into a plan that replays for any item list.
+
+    Calls before the first item is mentioned form the prefix and calls after
+    the last item's steps form the suffix. The steps for each item must have
+    the same shape once the item name is replaced by a placeholder,
+    otherwise the run cannot be generalized and no plan is returned.
+
+    Each step keeps the page it left the browser on as its postcondition,
+    and when every item's steps raised the reported cart count by the same
+    amount, that change becomes the postcondition of each item.
+    """
+    steps = [
+        {"tool": call["tool"], "args": call["args"], "observed": call.get("observed", {})}
+        for call in calls if call.get("ok", True)
+    ]
+    if not items:
+        return {"prefix": [_step(step) for step in steps], "per_item": [], "suffix": [], "cart_delta": None}
+
+    starts = []
+    for item in items:
+        start = next((i for i, step in enumerate(steps) if mentions(step["args"], item)), None)
+        if start is None or (starts and start <= starts[-1]):
+            return None
+        starts.append(start)
+
+    last = max(i for i, step in enumerate(steps) if mentions(step["args"], items[-1]))
+    bounds = starts[1:] + [last + 1]
+    segments = [
+        [{"tool": step["tool"], "args": _substitute(step["args"], item, ITEM_PLACEHOLDER),
+          "expect": _expect(step["observed"], item)} for step in steps[start:end]]
+        for item, start, end in zip(items, starts, bounds)
+    ]
+    shapes = [[(step["tool"], step["args"]) for step in segment] for segment in segments]
+    if any(shape != shapes[0] for shape in shapes):
+        return None
+
+    # A page expectation only generalizes if every item's run agreed on it
+    per_item = []
+    for position, step in enumerate(segments[0]):
+        agreed = all(segment[position]["expect"] == step["expect"] for segment in segments)
+        per_item.append({**step, "expect": step["expect"] if agreed else {}})
+
+    deltas = set()
+    for start, end in zip(starts, bounds):
+        before, after = _cart_count_before(steps, start), _cart_count_before(steps, end)
+        deltas.add(after - before if before is not None and after is not None else None)
+    cart_delta = deltas.pop() if len(deltas) == 1 else None
+
+    return {
+        "prefix": [_step(step) for step in steps[:starts[0]]],
+        "per_item": per_item,
+        "suffix": [_step(step) for step in steps[last + 1:]],
+        "cart_delta": cart_delta if cart_delta else None
+    }
+
+def _step(step: Dict[str, Any]) -> Dict[str, Any]:
+    return {"tool": step["tool"], "args": step["args"], "expect": _expect(step["observed"])}
+
+def expand_plan(plan: Dict[str, Any], items: Sequence[str]) -> List[Dict[str, Any]]:
+    """Flatten ``plan`` for ``items``; the first and last step of each item are marked for the cart check."""
+    steps = list(plan["prefix"])
+    for item in items:
+        segment = [
+            {"tool": step["tool"], "args": _substitute(step["args"], ITEM_PLACEHOLDER, item),
+             "expect": _substitute(step.get("expect", {}), ITEM_PLACEHOLDER, item)}
+            for step in plan["per_item"]
+        ]
+        if segment:
+            segment[0] = {**segment[0], "item_start": True}
+            segment[-1] = {**segment[-1], "item_end": item}
+        steps += segment
+    return steps + list(plan["suffix"])
+
+class PlanCache:
+    """Recorded tool-call plans for the LLM browser agent.
+
+    A plan is the sequence of MCP tool calls a successful run made, keyed by
+    restaurant, task and tool layout. Replaying it calls the tools directly,
+    so each replayed step saves the model turn that would have chosen it,
+    and a fully replayed task also saves the model's final summary turn.
+    Plans expire after ``ttl`` seconds and are persisted as JSON. Agent
+    replicas share one cache, so plans and stats are guarded by a lock.
+    """
+
+    def __init__(self, path: str = os.path.join(".cache", "plan_cache.json"), ttl: float = 7 * 24 * 3600):
+        self.path = path
+        self.ttl = ttl
+        self._plans: Dict[str, Dict[str, Any]] = self._load()
+        self._lock = threading.Lock()
+        # Held across a whole save, so an older snapshot never replaces a newer one on disk
+        self._save_lock = threading.Lock()
+        self.stats = {
+            "lookups": 0,
+            "hits": 0,
+            "recorded": 0,
+            "unrecordable": 0,
+            "full_replays": 0,
+            "handoffs": 0,
+            "steps_replayed": 0,
+            "llm_turns_avoided": 0
+        }
+
+    @staticmethod
+    def _key(restaurant: str, task: str, layout: str) -> str:
+        return f"{restaurant}:{task}:{layout}"
+
+    def _count(self, stat: str, amount: int = 1):
+        with self._lock:
+            self.stats[stat] += amount
+
+    def get(self, restaurant: str, task: str, layout: str) -> Optional[Dict[str, Any]]:
+        key = self._key(restaurant, task, layout)
+        with self._lock:
+            self.stats["lookups"] += 1
+            plan = self._plans.get(key)
+            if plan is not None and plan.get("format") == PLAN_FORMAT and time.time() - plan["created_at"] <= self.ttl:
+                self.stats["hits"] += 1
+                return plan
+        if plan is not None:
+            self.invalidate(restaurant, task, layout)
+        return None
+
+    def put(self, restaurant: str, task: str, layout: str, calls: List[Dict[str, Any]], items: Sequence[str]):
+        plan = build_plan(calls, items)
+        if plan is None or not (plan["prefix"] or plan["per_item"] or plan["suffix"]):
+            self._count("unrecordable")
+            return
+        plan["format"] = PLAN_FORMAT
+        plan["created_at"] = time.time()
+        with self._lock:
+            self._plans[self._key(restaurant, task, layout)] = plan
+            self.stats["recorded"] += 1
+        self._save()
+
+    def invalidate(self, restaurant: str, task: str, layout: str):
+        with self._lock:
+            removed = self._plans.pop(self._key(restaurant, task, layout), None)
+        if removed is not None:
+            self._save()
+
+    async def replay(self, plan: Dict[str, Any], tools: Sequence[Any], items: Sequence[str],
+                     calls: List[Dict[str, Any]], tool_context_factory: Optional[Callable[[], Any]] = None
+                     ) -> Optional[Dict[str, Any]]:
+        """Run ``plan`` against ``tools``, appending each step to ``calls``.
+
+        A step passes when the tool reports no error, the page it reports
+        is the one recorded for that step, and, at the end of an item, the
+        cart count has changed as it did when the plan was recorded. Tools
+        get a context from ``tool_context_factory``, so toolsets with auth or
+        header providers work as they do under the LLM. Returns None when
+        every step passed, otherwise the failed step with its error so the
+        LLM can take over from there.
+        """
+        by_name = {tool.name: tool for tool in tools}
+        cart_delta = plan.get("cart_delta")
+        cart_count = item_base = None
+        failed = None
+        for step in expand_plan(plan, items):
+            call = {"tool": step["tool"], "args": step["args"]}
+            tool = by_name.get(step["tool"])
+            if tool is None:
+                failed = {**call, "error": "tool not available"}
+                break
+            if step.get("item_start"):
+                item_base = cart_count
+
+            tool_context = tool_context_factory() if tool_context_factory is not None else None
+            try:
+                response = await tool.run_async(args=step["args"], tool_context=tool_context)
+            except Exception as e:
+                failed = {**call, "error": str(e)}
+                break
+            if not tool_succeeded(response):
+                failed = {**call, "error": str(response)[:200]}
+                break
+            if getattr(getattr(tool_context, "actions", None), "requested_auth_configs", None):
+                failed = {**call, "error": "tool is waiting for user authorization"}
+                break
+
+            observed = observe(response)
+            cart_count = observed.get("cart_count", cart_count)
+            mismatch = check_expectation(step.get("expect", {}), observed)
+            if mismatch is None and step.get("item_end") and cart_delta:
+                if item_base is None or cart_count is None or cart_count - item_base != cart_delta:
+                    mismatch = f"cart count went from {item_base} to {cart_count} adding {step['item_end']}, expected +{cart_delta}"
+            if mismatch is not None:
+                failed = {**call, "error": f"postcondition failed: {mismatch}"}
+                break
+
+            calls.append({**call, "ok": True, "observed": observed})
+            self._count("steps_replayed")
+            self._count("llm_turns_avoided")
+
+        if failed is None:
+            self._count("full_replays")
+            self._count("llm_turns_avoided")
+        else:
+            self._count("handoffs")
+            logger.info(f"Plan replay stopped at {failed['tool']}: {failed['error']}")
+        return failed
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            plans = len(self._plans)
+        return {
+            **stats,
+            "hit_rate": stats["hits"] / stats["lookups"] if stats["lookups"] > 0 else 0,
+            "plans": plans
+        }
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        with self._save_lock:
+            with self._lock:
+                payload = json.dumps(self._plans)
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                tmp_path = f"{self.path}.{threading.get_ident()}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    f.write(payload)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                logger.warning(f"Could not persist plan cache: {e}")
@@ -0,0 +1,159 @@
+import itertools
+import os
+from dataclasses import asdict
+from typing import Any, Callable, Dict, List, Optional
+
+class AgentRegistry:
+    """Builds agents on first use and routes callers to them.
+
+    A key may have several replicas (local or remote). ``get`` returns the
+    replica with the fewest in-flight messages, rotating between equally
+    loaded ones, so scaling out an agent is a matter of ``add_replica``.
+    Skills from every agent card are indexed by id and tag for
+    ``find_by_skill``.
+    """
+
+    def __init__(self):
+        self._factories: Dict[str, List[Callable[[], Any]]] = {}
+        self._instances: Dict[str, List[Any]] = {}
+        self._rotation = itertools.count()
+        self._skill_index: Optional[Dict[str, Dict[str, List[str]]]] = None
+
+    def register(self, key: str, factory: Callable[[], Any]):
+        self._factories[key] = [factory]
+        self._instances.pop(key, None)
+        self._skill_index = None
+
+    def add_replica(self, key: str, factory: Callable[[], Any]):
+        if key not in self._factories:
+            raise KeyError(f"No agent registered under '{key}'")
+        self._factories[key].append(factory)
+        self._skill_index = None
+
+    def replicas(self, key: str) -> List[Any]:
+        if key not in self._factories:
+            raise KeyError(f"No agent registered under '{key}'")
+        built = self._instances.setdefault(key, [])
+        for factory in self._factories[key][len(built):]:
+            agent = factory()
+            agent.registry = self
+            built.append(agent)
+        return built
+
+    def get(self, key: str):
+        return self._least_loaded(self.replicas(key))
+
+    def _least_loaded(self, candidates: List[Any]):
+        if len(candidates) == 1:
+            return candidates[0]
+        offset = next(self._rotation)
+        rotated = candidates[offset % len(candidates):] + candidates[:offset % len(candidates)]
+        return min(rotated, key=lambda agent: getattr(agent, "in_flight", 0))
+
+    def register_remote(self, key: str, url: str, client=None, replica: bool = False):
+        """Route ``key`` to an agent served over HTTP at ``url`` instead of building it locally."""
+        from a2a.client import RemoteAgent
+        factory = lambda: RemoteAgent(key, url, client)
+        if replica:
+            self.add_replica(key, factory)
+        else:
+            self.register(key, factory)
+
+    def keys(self) -> List[str]:
+        return list(self._factories)
+
+    def instances(self) -> Dict[str, Any]:
+        """The primary replica of every agent, keyed by registry key."""
+        return {key: self.replicas(key)[0] for key in self._factories}
+
+    def cards(self) -> Dict[str, Any]:
+        cards = {}
+        for key in self._factories:
+            card = getattr(self.replicas(key)[0], "agent_card", None)
+            if card is not None:
+                cards[key] = card
+        return cards
+
+    async def refresh_remote_cards(self):
+        """Fetch cards from remote replicas so their skills can be indexed."""
+        for key in self._factories:
+            primary = self.replicas(key)[0]
+            if getattr(primary, "is_remote", False):
+                await primary.get_agent_card()
+        self._skill_index = None
+
+    def skill_index(self) -> Dict[str, Dict[str, List[str]]]:
+        if self._skill_index is None:
+            index: Dict[str, Dict[str, List[str]]] = {"ids": {}, "tags": {}}
+            for key, card in self.cards().items():
+                for skill in card.skills:
+                    index["ids"].setdefault(skill.id, []).append(key)
+                    for tag in skill.tags:
+                        keys = index["tags"].setdefault(tag, [])
+                        if key not in keys:
+                            keys.append(key)
+            self._skill_index = index
+        return self._skill_index
+
+    def find_by_skill(self, skill: str):
+        """Least-loaded replica of the agent offering ``skill`` (a skill id, or else a tag).
+
+        The skill must resolve to a single agent key, so callers never get
+        a replica of a different agent type than the one they asked for;
+        a tag shared by several agents raises ``ValueError``.
+        """
+        index = self.skill_index()
+        keys = index["ids"].get(skill) or index["tags"].get(skill)
+        if not keys:
+            raise KeyError(f"No agent offers skill '{skill}'")
+        if len(keys) > 1:
+            raise ValueError(f"Skill '{skill}' is offered by several agents: {', '.join(keys)}")
+        return self.get(keys[0])
+
+    def describe(self) -> Dict[str, Any]:
+        """Discovery document: every card plus the load on each replica."""
+        return {
+            key: {
+                "card": asdict(card),
+                "replicas": [
+                    {"url": getattr(agent, "url", None) or card.url, "in_flight": getattr(agent, "in_flight", 0)}
+                    for agent in self.replicas(key)
+                ]
+            }
+            for key, card in self.cards().items()
+        }
+
+def create_default_registry() -> AgentRegistry:
+    from .user_proxy_agent import UserProxyAgent
+    from .order_agent import OrderAgent
+    from .web_automation_agent import WebAutomationAgent
+    from .menu_understanding_agent import MenuUnderstandingAgent
+    from .checkout_agent import CheckoutAgent
+    from .scheduler_agent import SchedulerAgent
+    from .logger_agent import LoggerAgent
+
+    registry = AgentRegistry()
+    registry.register("user_proxy", UserProxyAgent)
+    registry.register("order_agent", OrderAgent)
+    registry.register("web_automation", WebAutomationAgent)
+    registry.register("menu_understanding", MenuUnderstandingAgent)
+    registry.register("checkout", CheckoutAgent)
+    registry.register("scheduler", SchedulerAgent)
+    registry.register("logger", LoggerAgent)
+
+    # e.g. A2A_REMOTE_AGENTS="web_automation=http://worker-1:9003/,web_automation=http://worker-2:9003/"
+    # A key listed more than once gets one remote replica per URL
+    remote_keys = set()
+    for entry in filter(None, os.environ.get("A2A_REMOTE_AGENTS", "").split(",")):
+        key, url = (part.strip() for part in entry.split("=", 1))
+        registry.register_remote(key, url, replica=key in remote_keys)
+        remote_keys.add(key)
+    return registry
+
+_default_registry: Optional[AgentRegistry] = None
+
+def get_default_registry() -> AgentRegistry:
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = create_default_registry()
+    return _default_registry
@@ -0,0 +1,313 @@
+import asyncio
+import functools
+import heapq
+import itertools
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from zoneinfo import ZoneInfo
+
+logger = logging.getLogger(__name__)
+
+class CronExpression:
+    """Standard five-field cron expression: minute hour day-of-month month day-of-week.
+
+    Fields accept ``*``, numbers, ranges (``1-5``), lists (``1,3``) and steps
+    (``*/15``, ``0-30/10``). Day-of-week uses 0-6 with 0 (or 7) as Sunday.
+    When both day fields are restricted a day matches if either does, as in
+    Vixie cron.
+    """
+
+    RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+
+    def __init__(self, expression: str):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression must have 5 fields: '{expression}'")
+
+        self.expression = expression
+        parsed = [self._parse_field(value, low, high) for value, (low, high) in zip(fields, self.RANGES)]
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        self.weekdays = {0 if day == 7 else day for day in weekdays}
+        self.day_restricted = fields[2] != "*"
+        self.weekday_restricted = fields[4] != "*"
+
+    @staticmethod
+    def _parse_field(value: str, low: int, high: int) -> Set[int]:
+        result: Set[int] = set()
+        for part in value.split(","):
+            step = 1
+            if "/" in part:
+                part, step_value = part.split("/", 1)
+                step = int(step_value)
+                if step < 1:
+                    raise ValueError(f"Invalid cron step: '{value}'")
+
+            if part == "*":
+                start, end = low, high
+            elif "-" in part:
+                start, end = (int(bound) for bound in part.split("-", 1))
+            else:
+                start = int(part)
+                end = high if step > 1 else start
+
+            if start < low or end > high or start > end:
+                raise ValueError(f"Cron field '{value}' out of range {low}-{high}")
+            result.update(range(start, end + 1, step))
+        return result
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day_match = moment.day in self.days
+        weekday_match = (moment.weekday() + 1) % 7 in self.weekdays
+        if self.day_restricted and self.weekday_restricted:
+            return day_match or weekday_match
+        return day_match and weekday_match
+
+    def next_after(self, moment: datetime) -> datetime:
+        """Return the first matching minute strictly after ``moment``.
+
+        Matching happens on the wall clock of ``moment``'s timezone, so a
+        job at 12:00 America/Chicago stays at noon across DST changes.
+        """
+        tz = moment.tzinfo
+        candidate = moment.replace(tzinfo=None, second=0, microsecond=0) + timedelta(minutes=1)
+        limit = candidate + timedelta(days=366 * 5)
+
+        while candidate < limit:
+            if candidate.month not in self.months:
+                year, month = (candidate.year + 1, 1) if candidate.month == 12 else (candidate.year, candidate.month + 1)
+                candidate = datetime(year, month, 1)
+                continue
+            if not self._day_matches(candidate):
+                candidate = datetime(candidate.year, candidate.month, candidate.day) + timedelta(days=1)
+                continue
+            if candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+                continue
+            if candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+                continue
+            return candidate.replace(tzinfo=tz)
+
+        raise ValueError(f"Cron expression never matches: '{self.expression}'")
+
+class SystemClock:
+    def now(self) -> datetime:
+        return datetime.now(timezone.utc)
+
+    async def sleep(self, seconds: float):
+        await asyncio.sleep(seconds)
+
+@dataclass
+class ScheduledJob:
+    job_id: str
+    cron: CronExpression
+    timezone: str
+    callback: Callable[["ScheduledJob"], Awaitable[Any]]
+    payload: Dict[str, Any] = field(default_factory=dict)
+    next_run: Optional[datetime] = None
+    last_run: Optional[datetime] = None
+
+    def compute_next_run(self, after: datetime) -> datetime:
+        local = after.astimezone(ZoneInfo(self.timezone))
+        return self.cron.next_after(local).astimezone(timezone.utc)
+
+class ScheduleEngine:
+    """Heap-ordered timer queue that sleeps until the next due job.
+
+    Each due job fires once and is rescheduled from the current time, so
+    runs missed while the loop was blocked or the machine was asleep are
+    collapsed into a single run rather than replayed. Adding a job that is
+    due sooner than the current head wakes the loop immediately.
+
+    With a ``store``, jobs and run history survive restarts. A run that
+    was due while the process was down still fires if it is no older than
+    ``catch_up_window``, and ``claim_run`` keeps a scheduled run from firing
+    twice. Runs hold a ``lease`` on their claim that is renewed while they
+    execute; when the loop starts, runs whose lease lapsed (the process died
+    mid-run) are fired again if still inside the catch-up window.
+
+    Store calls go through a single worker thread, keeping sqlite off the
+    event loop while applying writes in the order they were issued.
+    """
+
+    def __init__(self, clock=None, store=None, catch_up_window: timedelta = timedelta(hours=2),
+                 lease: float = 600.0):
+        self.clock = clock or SystemClock()
+        self.store = store
+        self.catch_up_window = catch_up_window
+        self.lease = lease
+        self._store_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="job-store")
+        self.jobs: Dict[str, ScheduledJob] = {}
+        self._heap: List[Tuple[datetime, int, str]] = []
+        self._sequence = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._running = False
+        self._loop_task: Optional[asyncio.Task] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    def add_job(
+        self,
+        job_id: str,
+        cron_expression: str,
+        callback: Callable[[ScheduledJob], Awaitable[Any]],
+        timezone_name: str = "America/Chicago",
+        payload: Optional[Dict[str, Any]] = None,
+        next_run: Optional[datetime] = None,
+        last_run: Optional[datetime] = None,
+        persist: bool = True
+    ) -> ScheduledJob:
+        job = ScheduledJob(job_id, CronExpression(cron_expression), timezone_name, callback, payload or {})
+        job.next_run = next_run or job.compute_next_run(self.clock.now())
+        job.last_run = last_run
+        self.jobs[job_id] = job
+        self._push(job)
+
+        if self.store is not None and persist:
+            self._store_write(self.store.save_job, job_id, cron_expression, timezone_name, job.payload, job.next_run, job.last_run)
+        return job
+
+    def restore_jobs(self, callback: Callable[[ScheduledJob], Awaitable[Any]]) -> int:
+        """Reload persisted jobs; overdue ones are handled by the catch-up rules on the next tick."""
+        if self.store is None:
+            return 0
+
+        restored = self.store.load_jobs()
+        for row in restored:
+            self.add_job(
+                row["job_id"], row["cron"], callback, row["timezone"], row["payload"],
+                next_run=row["next_run"], last_run=row["last_run"], persist=False
+            )
+        return len(restored)
+
+    def remove_job(self, job_id: str) -> bool:
+        # Heap entries for removed jobs are skipped lazily when they surface
+        removed = self.jobs.pop(job_id, None) is not None
+        if removed and self.store is not None:
+            self._store_write(self.store.delete_job, job_id)
+        return removed
+
+    async def store_call(self, method: Callable[..., Any], *args) -> Any:
+        """Run a store method on the store thread and wait for its result."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._store_executor, functools.partial(method, *args))
+
+    def _store_write(self, method: Callable[..., Any], *args):
+        # Callers without a running loop (startup) write directly
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            method(*args)
+            return
+        self._store_executor.submit(method, *args)
+
+    def _push(self, job: ScheduledJob):
+        heapq.heappush(self._heap, (job.next_run, next(self._sequence), job.job_id))
+        if self._heap[0][2] == job.job_id:
+            self._wakeup.set()
+
+    async def run(self):
+        if self._loop_task is not None and not self._loop_task.done():
+            raise RuntimeError("Schedule engine is already running")
+        self._loop_task = asyncio.current_task()
+        self._running = True
+        try:
+            await self._recover_runs()
+            while self._running:
+                self._wakeup.clear()
+                now = self.clock.now()
+                await self._fire_due(now)
+
+                delay = None
+                if self._heap:
+                    delay = max(0.0, (self._heap[0][0] - self.clock.now()).total_seconds())
+                await self._sleep(delay)
+        finally:
+            self._loop_task = None
+
+    async def stop(self):
+        """Stop the loop and wait for it to exit, so a following ``run`` never overlaps it."""
+        self._running = False
+        self._wakeup.set()
+        task = self._loop_task
+        if task is not None and task is not asyncio.current_task():
+            task.cancel()
+            await asyncio.wait({task})
+
+    async def _recover_runs(self):
+        """Refire runs whose owner died mid-run, within the catch-up window."""
+        if self.store is None:
+            return
+
+        now = self.clock.now()
+        for run in await self.store_call(self.store.expired_runs):
+            job = self.jobs.get(run["job_id"])
+            run_at = run["scheduled_for"]
+            if job is None or now - run_at > self.catch_up_window:
+                await self.store_call(self.store.finish_run, run["job_id"], run_at, "abandoned", "lease expired")
+                continue
+            if await self.store_call(self.store.claim_run, job.job_id, run_at, self.lease):
+                logger.warning(f"Recovering run of {job.job_id} due at {run_at.isoformat()}: previous attempt did not finish")
+                self._start_run(job, run_at)
+
+    async def _fire_due(self, now: datetime):
+        while self._heap and self._heap[0][0] <= now:
+            run_at, _, job_id = heapq.heappop(self._heap)
+            job = self.jobs.get(job_id)
+            if job is None or job.next_run != run_at:
+                continue
+
+            job.next_run = job.compute_next_run(now)
+            self._push(job)
+
+            if now - run_at > self.catch_up_window:
+                logger.warning(f"Skipping run of {job.job_id} due at {run_at.isoformat()}: outside catch-up window")
+                if self.store is not None:
+                    await self.store_call(self.store.record_missed, job_id, run_at)
+                    await self.store_call(self.store.update_run_times, job_id, job.next_run, job.last_run)
+                continue
+
+            if self.store is not None:
+                claimed = await self.store_call(self.store.claim_run, job_id, run_at, self.lease)
+                await self.store_call(self.store.update_run_times, job_id, job.next_run, run_at if claimed else job.last_run)
+                if not claimed:
+                    continue
+
+            job.last_run = run_at
+            self._start_run(job, run_at)
+
+    def _start_run(self, job: ScheduledJob, scheduled_for: datetime):
+        task = asyncio.create_task(self._run_job(job, scheduled_for))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_job(self, job: ScheduledJob, scheduled_for: datetime):
+        heartbeat = asyncio.create_task(self._renew_lease(job, scheduled_for)) if self.store is not None else None
+        try:
+            result = await job.callback(job)
+        except Exception as e:
+            logger.error(f"Scheduled job {job.job_id} ({scheduled_for.isoformat()}) failed: {e}")
+            status, result = "failed", str(e)
+        else:
+            status = "succeeded"
+        finally:
+            if heartbeat is not None:
+                heartbeat.cancel()
+
+        if self.store is not None:
+            await self.store_call(self.store.finish_run, job.job_id, scheduled_for, status, result)
+
+    async def _renew_lease(self, job: ScheduledJob, scheduled_for: datetime):
+        while True:
+            await asyncio.sleep(self.lease / 3)
+            await self.store_call(self.store.renew_lease, job.job_id, scheduled_for, self.lease)
+
+    async def _sleep(self, delay: Optional[float]):
+        waiters = {asyncio.create_task(self._wakeup.wait())}
+        if delay is not None:
+            waiters.add(asyncio.create_task(self.clock.sleep(delay)))
+        done, pending = await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
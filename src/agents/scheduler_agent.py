@@ -1,10 +1,44 @@
+import asyncio
+from typing import Dict, Any
+from datetime import datetime
 from .base_agent import BaseA2AAgent, AgentCard, AgentSkill, AgentCapabilities
-from .user_proxy_agent import UserProxyAgent
+from .schedule_engine import ScheduleEngine, ScheduledJob
+from .job_store import JobStore
+
+WEEKLY_ORDER_JOB = "weekly_wednesday_lunch"
+WEEKLY_ORDER_CRON = "0 12 * * 3"
 
 class SchedulerAgent(BaseA2AAgent):
-    def __init__(self):
+    def __init__(self, clock=None, timezone_name: str = "America/Chicago", job_store=None):
         super().__init__("SchedulerAgent", "Automated scheduling for regular orders", 9006)
         self.is_running = False
+        self.job_store = job_store or JobStore()
+        self.engine = ScheduleEngine(clock, self.job_store)
+
+        restored = self.engine.restore_jobs(self._trigger_weekly_order)
+        if restored:
+            self.logger.info(f"Restored {restored} persisted schedules")
+
+        weekly = self.engine.jobs.get(WEEKLY_ORDER_JOB)
+        if weekly is None:
+            self.engine.add_job(
+                WEEKLY_ORDER_JOB,
+                WEEKLY_ORDER_CRON,
+                self._trigger_weekly_order,
+                timezone_name,
+                {"content": "Order my usual Wednesday McDonald's Global Menu special"}
+            )
+        elif weekly.timezone != timezone_name:
+            # Re-add so the next run is computed (and persisted) in the new timezone
+            self.logger.info(f"Moving {WEEKLY_ORDER_JOB} from {weekly.timezone} to {timezone_name}")
+            self.engine.add_job(
+                WEEKLY_ORDER_JOB,
+                weekly.cron.expression,
+                self._trigger_weekly_order,
+                timezone_name,
+                weekly.payload,
+                last_run=weekly.last_run
+            )
 
     def _create_agent_card(self) -> AgentCard:
         skills = [
@@ -39,25 +73,24 @@ class SchedulerAgent(BaseA2AAgent):
         self.is_running = True
         self.logger.info("Starting Wednesday McDonald's scheduler...")
 
-        while self.is_running:
-            now = datetime.now()
-
-            if now.weekday() == 2 and now.hour == 12 and now.minute == 0:
-                self.logger.info("Wednesday lunch time! Triggering order...")
-                await self._trigger_weekly_order()
-
-            await asyncio.sleep(60)
+        try:
+            await self.engine.run()
+        finally:
+            self.is_running = False
 
-    async def _trigger_weekly_order(self):
-        user_proxy = UserProxyAgent()
+    async def _trigger_weekly_order(self, job: ScheduledJob):
+        self.logger.info(f"Schedule {job.job_id} is due! Triggering order...")
+        user_proxy = self.get_peer("user_proxy")
         order_message = {
-            "content": "Order my usual Wednesday McDonald's Global Menu special",
+            "content": job.payload.get("content", ""),
+            "user_id": job.payload.get("user_id"),
             "scheduled": True,
             "trigger_time": datetime.now().isoformat()
         }
 
         result = await user_proxy.process_message(order_message)
         self.logger.info(f"Scheduled order result: {result}")
+        return result
 
     async def process_message(self, message: Dict[str, Any]) -> Dict[str, Any]:
         command = message.get("command", "")
@@ -70,7 +103,33 @@ class SchedulerAgent(BaseA2AAgent):
                 return {"status": "already_running", "message": "Scheduler is already active"}
 
         elif command == "stop_scheduling":
+            await self.engine.stop()
             self.is_running = False
             return {"status": "scheduler_stopped", "message": "Scheduling deactivated"}
 
+        elif command == "add_schedule":
+            user_id = message.get("user_id", "default_user")
+            job_id = message.get("job_id") or f"user_{user_id}"
+            try:
+                job = self.engine.add_job(
+                    job_id,
+                    message.get("cron", WEEKLY_ORDER_CRON),
+                    self._trigger_weekly_order,
+                    message.get("timezone", "America/Chicago"),
+                    {"content": message.get("content", ""), "user_id": user_id}
+                )
+            except (ValueError, KeyError) as e:
+                return {"status": "invalid_schedule", "message": str(e)}
+            return {"status": "schedule_added", "job_id": job_id, "next_run": job.next_run.isoformat()}
+
+        elif command == "remove_schedule":
+            if self.engine.remove_job(message.get("job_id", "")):
+                return {"status": "schedule_removed", "job_id": message.get("job_id")}
+            return {"status": "unknown_schedule", "message": f"No schedule with id: {message.get('job_id')}"}
+
+        elif command == "schedule_history":
+            job_id = message.get("job_id", WEEKLY_ORDER_JOB)
+            runs = await self.engine.store_call(self.job_store.recent_runs, job_id, message.get("limit", 10))
+            return {"status": "success", "job_id": job_id, "runs": runs}
+
         return {"status": "unknown_command", "message": f"Unknown command: {command}"}
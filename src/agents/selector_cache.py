@@ -0,0 +1,177 @@
+import json
+import os
+import re
+import threading
+import time
+import logging
+from typing import Any, Dict, List, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+CONTAINS_PATTERN = re.compile(r"^(?P<css>(?:.*\s)?[\w*]+):contains\('(?P<text>.*)'\)$")
+
+# Probes every candidate in one round-trip and returns [index, element] for the
+# first visible, enabled match.
+RESOLVE_SCRIPT = """
+const locators = arguments[0];
+const visible = (e) => e.getClientRects().length > 0;
+for (let i = 0; i < locators.length; i++) {
+    const kind = locators[i][0], expression = locators[i][1];
+    let element = null;
+    try {
+        if (kind === 'xpath') {
+            element = document.evaluate(expression, document, null,
+                XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        } else if (kind === 'text') {
+            const text = locators[i][2];
+            element = Array.from(document.querySelectorAll(expression)).find(
+                (e) => visible(e) && e.textContent.replace(/\\s+/g, ' ').includes(text)) || null;
+        } else {
+            element = document.querySelector(expression);
+        }
+    } catch (e) {
+        continue;
+    }
+    if (element && visible(element) && !element.disabled) {
+        return [i, element];
+    }
+}
+return null;
+"""
+
+def xpath_literal(text: str) -> str:
+    if "'" not in text:
+        return f"'{text}'"
+    if '"' not in text:
+        return f'"{text}"'
+    parts = text.split("'")
+    return "concat(" + ", \"'\", ".join(f"'{part}'" for part in parts) + ")"
+
+def to_locator(selector: str) -> Tuple[str, ...]:
+    """Translate a selector into a ``(kind, expression, ...)`` locator.
+
+    The bot's selector lists use jQuery-style ``scope tag:contains('text')``,
+    which is not valid CSS, so those become a ``text`` locator: the CSS part
+    (ancestor scope included) plus the text the element must contain.
+    Selectors starting with ``/`` are treated as XPath already.
+    """
+    if selector.startswith("/"):
+        return ("xpath", selector)
+
+    match = CONTAINS_PATTERN.match(selector)
+    if match:
+        return ("text", match.group("css"), match.group("text").replace("\\'", "'"))
+
+    return ("css", selector)
+
+class SelectorCache:
+    """Persistent record of which selector resolved each logical element.
+
+    Candidates are reordered so the last winner is tried first, followed by
+    the others in order of past hits. Changes are written to disk at most
+    every ``save_interval`` seconds, and on ``flush``.
+    """
+
+    def __init__(self, path: str = os.path.join(".cache", "selector_cache.json"), save_interval: float = 5.0):
+        self.path = path
+        self.save_interval = save_interval
+        self.entries: Dict[str, Dict[str, Any]] = self._load()
+        self.stats: Dict[str, Dict[str, float]] = {}
+        # Bots running on executor threads share one cache; entries and stats are only touched under this lock
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._last_save = time.monotonic()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not persist selector cache: {e}")
+
+    def order(self, key: str, selectors: Sequence[str]) -> List[str]:
+        with self._lock:
+            entry = self.entries.get(key)
+            if not entry:
+                return list(selectors)
+            hits = dict(entry.get("hits", {}))
+            last = entry.get("last")
+
+        ordered = sorted(selectors, key=lambda s: -hits.get(s, 0))
+        if last in ordered:
+            ordered.remove(last)
+            ordered.insert(0, last)
+        return ordered
+
+    def record(self, key: str, selector: str):
+        with self._lock:
+            entry = self.entries.setdefault(key, {"last": None, "hits": {}})
+            entry["last"] = selector
+            entry["hits"][selector] = entry["hits"].get(selector, 0) + 1
+            self._dirty = True
+            if time.monotonic() - self._last_save >= self.save_interval:
+                self._flush_locked()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if self._dirty:
+            self._save()
+            self._dirty = False
+        self._last_save = time.monotonic()
+
+    def resolve(self, waiter, key: str, selectors: Sequence[str], timeout: float = 3.0):
+        """Return the first visible element matching any of ``selectors``.
+
+        All candidates are probed together on each poll, so a match on the
+        last selector costs the same as a match on the first.
+        """
+        ordered = self.order(key, selectors)
+        locators = [list(to_locator(s)) for s in ordered]
+        with self._lock:
+            cached = self.entries.get(key, {}).get("last")
+
+        started = time.monotonic()
+        result = waiter.poll(lambda d: d.execute_script(RESOLVE_SCRIPT, locators), timeout)
+        elapsed = time.monotonic() - started
+
+        if result:
+            index, element = result
+            selector = ordered[index]
+            outcome = "hits" if index == 0 and selector == cached else "misses"
+        else:
+            outcome = "not_found"
+
+        with self._lock:
+            stats = self.stats.setdefault(key, {"hits": 0, "misses": 0, "not_found": 0, "total_time": 0.0, "lookups": 0})
+            stats["lookups"] += 1
+            stats["total_time"] += elapsed
+            stats[outcome] += 1
+
+        if not result:
+            return None
+        self.record(key, selector)
+        return element
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                key: {
+                    **stats,
+                    "hit_rate": stats["hits"] / stats["lookups"] if stats["lookups"] > 0 else 0,
+                    "avg_latency": stats["total_time"] / stats["lookups"] if stats["lookups"] > 0 else 0
+                }
+                for key, stats in self.stats.items()
+            }
@@ -0,0 +1,148 @@
+import json
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+KEY_ENV = "SESSION_STORE_KEY"
+# Kept outside .cache so a copy of the data directory does not carry its own key
+DEFAULT_KEY_PATH = os.path.join(os.path.expanduser("~"), ".config", "mcdonalds-a2a", "state.key")
+
+# Cart contents are per order; a restored session must start with an empty cart
+CART_STATE = re.compile(r"cart|basket|checkout", re.IGNORECASE)
+
+def load_fernet(key: Optional[bytes] = None, key_path: str = DEFAULT_KEY_PATH):
+    """Fernet for encrypting browser state at rest.
+
+    The key comes from ``key``, else the ``SESSION_STORE_KEY`` environment
+    variable, else ``key_path``, which is created with owner-only
+    permissions on first use.
+    """
+    try:
+        from cryptography.fernet import Fernet
+    except ImportError as e:
+        raise ImportError("Encrypted browser state needs the 'cryptography' package") from e
+
+    key = key or os.environ.get(KEY_ENV, "").encode()
+    if key:
+        return Fernet(key)
+
+    try:
+        with open(key_path, "rb") as f:
+            return Fernet(f.read().strip())
+    except FileNotFoundError:
+        pass
+
+    os.makedirs(os.path.dirname(key_path), mode=0o700, exist_ok=True)
+    key = Fernet.generate_key()
+    try:
+        fd = os.open(key_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        # Another process created the key first
+        with open(key_path, "rb") as f:
+            return Fernet(f.read().strip())
+    with os.fdopen(fd, "wb") as f:
+        f.write(key)
+    return Fernet(key)
+
+@dataclass
+class SessionSnapshot:
+    user_id: str
+    address: str
+    cookies: List[Dict[str, Any]] = field(default_factory=list)
+    local_storage: Dict[str, str] = field(default_factory=dict)
+    created_at: float = field(default_factory=time.time)
+    expires_at: Optional[float] = None
+
+    def live_cookies(self) -> List[Dict[str, Any]]:
+        now = time.time()
+        return [cookie for cookie in self.cookies if cookie.get("expiry") is None or cookie["expiry"] > now]
+
+class SessionStore:
+    """Encrypted per-user browser state, reused to skip the setup steps of an order.
+
+    Each snapshot is a Fernet token on disk (see ``load_fernet`` for where
+    the key lives). Cookies and localStorage entries that hold the cart are
+    left out, so a restored session never starts with the previous order's
+    items. Snapshots expire after ``ttl`` seconds, and callers invalidate
+    them when a restored session turns out to be stale.
+    """
+
+    def __init__(self, directory: str = os.path.join(".cache", "sessions"), ttl: float = 7 * 24 * 3600.0,
+                 key: Optional[bytes] = None, key_path: str = DEFAULT_KEY_PATH):
+        self.directory = directory
+        self.ttl = ttl
+        self.fernet = load_fernet(key, key_path)
+        self.stats = {"saved": 0, "restored": 0, "misses": 0, "expired": 0, "stale": 0, "unreadable": 0}
+        self._lock = threading.Lock()
+
+    def _path(self, user_id: str) -> str:
+        return os.path.join(self.directory, re.sub(r"[^\w.-]", "_", user_id) + ".session")
+
+    def _count(self, stat: str):
+        with self._lock:
+            self.stats[stat] += 1
+
+    def save(self, snapshot: SessionSnapshot):
+        snapshot.expires_at = snapshot.created_at + self.ttl
+        snapshot.cookies = [cookie for cookie in snapshot.cookies if not CART_STATE.search(cookie.get("name", ""))]
+        snapshot.local_storage = {key: value for key, value in snapshot.local_storage.items() if not CART_STATE.search(key)}
+        token = self.fernet.encrypt(json.dumps(asdict(snapshot)).encode())
+        path = self._path(snapshot.user_id)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(token)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not save session for {snapshot.user_id}: {e}")
+            return
+        self._count("saved")
+
+    def load(self, user_id: str) -> Optional[SessionSnapshot]:
+        try:
+            with open(self._path(user_id), "rb") as f:
+                token = f.read()
+        except OSError:
+            self._count("misses")
+            return None
+
+        from cryptography.fernet import InvalidToken
+        try:
+            snapshot = SessionSnapshot(**json.loads(self.fernet.decrypt(token)))
+        except (InvalidToken, ValueError, TypeError):
+            # Written under another key or corrupted; it can never be read again
+            logger.warning(f"Discarding unreadable session for {user_id}")
+            self._discard(user_id, "unreadable")
+            return None
+
+        if snapshot.expires_at is not None and time.time() > snapshot.expires_at:
+            self._discard(user_id, "expired")
+            return None
+        return snapshot
+
+    def mark_restored(self):
+        self._count("restored")
+
+    def invalidate(self, user_id: str):
+        """Drop a snapshot whose restored session no longer held its state."""
+        self._discard(user_id, "stale")
+
+    def _discard(self, user_id: str, reason: str):
+        try:
+            os.remove(self._path(user_id))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not delete session for {user_id}: {e}")
+        self._count(reason)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.stats)
@@ -0,0 +1,71 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict
+
+class StageLimiter:
+    """Per-stage concurrency limits for the order pipeline.
+
+    Each stage has its own semaphore, so a slow stage (browser sessions)
+    queues its own callers without holding back faster ones (LLM parsing).
+    Queue depth, throughput and wait/busy time are tracked per stage.
+    """
+
+    def __init__(self, limits: Dict[str, int]):
+        self.started_at = time.monotonic()
+        self._semaphores = {name: asyncio.Semaphore(limit) for name, limit in limits.items()}
+        self.stats = {
+            name: {
+                "limit": limit,
+                "waiting": 0,
+                "max_waiting": 0,
+                "active": 0,
+                "completed": 0,
+                "failed": 0,
+                "wait_time": 0.0,
+                "busy_time": 0.0
+            }
+            for name, limit in limits.items()
+        }
+
+    @asynccontextmanager
+    async def stage(self, name: str):
+        semaphore = self._semaphores[name]
+        stats = self.stats[name]
+
+        stats["waiting"] += 1
+        stats["max_waiting"] = max(stats["max_waiting"], stats["waiting"])
+        queued = time.monotonic()
+        try:
+            await semaphore.acquire()
+        finally:
+            stats["waiting"] -= 1
+
+        started = time.monotonic()
+        stats["wait_time"] += started - queued
+        stats["active"] += 1
+        try:
+            yield
+        except BaseException:
+            stats["failed"] += 1
+            raise
+        else:
+            stats["completed"] += 1
+        finally:
+            stats["active"] -= 1
+            stats["busy_time"] += time.monotonic() - started
+            semaphore.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        elapsed = max(time.monotonic() - self.started_at, 1e-9)
+        report = {}
+        for name, stats in self.stats.items():
+            finished = stats["completed"] + stats["failed"]
+            report[name] = {
+                **stats,
+                "queue_depth": stats["waiting"],
+                "throughput_per_s": stats["completed"] / elapsed,
+                "avg_wait_time": stats["wait_time"] / finished if finished > 0 else 0,
+                "avg_busy_time": stats["busy_time"] / finished if finished > 0 else 0
+            }
+        return report
@@ -0,0 +1,94 @@
+import asyncio
+import contextvars
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
+
+# Event types emitted while an order is in progress
+ACCEPTED = "accepted"
+INTENT_PARSED = "intent_parsed"
+SESSION_READY = "session_ready"
+CART_ITEM_ADDED = "cart_item_added"
+CART_READY = "cart_ready"
+CHECKOUT_STEP = "checkout_step"
+RESULT = "result"
+ERROR = "error"
+
+# The stream's queue together with the loop that owns it, so worker threads can publish too
+_event_queue: contextvars.ContextVar[Optional[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = contextvars.ContextVar("event_queue", default=None)
+
+@dataclass
+class AgentEvent:
+    type: str
+    agent: str
+    data: Dict[str, Any] = field(default_factory=dict)
+    timestamp: float = field(default_factory=time.time)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"type": self.type, "agent": self.agent, "data": self.data, "timestamp": self.timestamp}
+
+def streaming_active() -> bool:
+    return _event_queue.get() is not None
+
+def emit(event_type: str, agent: str, **data: Any):
+    """Publish a progress event to the stream the current call belongs to, if any.
+
+    Safe to call from threads that run in a copy of the call's context,
+    such as order bots on the executor pool.
+    """
+    _publish(AgentEvent(event_type, agent, data))
+
+def forward(event: Dict[str, Any]):
+    """Re-publish an event received from a remote stream."""
+    _publish(AgentEvent(event["type"], event.get("agent", ""), event.get("data", {}), event.get("timestamp", time.time())))
+
+def _publish(event: AgentEvent):
+    target = _event_queue.get()
+    if target is None:
+        return
+    loop, queue = target
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        queue.put_nowait(event)
+    else:
+        loop.call_soon_threadsafe(queue.put_nowait, event)
+
+async def stream_call(agent: str, call: Callable[[], Awaitable[Dict[str, Any]]]) -> AsyncIterator[AgentEvent]:
+    """Run ``call`` and yield the events it emits, ending with its result.
+
+    The call runs in a task whose context carries a fresh event queue, so
+    every agent it reaches in-process (including tasks it spawns) emits into
+    this stream. Closing the generator early cancels the call.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    context = contextvars.copy_context()
+    context.run(_event_queue.set, (asyncio.get_running_loop(), queue))
+    # A task copies the context it is created in; create_task(context=...) would need Python 3.11
+    task = context.run(asyncio.create_task, call())
+    getter: Optional[asyncio.Task] = None
+
+    yield AgentEvent(ACCEPTED, agent)
+    try:
+        while True:
+            getter = asyncio.create_task(queue.get())
+            done, _ = await asyncio.wait({getter, task}, return_when=asyncio.FIRST_COMPLETED)
+            if getter in done:
+                yield getter.result()
+                continue
+
+            while not queue.empty():
+                yield queue.get_nowait()
+            try:
+                yield AgentEvent(RESULT, agent, task.result())
+            except Exception as e:
+                yield AgentEvent(ERROR, agent, {"message": str(e)})
+            return
+    finally:
+        # Reached on normal completion, on error and when the consumer stops early
+        if getter is not None and not getter.done():
+            getter.cancel()
+        if not task.done():
+            task.cancel()
@@ -0,0 +1,255 @@
+import atexit
+import contextvars
+import functools
+import json
+import logging
+import os
+import queue
+import secrets
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("current_span", default=None)
+# Objects with an ``on_span(span)`` method, told about every finished process_message span
+_span_listeners: "weakref.WeakSet[Any]" = weakref.WeakSet()
+
+class SpanContext:
+    __slots__ = ("trace_id", "span_id")
+
+    def __init__(self, trace_id: str, span_id: str):
+        self.trace_id = trace_id
+        self.span_id = span_id
+
+class Span:
+    __slots__ = ("name", "service", "kind", "trace_id", "span_id", "parent_span_id",
+                 "start_ns", "end_ns", "attributes", "status", "status_message", "local_root")
+
+    def __init__(self, name: str, service: str, kind: str, parent: Optional[SpanContext],
+                 attributes: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.service = service
+        self.kind = kind
+        self.trace_id = parent.trace_id if parent else secrets.token_hex(16)
+        self.span_id = secrets.token_hex(8)
+        self.parent_span_id = parent.span_id if parent else None
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.status = "UNSET"
+        self.status_message = ""
+        # True when no span in this process encloses this one
+        self.local_root = True
+
+    @property
+    def context(self) -> SpanContext:
+        return SpanContext(self.trace_id, self.span_id)
+
+    @property
+    def duration(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e9
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def set_error(self, message: str):
+        self.status = "ERROR"
+        self.status_message = message
+
+    def to_otlp(self) -> Dict[str, Any]:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": f"SPAN_KIND_{self.kind.upper()}",
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in self.attributes.items()],
+            "status": {"code": f"STATUS_CODE_{self.status}"}
+        }
+        if self.parent_span_id:
+            span["parentSpanId"] = self.parent_span_id
+        if self.status_message:
+            span["status"]["message"] = self.status_message
+        return span
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+class JsonlSpanExporter:
+    """Appends finished spans to a file in the OTLP/JSON file-exporter layout.
+
+    Each line is one ``ExportTraceServiceRequest`` with spans grouped by
+    service, so the file can be fed to an OpenTelemetry collector's
+    ``otlpjsonfile`` receiver. Spans are buffered and handed to a
+    background writer thread when the buffer fills or a local root span (a
+    whole trace in this process) finishes, so ending a span never waits on
+    disk.
+    """
+
+    def __init__(self, path: str = os.path.join(".cache", "traces", "spans.jsonl"), batch_size: int = 64):
+        self.path = path
+        self.batch_size = batch_size
+        self._buffer: List[Span] = []
+        self._lock = threading.Lock()
+        self._pending: "queue.Queue[List[Span]]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+
+    def export(self, span: Span):
+        with self._lock:
+            self._buffer.append(span)
+            if len(self._buffer) < self.batch_size and not span.local_root:
+                return
+            batch, self._buffer = self._buffer, []
+            self._ensure_writer()
+        self._pending.put(batch)
+
+    def flush(self):
+        """Write out every buffered span and wait until the writer is idle."""
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+            if batch:
+                self._ensure_writer()
+        if batch:
+            self._pending.put(batch)
+        if self._writer is not None:
+            self._pending.join()
+
+    def _ensure_writer(self):
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+            self._writer.start()
+            atexit.register(self.flush)
+
+    def _run(self):
+        while True:
+            batch = self._pending.get()
+            try:
+                self._write(batch)
+            finally:
+                self._pending.task_done()
+
+    def _write(self, batch: List[Span]):
+        by_service: Dict[str, List[Dict[str, Any]]] = {}
+        for span in batch:
+            by_service.setdefault(span.service, []).append(span.to_otlp())
+
+        request = {
+            "resourceSpans": [
+                {
+                    "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": service}}]},
+                    "scopeSpans": [{"scope": {"name": "mcdonalds-a2a"}, "spans": spans}]
+                }
+                for service, spans in by_service.items()
+            ]
+        }
+
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a") as f:
+                f.write(json.dumps(request) + "\n")
+        except OSError as e:
+            logger.warning(f"Could not export {len(batch)} spans: {e}")
+
+class Tracer:
+    def __init__(self, exporter=None):
+        self.exporter = exporter or JsonlSpanExporter()
+
+    @contextmanager
+    def start_span(self, name: str, attributes: Optional[Dict[str, Any]] = None, kind: str = "internal",
+                   service: Optional[str] = None, parent: Optional[SpanContext] = None):
+        """Open a span as a child of the current one (or of ``parent`` when given)."""
+        current = _current_span.get()
+        if parent is None and current is not None:
+            parent = current.context
+        span = Span(name, service or (current.service if current else "mcdonalds-a2a"), kind, parent, attributes)
+        span.local_root = current is None
+
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.set_error(f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            span.end_ns = time.time_ns()
+            _current_span.reset(token)
+            self.exporter.export(span)
+
+_tracer = Tracer()
+
+def get_tracer() -> Tracer:
+    return _tracer
+
+def configure_tracing(exporter) -> Tracer:
+    global _tracer
+    _tracer = Tracer(exporter)
+    return _tracer
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+def inject(message: Dict[str, Any]) -> Dict[str, Any]:
+    """Return ``message`` with a W3C ``traceparent`` for the current span, for sending across processes."""
+    span = _current_span.get()
+    if span is None:
+        return message
+    return {**message, "traceparent": f"00-{span.trace_id}-{span.span_id}-01"}
+
+def extract(message: Dict[str, Any]) -> Optional[SpanContext]:
+    parts = str(message.get("traceparent", "")).split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    return SpanContext(parts[1], parts[2])
+
+def add_span_listener(listener):
+    """Have ``listener.on_span(span)`` called after every traced process_message, whether it succeeded or not."""
+    _span_listeners.add(listener)
+
+def _notify(span: Span):
+    for listener in list(_span_listeners):
+        try:
+            listener.on_span(span)
+        except Exception as e:
+            logger.warning(f"Span listener {listener!r} failed: {e}")
+
+def traced_process_message(method):
+    """Wrap an agent's ``process_message`` in a server span named after the agent.
+
+    Span listeners see every finished span, so per-agent latency is recorded
+    in one place instead of by each agent.
+    """
+
+    @functools.wraps(method)
+    async def wrapper(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        message_type = message.get("type") or message.get("command")
+        attributes = {"agent.name": self.name}
+        if message_type:
+            attributes["message.type"] = message_type
+
+        parent = extract(message) if _current_span.get() is None else None
+        span = None
+        try:
+            with get_tracer().start_span(f"{self.name}.process_message", attributes, "server", self.name, parent) as span:
+                result = await method(self, message)
+                status = result.get("status") if isinstance(result, dict) else None
+                if status:
+                    span.set_attribute("result.status", status)
+                    if "error" in status or "failed" in status:
+                        span.set_error(result.get("message") or result.get("error") or status)
+                return result
+        finally:
+            if span is not None:
+                _notify(span)
+
+    return wrapper
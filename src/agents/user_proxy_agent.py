@@ -1,5 +1,6 @@
+from typing import Dict, Any
+from datetime import datetime
 from .base_agent import BaseA2AAgent, AgentCard, AgentSkill, AgentCapabilities
-from .order_agent import OrderAgent
 
 class UserProxyAgent(BaseA2AAgent):
     def __init__(self):
@@ -38,5 +39,5 @@ class UserProxyAgent(BaseA2AAgent):
         return await self._send_to_order_agent(order_request)
 
     async def _send_to_order_agent(self, request: Dict[str, Any]) -> Dict[str, Any]:
-        order_agent = OrderAgent()
+        order_agent = self.get_peer("order_agent")
         return await order_agent.process_message(request)
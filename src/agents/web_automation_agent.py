@@ -1,12 +1,130 @@
+import asyncio
+import json
+import os
+import time
+import uuid
+from typing import Dict, Any, Optional
 from .base_agent import BaseA2AAgent, AgentCard, AgentSkill, AgentCapabilities
+from .mcp_session_pool import MCPSessionPool
+from .bot_executor import OrderBotExecutor
+from .plan_cache import PlanCache, layout_key, mentions, record_tool_call, record_tool_calls
+from .tracing import current_span, get_tracer
+from .streaming import emit, CART_ITEM_ADDED
 from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset, StdioServerParameters
 from google.genai import types
 from google.adk.agents.llm_agent import LlmAgent
+from google.adk.agents.invocation_context import InvocationContext, new_invocation_context_id
+from google.adk.sessions import InMemorySessionService
+from google.adk.tools.tool_context import ToolContext
+
+TASK_COMPLETE = "TASK_COMPLETE"
+TASK_FAILED = "TASK_FAILED"
+
+def llm_reported_success(result: Any) -> Optional[bool]:
+    """Read the outcome marker the browser agent is asked to end with; None if it gave none."""
+    text = str(result)
+    if TASK_FAILED in text:
+        return False
+    if TASK_COMPLETE in text:
+        return True
+    return None
+
+async def open_selenium_toolset(command: str = "selenium-mcp-server", args=("--headless", "--ubereats-mode")):
+    mcp_params = StdioServerParameters(
+        command=command,
+        args=list(args)
+    )
+
+    toolset = MCPToolset("selenium_automation", mcp_params)
+    tools, _ = await toolset.get_tools_async()
+    return toolset, tools
+
+_selenium_pool: Optional[MCPSessionPool] = None
+
+def configure_selenium_pool(size: int = 2, idle_timeout: float = 300.0, factory=None) -> MCPSessionPool:
+    global _selenium_pool
+    _selenium_pool = MCPSessionPool(factory or open_selenium_toolset, size=size, idle_timeout=idle_timeout)
+    return _selenium_pool
+
+def get_selenium_pool() -> MCPSessionPool:
+    if _selenium_pool is None:
+        return configure_selenium_pool()
+    return _selenium_pool
+
+_bot_executor: Optional[OrderBotExecutor] = None
+_checkpoint_store: Optional["CheckpointStore"] = None
+_session_store: Optional["SessionStore"] = None
+
+def configure_bot_executor(workers: int = 2, timeout: float = 300.0, chrome_driver_path: Optional[str] = None,
+                           profile: Optional["BrowserProfile"] = None, retries: int = 1) -> OrderBotExecutor:
+    """Set up the thread pool that runs McDonaldsOrderBot sessions; one Chrome per worker."""
+    global _bot_executor, _checkpoint_store, _session_store
+    driver_path = chrome_driver_path or os.environ.get("CHROMEDRIVER_PATH", "chromedriver")
+    selector_cache = SelectorCache()
+    checkpoints = _checkpoint_store = CheckpointStore()
+    sessions = _session_store = SessionStore()
+    profile = profile or BrowserProfile()
+    _bot_executor = OrderBotExecutor(
+        lambda: McDonaldsOrderBot(driver_path, selector_cache=selector_cache, profile=profile,
+                                  checkpoints=checkpoints, sessions=sessions),
+        workers=workers,
+        timeout=timeout,
+        retries=retries,
+        checkpoints=checkpoints
+    )
+    return _bot_executor
+
+def get_bot_executor() -> OrderBotExecutor:
+    if _bot_executor is None:
+        return configure_bot_executor()
+    return _bot_executor
+
+class CartProgress:
+    """Emits CART_ITEM_ADDED for each requested item as the browser agent works through it.
+
+    An item counts as added once the tool calls that target it are
+    finished, i.e. when a successful call moves on to another item or to
+    the rest of the task. ``finish`` announces whatever is left once the
+    task has succeeded.
+    """
+
+    def __init__(self, agent: str, items):
+        self.agent = agent
+        self.items = list(items)
+        self.announced = set()
+        self.current = None
+
+    def __call__(self, call: Dict[str, Any]):
+        if not call.get("ok", True):
+            return
+        item = next((item for item in self.items if item not in self.announced and mentions(call["args"], item)), None)
+        if item != self.current:
+            self._announce_current()
+            self.current = item
+
+    def finish(self):
+        self._announce_current()
+        for item in self.items:
+            if item not in self.announced:
+                self.announced.add(item)
+                emit(CART_ITEM_ADDED, self.agent, item=item)
+
+    def _announce_current(self):
+        if self.current is not None:
+            self.announced.add(self.current)
+            emit(CART_ITEM_ADDED, self.agent, item=self.current)
+            self.current = None
 
 class WebAutomationAgent(BaseA2AAgent):
-    def __init__(self):
+    def __init__(self, selenium_pool: Optional[MCPSessionPool] = None, bot_executor: Optional[OrderBotExecutor] = None,
+                 plan_cache: Optional[PlanCache] = None, prepared_ttl: float = 300.0):
         super().__init__("WebAutomationAgent", "Browser automation for UberEats ordering", 9003)
-        self.selenium_tools = None
+        self.selenium_pool = selenium_pool or get_selenium_pool()
+        self.plan_cache = plan_cache or PlanCache()
+        self._bot_executor = bot_executor
+        self.prepared_sessions: Dict[str, Any] = {}
+        # Prepared sessions nobody claimed (e.g. the caller was cancelled) go back to the pool after this
+        self.prepared_ttl = prepared_ttl
 
     def _create_agent_card(self) -> AgentCard:
         skills = [
@@ -37,64 +155,218 @@ class WebAutomationAgent(BaseA2AAgent):
             skills=skills
         )
 
-    async def get_selenium_tools(self):
-        if not self.selenium_tools:
-            mcp_params = StdioServerParameters(
-                command="selenium-mcp-server",
-                args=["--headless", "--ubereats-mode"]
-            )
-
-            toolset = MCPToolset("selenium_automation", mcp_params)
-            self.selenium_tools, _ = await toolset.get_tools_async()
-
-        return self.selenium_tools
+    def _build_web_agent(self, tools) -> LlmAgent:
+        return LlmAgent(
+            model='gemini-2.0-flash',
+            name='ubereats_automation',
+            instruction=(
+                "You are a UberEats web automation specialist. Navigate to UberEats.com, "
+                "search for McDonald's, add specified items to cart, and prepare for checkout. "
+                "Use browser tools methodically: navigate -> search -> select items -> add to cart. "
+                "Always confirm each step before proceeding to the next."
+            ),
+            tools=tools,
+            after_tool_callback=record_tool_call
+        )
 
     async def process_message(self, message: Dict[str, Any]) -> Dict[str, Any]:
         self.logger.info(f"Starting web automation: {message}")
 
-        try:
-            tools = await self.get_selenium_tools()
-
-            web_agent = LlmAgent(
-                model='gemini-2.0-flash',
-                name='ubereats_automation',
-                instruction=(
-                    "You are a UberEats web automation specialist. Navigate to UberEats.com, "
-                    "search for McDonald's, add specified items to cart, and prepare for checkout. "
-                    "Use browser tools methodically: navigate -> search -> select items -> add to cart. "
-                    "Always confirm each step before proceeding to the next."
-                ),
-                tools=tools
-            )
+        message_type = message.get("type")
+        if message_type == "prepare_session":
+            return await self._prepare_session(message.get("restaurant", "mcdonalds"))
+        if message_type == "release_session":
+            await self._release_prepared(message.get("session_id"))
+            return {"status": "session_released"}
+        if message_type == "run_order_bot":
+            return await self.bot_executor.run(message.get("timeout"), message.get("user_id", "default"),
+                                               message.get("order_details"))
+        if message_type == "submit_order_bot":
+            job_id = await self.bot_executor.submit(message.get("timeout"), message.get("user_id", "default"),
+                                                    message.get("order_details"))
+            return {"status": "bot_queued", "job_id": job_id}
+        if message_type == "order_bot_result":
+            if message.get("job_id") not in self.bot_executor.jobs:
+                return {"status": "unknown_job", "job_id": message.get("job_id")}
+            return await self.bot_executor.result(message["job_id"])
+        if message_type == "cancel_order_bot":
+            cancelled = self.bot_executor.cancel(message.get("job_id", ""))
+            return {"status": "bot_cancelled" if cancelled else "unknown_job", "job_id": message.get("job_id")}
 
+        session = None
+        failed = False
+        try:
+            prepared = self.prepared_sessions.pop(message.get("session_id"), None)
             order_details = message.get("order_details", [])
-            automation_prompt = f"""
-            Please automate the following UberEats order:
-            1. Navigate to UberEats.com
-            2. Search for McDonald's restaurants in Chicago
-            3. Select the McDonald's Global Menu Restaurant
-            4. Add these items to cart: {', '.join(order_details)}
-            5. Proceed to cart review (but don't complete checkout yet)
+            restaurant = message.get("restaurant", "mcdonalds")
 
-            Return the cart ID and status when ready for checkout.
-            """
+            if prepared is not None:
+                # Navigation already happened while the order was being parsed
+                session, web_agent, _ = prepared
+                task = "add_items"
+                automation_prompt = f"""
+                The McDonald's Global Menu Restaurant page in Chicago is already open.
+                1. Add these items to cart: {', '.join(order_details)}
+                2. Proceed to cart review (but don't complete checkout yet)
 
-            result = await web_agent.process_message(automation_prompt)
+                Return the cart ID and status when ready for checkout.
+                """
+            else:
+                session = await self._checkout_session()
+                web_agent = self._build_web_agent(session.tools)
+                task = "order"
+                automation_prompt = f"""
+                Please automate the following UberEats order:
+                1. Navigate to UberEats.com
+                2. Search for McDonald's restaurants in Chicago
+                3. Select the McDonald's Global Menu Restaurant
+                4. Add these items to cart: {', '.join(order_details)}
+                5. Proceed to cart review (but don't complete checkout yet)
+
+                Return the cart ID and status when ready for checkout.
+                """
+
+            with get_tracer().start_span("llm.browser_automation", {"browser.prepared": prepared is not None}, "client"):
+                result = await self._run_browser_task(session, web_agent, task, restaurant, automation_prompt, order_details)
 
             return {
                 "status": "ready_for_checkout",
-                "cart_id": "cart_" + datetime.now().strftime("%Y%m%d_%H%M%S"),
+                # Checkout derives its idempotency key from this, so it must be unique per order
+                "cart_id": f"cart_{uuid.uuid4().hex}",
                 "items_added": order_details,
                 "automation_log": result
             }
 
         except Exception as e:
+            failed = True
             self.logger.error(f"Web automation failed: {str(e)}")
             return {
                 "status": "automation_failed",
                 "error": str(e)
             }
 
+        finally:
+            if session is not None:
+                # A browser abandoned mid-order may sit on any page; start the next order from a fresh one
+                await self.selenium_pool.release(session, failed=failed)
+
+    @property
+    def bot_executor(self) -> OrderBotExecutor:
+        # Created on first use so agents that never run the bot start no threads
+        if self._bot_executor is None:
+            self._bot_executor = get_bot_executor()
+        return self._bot_executor
+
+    def get_bot_stats(self) -> Optional[Dict[str, Any]]:
+        if self._bot_executor is None:
+            return None
+        stats = self._bot_executor.get_stats()
+        if _checkpoint_store is not None:
+            stats["checkpoints"] = _checkpoint_store.get_stats()
+        if _session_store is not None:
+            stats["sessions"] = _session_store.get_stats()
+        return stats
+
+    async def _prepare_session(self, restaurant: str = "mcdonalds") -> Dict[str, Any]:
+        """Lease a browser session and open the restaurant page before the items are known."""
+        await self._expire_prepared()
+        session = await self._checkout_session()
+        try:
+            web_agent = self._build_web_agent(session.tools)
+            with get_tracer().start_span("llm.browser_navigation", kind="client"):
+                navigation_log = await self._run_browser_task(session, web_agent, "navigate", restaurant, """
+            Please prepare the following UberEats order:
+            1. Navigate to UberEats.com
+            2. Search for McDonald's restaurants in Chicago
+            3. Select the McDonald's Global Menu Restaurant
+
+            Stop on the restaurant menu page and report when it is loaded.
+            """, [])
+        except Exception as e:
+            await self.selenium_pool.release(session, failed=True)
+            self.logger.error(f"Session preparation failed: {str(e)}")
+            return {"status": "prepare_failed", "error": str(e)}
+        except BaseException:
+            await asyncio.shield(self.selenium_pool.release(session, failed=True))
+            raise
+
+        session_id = f"session_{uuid.uuid4().hex[:12]}"
+        self.prepared_sessions[session_id] = (session, web_agent, time.monotonic())
+        return {"status": "session_ready", "session_id": session_id, "navigation_log": navigation_log}
+
+    async def _run_browser_task(self, session, web_agent, task: str, restaurant: str, prompt: str, items) -> Any:
+        """Replay the recorded plan for ``task`` when there is one, and ask the LLM only for what it could not do."""
+        layout = layout_key(session.tools)
+        plan = self.plan_cache.get(restaurant, task, layout)
+        span = current_span()
+        if span is not None:
+            span.set_attribute("plan.cached", plan is not None)
+
+        progress = CartProgress(self.name, items)
+        with record_tool_calls(progress) as calls:
+            if plan is not None:
+                context_factory = await self._replay_tool_contexts(web_agent)
+                failed = await self.plan_cache.replay(plan, session.tools, items, calls, context_factory)
+                if failed is None:
+                    progress.finish()
+                    return {"status": "replayed", "steps": len(calls)}
+                prompt += f"""
+            These steps are already done in the open browser: {', '.join(call['tool'] for call in calls) or 'none'}.
+            The next step, {failed['tool']} with {json.dumps(failed['args'])}, was attempted and failed: {failed['error']}.
+            Check the page and continue the task from there.
+            """
+            prompt += f"""
+            End your reply with {TASK_COMPLETE} if every step succeeded, or {TASK_FAILED}: <reason> if any did not.
+            """
+
+            try:
+                result = await web_agent.process_message(prompt)
+                succeeded = llm_reported_success(result)
+                if succeeded is False:
+                    raise RuntimeError(f"Browser agent reported failure: {str(result)[-200:]}")
+            except Exception:
+                # A plan that led the LLM into a failure is not worth replaying again
+                if plan is not None:
+                    self.plan_cache.invalidate(restaurant, task, layout)
+                raise
+
+        progress.finish()
+        if succeeded:
+            self.plan_cache.put(restaurant, task, layout, calls, items)
+        else:
+            self.logger.warning(f"Browser agent did not confirm {task}; its tool calls are not recorded as a plan")
+        return result
+
+    async def _replay_tool_contexts(self, web_agent):
+        """Factory of tool contexts for replayed calls, backed by a throwaway session like an LLM run's."""
+        session_service = InMemorySessionService()
+        session = await session_service.create_session(app_name="web_automation_replay", user_id=self.name)
+        invocation = InvocationContext(
+            session_service=session_service,
+            invocation_id=new_invocation_context_id(),
+            agent=web_agent,
+            session=session
+        )
+        return lambda: ToolContext(invocation)
+
+    async def _checkout_session(self):
+        with get_tracer().start_span("browser.session_checkout") as span:
+            session = await self.selenium_pool.checkout()
+            span.set_attribute("browser.session_uses", session.uses)
+            return session
+
+    async def _release_prepared(self, session_id: Optional[str]):
+        prepared = self.prepared_sessions.pop(session_id, None)
+        if prepared is not None:
+            await self.selenium_pool.release(prepared[0])
+
+    async def _expire_prepared(self):
+        now = time.monotonic()
+        expired = [session_id for session_id, (_, _, created) in self.prepared_sessions.items() if now - created > self.prepared_ttl]
+        for session_id in expired:
+            self.logger.warning(f"Releasing unclaimed prepared session {session_id}")
+            await self._release_prepared(session_id)
+
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
@@ -102,19 +374,100 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.keys import Keys
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, ElementClickInterceptedException
-import time
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, ElementClickInterceptedException, WebDriverException
 import logging
+import threading
+from contextlib import contextmanager
+from .page_waits import PageWaiter, StepTimer
+from .browser_profile import BrowserProfile, PageMetrics
+from .selector_cache import SelectorCache
+from .menu_snapshot import MenuSnapshot
+from .menu_catalog import MenuCatalog, menu_catalog_cache
+from .order_checkpoint import ORDER_STEPS, CheckpointStore, OrderCheckpoint
+from .session_store import SessionSnapshot, SessionStore
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+DELIVERY_ADDRESS = "110 N Carpenter Street, Chicago, IL"
+
+# Common Global Favorites items (may vary by location), ordered when no items are requested
+GLOBAL_FAVORITES_ITEMS = [
+    "Samurai Pork Burger",
+    "McRice Burger",
+    "Stroopwafel McFlurry",
+    "Banana Pie",
+    "Sweet Potato Fries",
+    "Taro Pie"
+]
+
+# Steps a restored session makes unnecessary
+SESSION_STEPS = ["navigate_to_ubereats", "set_delivery_address"]
+
+UBER_EATS_URL = "https://www.ubereats.com"
+READ_STORAGE_SCRIPT = "return Object.assign({}, window.localStorage);"
+CLEAR_STORAGE_SCRIPT = "window.localStorage.clear(); window.sessionStorage.clear();"
+# True if the delivery-location control (not just any text on the page) shows the street
+ADDRESS_SHOWN_SCRIPT = """
+const street = arguments[0].toLowerCase();
+const controls = document.querySelectorAll(
+    "[data-testid*='address'], [data-testid*='location'], [aria-label*='ddress'], [aria-label*='eliver'], header button");
+for (const control of controls) {
+    const text = (control.value || control.innerText || control.getAttribute('aria-label') || '').toLowerCase();
+    if (text.includes(street)) return true;
+}
+return false;
+"""
+WRITE_STORAGE_SCRIPT = "for (const [key, value] of Object.entries(arguments[0])) window.localStorage.setItem(key, value);"
+
+class BotCancelled(Exception):
+    pass
+
 class McDonaldsOrderBot:
-    def __init__(self, chrome_driver_path):
+    def __init__(self, chrome_driver_path, selector_cache=None, catalog_cache=None, profile=None, pause_for_review=False,
+                 checkpoints=None, sessions=None):
         self.chrome_driver_path = chrome_driver_path
+        # Without a profile Chrome runs as a normal visible browser
+        self.profile = profile
+        self.pause_for_review = pause_for_review
+        self.page_metrics = PageMetrics()
         self.driver = None
         self.wait = None
+        self.waiter = None
+        self.timer = StepTimer()
+        self.selectors = selector_cache or SelectorCache()
+        self.catalogs = catalog_cache or menu_catalog_cache
+        self.checkpoints = checkpoints or CheckpointStore()
+        # Without a session store every run starts from a fresh browser
+        self.sessions = sessions
+        self.user_id = "default"
+        self.requested_items = None
+        self.cart_items = []
+        self.checkpoint = None
+        self.resumed = None
+        self.cancelled = threading.Event()
+
+    def cancel(self):
+        """Stop the run from another thread: the next step raises and pending WebDriver calls fail fast."""
+        self.cancelled.set()
+        driver, self.driver = self.driver, None
+        if driver:
+            try:
+                driver.quit()
+            except Exception as e:
+                logger.debug(f"Driver quit during cancel failed: {e}")
+
+    @contextmanager
+    def step(self, name):
+        if self.cancelled.is_set():
+            raise BotCancelled(f"Cancelled before step {name}")
+        with self.timer.step(name) as entry:
+            try:
+                yield entry
+            finally:
+                if self.driver:
+                    entry.update(self.page_metrics.sample(self.driver))
         
     def setup_driver(self):
         """Initialize the Chrome WebDriver with options"""
@@ -125,6 +478,8 @@ class McDonaldsOrderBot:
         options.add_argument("--disable-geolocation")
         options.add_argument("--disable-notifications")
         options.add_argument("--disable-popup-blocking")
+        if self.profile:
+            self.profile.apply_to_options(options, self.user_id)
         options.add_experimental_option("excludeSwitches", ["enable-automation"])
         options.add_experimental_option('useAutomationExtension', False)
         
@@ -138,25 +493,36 @@ class McDonaldsOrderBot:
         
         service = Service(self.chrome_driver_path)
         self.driver = webdriver.Chrome(service=service, options=options)
+        if self.profile:
+            self.profile.apply_to_driver(self.driver)
         self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
         self.wait = WebDriverWait(self.driver, 20)
+        if self.profile:
+            self.waiter = PageWaiter(self.driver, ready_states=self.profile.ready_states(), settle_scale=self.profile.settle_scale)
+        else:
+            self.waiter = PageWaiter(self.driver)
+
+    def find_clickable(self, key, selectors, timeout=20):
+        """Resolve a logical element through the selector cache"""
+        return self.selectors.resolve(self.waiter, key, selectors, timeout)
         
     def navigate_to_ubereats(self):
         """Navigate to Uber Eats and handle location popup"""
         logger.info("Navigating to Uber Eats...")
-        self.driver.get('https://www.ubereats.com')
-        time.sleep(3)
+        self.driver.get(UBER_EATS_URL)
+        self.waiter.settle()
         
         # Handle location popup immediately
         self.handle_location_popup()
+        return True
         
     def handle_location_popup(self):
         """Handle the location selection popup"""
         try:
             logger.info("Handling location popup...")
             
-            # Wait a moment for popup to appear
-            time.sleep(2)
+            # Wait for late popups triggered by XHR to render
+            self.waiter.settle(timeout=2)
             
             # Common selectors for location popup elements
             popup_selectors = [
@@ -183,36 +549,21 @@ class McDonaldsOrderBot:
             popup_closed = False
             
             # Try to find and close the popup
-            for selector in popup_selectors:
-                try:
-                    if "contains" in selector:
-                        # Use XPath for text-based selectors
-                        text_to_find = selector.split("'")[1]
-                        element = WebDriverWait(self.driver, 3).until(
-                            EC.element_to_be_clickable((By.XPATH, f"//button[contains(text(), '{text_to_find}')] | //a[contains(text(), '{text_to_find}')]"))
-                        )
-                    else:
-                        # Use CSS selector
-                        element = WebDriverWait(self.driver, 3).until(
-                            EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
-                        )
-                    
+            try:
+                element = self.find_clickable("location_popup_close", popup_selectors, timeout=3)
+                if element:
                     element.click()
-                    time.sleep(1)
-                    logger.info(f"Successfully closed popup using: {selector}")
+                    self.waiter.poll(EC.invisibility_of_element(element), timeout=1)
+                    logger.info("Successfully closed location popup")
                     popup_closed = True
-                    break
-                    
-                except TimeoutException:
-                    continue
-                except Exception as e:
-                    continue
+            except Exception as e:
+                logger.debug(f"Could not click popup close button: {e}")
             
             # If popup still exists, try pressing ESC key
             if not popup_closed:
                 try:
                     self.driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.ESCAPE)
-                    time.sleep(1)
+                    self.waiter.settle(timeout=1)
                     logger.info("Tried closing popup with ESC key")
                 except:
                     pass
@@ -221,7 +572,7 @@ class McDonaldsOrderBot:
             if not popup_closed:
                 try:
                     self.driver.execute_script("document.body.click();")
-                    time.sleep(1)
+                    self.waiter.settle(timeout=1)
                     logger.info("Tried clicking outside popup to dismiss")
                 except:
                     pass
@@ -258,7 +609,7 @@ class McDonaldsOrderBot:
         except Exception as e:
             logger.debug(f"Error removing overlays: {e}")
         
-    def set_delivery_address(self, address="110 N Carpenter Street, Chicago, IL"):
+    def set_delivery_address(self, address=DELIVERY_ADDRESS):
         """Set the delivery address to find the McDonald's location"""
         try:
             logger.info(f"Setting delivery address to: {address}")
@@ -272,13 +623,7 @@ class McDonaldsOrderBot:
                 "[aria-label*='address']"
             ]
             
-            address_input = None
-            for selector in address_selectors:
-                try:
-                    address_input = self.wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, selector)))
-                    break
-                except TimeoutException:
-                    continue
+            address_input = self.find_clickable("address_input", address_selectors)
                     
             if not address_input:
                 logger.error("Could not find address input field")
@@ -286,9 +631,10 @@ class McDonaldsOrderBot:
                 
             address_input.clear()
             address_input.send_keys(address)
-            time.sleep(2)
+            # Wait for the typeahead suggestions before confirming
+            self.waiter.poll(EC.presence_of_element_located((By.CSS_SELECTOR, "[role='option']")), timeout=2)
             address_input.send_keys(Keys.ENTER)
-            time.sleep(3)
+            self.waiter.settle()
             
             return True
             
@@ -309,19 +655,13 @@ class McDonaldsOrderBot:
                 "input[type='search']"
             ]
             
-            search_input = None
-            for selector in search_selectors:
-                try:
-                    search_input = self.wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, selector)))
-                    break
-                except TimeoutException:
-                    continue
+            search_input = self.find_clickable("store_search_input", search_selectors)
                     
             if search_input:
                 search_input.clear()
                 search_input.send_keys("McDonald's")
                 search_input.send_keys(Keys.ENTER)
-                time.sleep(3)
+                self.waiter.settle()
             
             # Look for McDonald's restaurant link
             mcdonalds_selectors = [
@@ -330,15 +670,12 @@ class McDonaldsOrderBot:
                 "a:contains('McDonald\\'s')"
             ]
             
-            for selector in mcdonalds_selectors:
-                try:
-                    mcdonalds_link = self.wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, selector)))
-                    mcdonalds_link.click()
-                    time.sleep(5)
-                    logger.info("Successfully clicked on McDonald's restaurant")
-                    return True
-                except:
-                    continue
+            mcdonalds_link = self.find_clickable("mcdonalds_store_link", mcdonalds_selectors)
+            if mcdonalds_link:
+                mcdonalds_link.click()
+                self.waiter.settle()
+                logger.info("Successfully clicked on McDonald's restaurant")
+                return True
                     
             return False
             
@@ -361,17 +698,15 @@ class McDonaldsOrderBot:
             ]
             
             # Scroll down to find more menu sections
-            self.driver.execute_script("window.scrollTo(0, 1000);")
-            time.sleep(2)
+            self.waiter.scroll_to(1000)
             
             for selector in global_favorites_selectors:
                 try:
                     section = self.driver.find_element(By.XPATH, f"//*[contains(text(), 'Global Favorites')]")
                     self.driver.execute_script("arguments[0].scrollIntoView(true);", section)
-                    time.sleep(1)
-                    if section.is_displayed():
+                    if self.waiter.poll(lambda d: section.is_displayed(), timeout=1):
                         section.click()
-                        time.sleep(3)
+                        self.waiter.settle()
                         logger.info("Found and clicked Global Favorites section")
                         return True
                 except:
@@ -390,14 +725,12 @@ class McDonaldsOrderBot:
         logger.info(f"Scrolling to find {section_name} section...")
         
         for i in range(10):  # Scroll down 10 times
-            self.driver.execute_script(f"window.scrollTo(0, {500 * (i + 1)});")
-            time.sleep(1)
+            self.waiter.scroll_to(500 * (i + 1))
             
             try:
                 section = self.driver.find_element(By.XPATH, f"//*[contains(text(), '{section_name}')]")
                 if section.is_displayed():
                     self.driver.execute_script("arguments[0].scrollIntoView(true);", section)
-                    time.sleep(1)
                     return True
             except:
                 continue
@@ -405,68 +738,39 @@ class McDonaldsOrderBot:
         return False
     
     def add_global_favorites_items(self):
-        """Add all Global Favorites items to cart"""
+        """Add the requested items to cart, or all Global Favorites items when none were requested"""
         try:
             logger.info("Adding Global Favorites items to cart...")
             
-            # Common Global Favorites items (may vary by location)
-            global_favorites_items = [
-                "Samurai Pork Burger",
-                "McRice Burger",
-                "Stroopwafel McFlurry",
-                "Banana Pie",
-                "Sweet Potato Fries",
-                "Taro Pie"
-            ]
-            
             added_items = []
             
-            # Look for add buttons or item cards
-            item_selectors = [
-                "[data-testid*='menu-item']",
-                ".menu-item",
-                "[data-testid*='add-item']",
-                "button[aria-label*='Add']"
-            ]
-            
-            # Scroll through the menu to find items
-            for scroll_position in range(0, 3000, 500):
-                self.driver.execute_script(f"window.scrollTo(0, {scroll_position});")
-                time.sleep(1)
-                
-                # Look for items to add
-                try:
-                    add_buttons = self.driver.find_elements(By.XPATH, "//button[contains(@aria-label, 'Add') or contains(text(), '+') or contains(@data-testid, 'add')]")
-                    
-                    for button in add_buttons:
-                        try:
-                            # Check if this is in the Global Favorites section
-                            item_container = button.find_element(By.XPATH, "./ancestor::*[contains(@class, 'item') or contains(@data-testid, 'item')]")
-                            item_text = item_container.text.lower()
-                            
-                            # Look for Global Favorites keywords or items
-                            if any(item.lower() in item_text for item in global_favorites_items) or 'global' in item_text:
-                                self.driver.execute_script("arguments[0].scrollIntoView(true);", button)
-                                time.sleep(0.5)
-                                button.click()
-                                time.sleep(2)
-                                
-                                # Handle any customization popups
-                                self.handle_customization_popup()
-                                
-                                added_items.append(item_text)
-                                logger.info(f"Added item to cart: {item_text[:50]}...")
-                                
-                        except Exception as e:
-                            continue
-                            
-                except Exception as e:
+            catalog = self.get_menu_catalog()
+
+            targets = []
+            for name in self.requested_items or GLOBAL_FAVORITES_ITEMS:
+                item = catalog.resolve(name)
+                if item is None:
+                    logger.info(f"No menu item matches {name}")
+                elif item not in targets:
+                    targets.append(item)
+            if not self.requested_items:
+                targets += [item for item in catalog.with_keyword("global") if item not in targets]
+
+            for item in targets:
+                # Items already added by an earlier attempt are still in the cart
+                if item.text in self.cart_items:
+                    added_items.append(item.text)
                     continue
+                if self.click_menu_item(item):
+                    added_items.append(item.text)
+                    self.cart_items.append(item.text)
+                    self.save_cart()
+                    logger.info(f"Added item to cart: {item.text[:50]}...")
             
             # If no specific Global Favorites found, add some popular international items
-            if not added_items:
+            if not added_items and not self.requested_items:
                 logger.info("Specific Global Favorites not found, adding available international items...")
-                self.add_available_items(5)  # Add 5 random items
+                self.add_available_items(5, catalog.items)  # Add 5 random items
             
             logger.info(f"Total items added: {len(added_items)}")
             return len(added_items) > 0
@@ -475,40 +779,65 @@ class McDonaldsOrderBot:
             logger.error(f"Error adding Global Favorites items: {e}")
             return False
     
-    def add_available_items(self, max_items=5):
+    def add_available_items(self, max_items=5, menu_items=None):
         """Add available items from the menu"""
         try:
             added_count = 0
+
+            if menu_items is None:
+                menu_items = MenuSnapshot(self.driver).capture_scrolling(self.waiter, range(0, 2000, 400))
             
-            # Scroll through menu and add items
-            for scroll_pos in range(0, 2000, 400):
-                self.driver.execute_script(f"window.scrollTo(0, {scroll_pos});")
-                time.sleep(1)
-                
-                add_buttons = self.driver.find_elements(By.XPATH, "//button[contains(@aria-label, 'Add') or contains(text(), '+')]")
-                
-                for button in add_buttons[:2]:  # Add max 2 items per scroll
-                    if added_count >= max_items:
-                        break
-                        
-                    try:
-                        self.driver.execute_script("arguments[0].scrollIntoView(true);", button)
-                        time.sleep(0.5)
-                        button.click()
-                        time.sleep(2)
-                        
-                        self.handle_customization_popup()
-                        added_count += 1
-                        logger.info(f"Added item {added_count}")
-                        
-                    except:
-                        continue
-                        
+            for item in menu_items:
                 if added_count >= max_items:
                     break
+
+                if self.click_menu_item(item):
+                    added_count += 1
+                    logger.info(f"Added item {added_count}")
                     
         except Exception as e:
             logger.error(f"Error adding available items: {e}")
+
+    def get_menu_catalog(self):
+        """Return the cached menu catalog for the current store, scanning the page on a miss"""
+        restaurant = self.driver.current_url.split("?")[0]
+        catalog = self.catalogs.get(restaurant)
+        if catalog is None:
+            # Snapshot the whole menu with one JS call per scroll step and index it locally
+            menu_items = MenuSnapshot(self.driver).capture_scrolling(self.waiter, range(0, 3000, 500))
+            catalog = MenuCatalog(menu_items)
+            if menu_items:
+                self.catalogs.put(restaurant, catalog)
+        return catalog
+
+    def find_menu_button(self, item):
+        """Locate an item's add button, by session tag first and by name after a reload"""
+        for by, locator in ((By.CSS_SELECTOR, item.locator), (By.XPATH, item.name_xpath)):
+            buttons = self.driver.find_elements(by, locator)
+            if buttons:
+                return buttons[0]
+
+        if item.scroll_y is not None:
+            self.waiter.scroll_to(item.scroll_y)
+        return self.waiter.until(lambda d: d.find_element(By.XPATH, item.name_xpath), timeout=2)
+
+    def click_menu_item(self, item):
+        """Click the add button of a catalogued menu item"""
+        try:
+            button = self.find_menu_button(item)
+            self.driver.execute_script("arguments[0].scrollIntoView(true);", button)
+            self.waiter.poll(EC.element_to_be_clickable(button), timeout=1)
+            button.click()
+            self.waiter.settle(timeout=2)
+
+            # Handle any customization popups
+            self.handle_customization_popup()
+            emit(CART_ITEM_ADDED, "WebAutomationAgent", item=item.text)
+            return True
+
+        except Exception as e:
+            logger.debug(f"Could not add {item.name}: {e}")
+            return False
     
     def handle_customization_popup(self):
         """Handle item customization popups"""
@@ -521,16 +850,10 @@ class McDonaldsOrderBot:
                 "[data-testid*='add-to-cart']"
             ]
             
-            for selector in popup_buttons:
-                try:
-                    button = WebDriverWait(self.driver, 3).until(
-                        EC.element_to_be_clickable((By.XPATH, f"//button[contains(text(), 'Add to Cart') or contains(text(), 'Done') or contains(text(), 'Add')]"))
-                    )
-                    button.click()
-                    time.sleep(1)
-                    break
-                except TimeoutException:
-                    continue
+            button = self.find_clickable("customization_confirm", popup_buttons, timeout=3)
+            if button:
+                button.click()
+                self.waiter.settle(timeout=1)
                     
         except Exception as e:
             logger.debug(f"No customization popup found: {e}")
@@ -549,15 +872,11 @@ class McDonaldsOrderBot:
                 "button:contains('View cart')"
             ]
             
-            for selector in cart_selectors:
-                try:
-                    cart_button = self.wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, selector)))
-                    cart_button.click()
-                    time.sleep(3)
-                    logger.info("Opened cart")
-                    break
-                except:
-                    continue
+            cart_button = self.find_clickable("cart_button", cart_selectors)
+            if cart_button:
+                cart_button.click()
+                self.waiter.settle()
+                logger.info("Opened cart")
             
             # Look for checkout button
             checkout_selectors = [
@@ -566,14 +885,11 @@ class McDonaldsOrderBot:
                 "[data-testid*='checkout']"
             ]
             
-            for selector in checkout_selectors:
-                try:
-                    checkout_button = self.wait.until(EC.element_to_be_clickable((By.XPATH, f"//button[contains(text(), 'Checkout') or contains(text(), 'Go to checkout')]")))
-                    logger.info("Found checkout button - ready to proceed")
-                    # Note: Not actually clicking checkout to avoid placing real order
-                    return True
-                except:
-                    continue
+            checkout_button = self.find_clickable("checkout_button", checkout_selectors)
+            if checkout_button:
+                logger.info("Found checkout button - ready to proceed")
+                # Note: Not actually clicking checkout to avoid placing real order
+                return True
                     
             return False
             
@@ -581,41 +897,159 @@ class McDonaldsOrderBot:
             logger.error(f"Error in checkout process: {e}")
             return False
     
-    def run_order_process(self):
-        """Run the complete ordering process"""
+    def save_checkpoint(self, checkpoint, step):
+        # A cancelled run's checkpoint is deleted by the executor; writing it now would bring it back
+        if self.cancelled.is_set():
+            return
+        checkpoint.completed.append(step["step"])
+        checkpoint.step_durations[step["step"]] = step["duration"]
+        checkpoint.url = self.driver.current_url
+        checkpoint.cookies = self.driver.get_cookies()
+        checkpoint.cart_items = list(self.cart_items)
+        self.checkpoints.save(checkpoint)
+
+    def save_cart(self):
+        """Checkpoint the cart after each add, so a retry of a half-done add step skips what is already in it"""
+        if self.checkpoint is None or self.cancelled.is_set():
+            return
+        self.checkpoint.cart_items = list(self.cart_items)
+        self.checkpoint.cookies = self.driver.get_cookies()
+        self.checkpoints.save(self.checkpoint)
+
+    def resume_from(self, checkpoint):
+        """Restore the cookies and page of a checkpoint; returns False if the saved state no longer holds"""
+        logger.info(f"Resuming order {checkpoint.run_id} after {checkpoint.last_step}...")
+        with self.step("resume") as step:
+            self.restore_cookies(checkpoint.cookies)
+            self.driver.get(checkpoint.url)
+            self.waiter.settle()
+            self.remove_modal_overlays()
+            step["ok"] = self.driver.current_url.split("?")[0] == checkpoint.url.split("?")[0]
+
+        if not step["ok"]:
+            logger.warning(f"Checkpoint for {checkpoint.run_id} is stale, starting over")
+            self.checkpoints.record_stale(checkpoint.run_id)
+            return False
+
+        self.cart_items = list(checkpoint.cart_items)
+        time_saved = self.checkpoints.record_resume(checkpoint, step["duration"])
+        self.resumed = {"after_step": checkpoint.last_step, "time_saved": time_saved}
+        logger.info(f"Resumed after {checkpoint.last_step}, saving {time_saved:.1f}s")
+        return True
+
+    def restore_cookies(self, cookies):
+        # Cookies can only be set for the domain that is currently open
+        self.driver.get(UBER_EATS_URL)
+        # Whatever an earlier run left in the profile must not mix with the restored state
+        self.driver.delete_all_cookies()
+        self.driver.execute_script(CLEAR_STORAGE_SCRIPT)
+        for cookie in cookies:
+            try:
+                self.driver.add_cookie(cookie)
+            except WebDriverException as e:
+                logger.debug(f"Could not restore cookie {cookie.get('name')}: {e}")
+
+    def restore_session(self):
+        """Load the user's saved browser state; returns True if it still carries the delivery address"""
+        snapshot = self.sessions.load(self.user_id) if self.sessions else None
+        if snapshot is None:
+            self.clear_browser_state()
+            return False
+
+        logger.info(f"Restoring saved session for {self.user_id}...")
+        with self.step("restore_session") as step:
+            cookies = snapshot.live_cookies()
+            self.restore_cookies(cookies)
+            self.driver.execute_script(WRITE_STORAGE_SCRIPT, snapshot.local_storage)
+            self.driver.refresh()
+            self.waiter.settle()
+            self.remove_modal_overlays()
+            step["ok"] = self.session_holds(snapshot, cookies)
+
+        if not step["ok"]:
+            logger.warning(f"Saved session for {self.user_id} is stale, setting up from scratch")
+            self.sessions.invalidate(self.user_id)
+            self.clear_browser_state()
+            return False
+
+        self.sessions.mark_restored()
+        return True
+
+    def session_holds(self, snapshot, cookies):
+        """True if the site kept the restored cookies and shows the saved address as the delivery location"""
+        # A session the site has expired comes back with its cookies cleared or replaced
+        present = {cookie["name"] for cookie in self.driver.get_cookies()}
+        missing = [cookie["name"] for cookie in cookies if cookie["name"] not in present]
+        if missing:
+            logger.debug(f"Restored session lost cookies: {missing}")
+            return False
+        street = snapshot.address.split(",")[0]
+        return bool(self.driver.execute_script(ADDRESS_SHOWN_SCRIPT, street))
+
+    def clear_browser_state(self):
+        """Drop the profile's cookies and site storage, keeping its HTTP cache"""
+        try:
+            self.driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            self.driver.execute_cdp_cmd("Storage.clearDataForOrigin", {
+                "origin": UBER_EATS_URL,
+                "storageTypes": "local_storage,session_storage,indexeddb,service_workers"
+            })
+        except WebDriverException as e:
+            # Without CDP, clear what is visible from the site itself
+            logger.debug(f"CDP clear failed, clearing through the page: {e}")
+            self.driver.get(UBER_EATS_URL)
+            self.driver.delete_all_cookies()
+            self.driver.execute_script(CLEAR_STORAGE_SCRIPT)
+
+    def save_session(self):
+        try:
+            self.sessions.save(SessionSnapshot(
+                self.user_id,
+                DELIVERY_ADDRESS,
+                self.driver.get_cookies(),
+                self.driver.execute_script(READ_STORAGE_SCRIPT) or {}
+            ))
+        except WebDriverException as e:
+            logger.warning(f"Could not snapshot session for {self.user_id}: {e}")
+
+    def run_order_process(self, run_id="default", user_id="default", items=None):
+        """Run the complete ordering process for ``items`` (the parsed order), resuming a failed earlier attempt of ``run_id``"""
+        self.user_id = user_id
+        self.requested_items = list(items) if items else None
         try:
             self.setup_driver()
             
             logger.info("Starting McDonald's order process...")
-            
-            # Step 1: Navigate to Uber Eats and handle popups
-            self.navigate_to_ubereats()
-            
-            # Step 2: Set delivery address
-            if not self.set_delivery_address():
-                return False
-            
-            # Step 3: Search for McDonald's
-            if not self.search_mcdonalds():
-                return False
-            
-            # Step 4: Find Global Favorites section
-            if not self.find_global_favorites_section():
-                return False
-            
-            # Step 5: Add Global Favorites items
-            if not self.add_global_favorites_items():
-                return False
-            
-            # Step 6: View cart and prepare for checkout
-            if not self.view_cart_and_checkout():
-                return False
+
+            checkpoint = self.checkpoints.load(run_id)
+            if checkpoint is None or not checkpoint.completed or not self.resume_from(checkpoint):
+                checkpoint = OrderCheckpoint(run_id)
+                # A restored session already has the popup dismissed and the address set
+                if self.restore_session():
+                    checkpoint.completed += SESSION_STEPS
+            self.checkpoint = checkpoint
+
+            # Navigate, set the address, find the restaurant, fill the cart and open checkout,
+            # checkpointing after every step so a retry picks up after the last good one
+            for name in ORDER_STEPS:
+                if name in checkpoint.completed:
+                    continue
+                with self.step(name) as step:
+                    step["ok"] = getattr(self, name)()
+                if not step["ok"]:
+                    return False
+                self.save_checkpoint(checkpoint, step)
+                # Snapshot the session once the address is set, before anything is in the cart
+                if name == SESSION_STEPS[-1] and self.sessions:
+                    self.save_session()
             
             logger.info("Order process completed successfully!")
             logger.info("Note: Actual checkout was not completed to avoid placing a real order")
+            self.checkpoints.delete(run_id)
             
-            # Keep browser open for review
-            input("Press Enter to close the browser...")
+            # Keep browser open for review when run by hand
+            if self.pause_for_review:
+                input("Press Enter to close the browser...")
             
             return True
             
@@ -624,6 +1058,10 @@ class McDonaldsOrderBot:
             return False
         
         finally:
+            self.timer.log_report()
+            self.selectors.flush()
+            for key, stats in self.selectors.get_stats().items():
+                logger.info(f"Selector {key}: {stats['hits']}/{stats['lookups']} cache hits, avg {stats['avg_latency']:.2f}s")
             if self.driver:
                 self.driver.quit()
 
@@ -633,7 +1071,7 @@ if __name__ == "__main__":
     chrome_driver_path = "C:/Users/mcb4339/OneDrive - McDonalds Corp/Desktop/Testing-Area/Selenium/chromedriver.exe"
     
     # Create and run the order bot
-    order_bot = McDonaldsOrderBot(chrome_driver_path)
+    order_bot = McDonaldsOrderBot(chrome_driver_path, pause_for_review=True)
     success = order_bot.run_order_process()
     
     if success:
@@ -19,9 +19,10 @@ async def main():
     try:
         while True:
             await asyncio.sleep(10)
-    except KeyboardInterrupt:
+    except (KeyboardInterrupt, asyncio.CancelledError):
         print("\n🛑 Shutting down McDonald's A2A system...")
-        await orchestrator.agents["scheduler"].process_message({"command": "stop_scheduling"})
+    finally:
+        await orchestrator.stop_system()
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -1,22 +1,14 @@
-from agents.user_proxy_agent import UserProxyAgent
-from agents.order_agent import OrderAgent
-from agents.web_automation_agent import WebAutomationAgent
-from agents.menu_understanding_agent import MenuUnderstandingAgent
-from agents.checkout_agent import CheckoutAgent
-from agents.scheduler_agent import SchedulerAgent
-from agents.logger_agent import LoggerAgent
+import asyncio
+from typing import AsyncIterator, Dict, Any, List, Optional
+from datetime import datetime
+from agents.registry import AgentRegistry, get_default_registry
+from agents.tracing import get_tracer
 
 class McDonaldsA2AOrchestrator:
-    def __init__(self):
-        self.agents = {
-            "user_proxy": UserProxyAgent(),
-            "order_agent": OrderAgent(),
-            "web_automation": WebAutomationAgent(),
-            "menu_understanding": MenuUnderstandingAgent(),
-            "checkout": CheckoutAgent(),
-            "scheduler": SchedulerAgent(),
-            "logger": LoggerAgent()
-        }
+    def __init__(self, registry: Optional[AgentRegistry] = None):
+        self.registry = registry or get_default_registry()
+        self.agents = self.registry.instances()
+        self.queued_orders = 0
 
     async def start_system(self):
         print("🍟 Starting McDonald's A2A Ordering System...")
@@ -33,16 +25,101 @@ class McDonaldsA2AOrchestrator:
         print("✅ All agents initialized and ready!")
         print("📅 Wednesday scheduling activated!")
 
+    async def stop_system(self):
+        await self.agents["scheduler"].process_message({"command": "stop_scheduling"})
+
+        logger_agent = self.agents["logger"]
+        # Write out log entries still queued in the sink
+        if not getattr(logger_agent, "is_remote", False):
+            await logger_agent.sink.close()
+
+        web_agent = self.agents["web_automation"]
+        # Stop the warm browser sessions' MCP server processes
+        if not getattr(web_agent, "is_remote", False):
+            await web_agent.selenium_pool.close()
+        await asyncio.to_thread(get_tracer().exporter.flush)
+
     async def process_user_order(self, user_input: str) -> Dict[str, Any]:
         return await self.agents["user_proxy"].process_message({
             "content": user_input,
             "manual_trigger": True
         })
 
+    async def stream_user_order(self, user_input: str) -> AsyncIterator[Dict[str, Any]]:
+        """Yield progress events for one order as they happen, ending with a ``result`` event."""
+        async for event in self.agents["user_proxy"].stream_message({
+            "content": user_input,
+            "manual_trigger": True
+        }):
+            yield event
+
+    async def process_user_orders(self, user_inputs: List[str], concurrency: int = 4) -> List[Dict[str, Any]]:
+        """Run many orders through the pipeline with bounded parallelism.
+
+        Orders wait in a queue of ``2 * concurrency`` slots, so a large batch
+        applies backpressure to the caller instead of spawning a task per
+        order. Results come back in input order.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+        results: List[Optional[Dict[str, Any]]] = [None] * len(user_inputs)
+        pending = 0
+
+        async def worker():
+            nonlocal pending
+            while True:
+                item = await queue.get()
+                if item is None:
+                    queue.task_done()
+                    return
+
+                index, user_input = item
+                pending -= 1
+                self.queued_orders -= 1
+                try:
+                    results[index] = await self.process_user_order(user_input)
+                except Exception as e:
+                    results[index] = {"status": "error", "message": f"Order processing error: {str(e)}"}
+                finally:
+                    queue.task_done()
+
+        workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+        try:
+            for item in enumerate(user_inputs):
+                pending += 1
+                self.queued_orders += 1
+                await queue.put(item)
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+        finally:
+            # A cancelled batch leaves orders in the queue that no worker will take
+            self.queued_orders -= pending
+            for task in workers:
+                task.cancel()
+
+        return results
+
     def get_system_status(self) -> Dict[str, Any]:
         return {
             "agents_active": len(self.agents),
-            "scheduler_running": self.agents["scheduler"].is_running,
-            "analytics": self.agents["logger"].get_analytics(),
+            "scheduler_running": self._local_stats("scheduler", lambda agent: agent.is_running),
+            "analytics": self._local_stats("logger", lambda agent: agent.get_analytics()),
+            "success_rate_24h": self._local_stats("logger", lambda agent: agent.get_success_rate_series(24)),
+            "selenium_pool": self._local_stats("web_automation", lambda agent: agent.selenium_pool.get_stats()),
+            "order_bots": self._local_stats("web_automation", lambda agent: agent.get_bot_stats()),
+            "browser_plans": self._local_stats("web_automation", lambda agent: agent.plan_cache.get_stats()),
+            "intent_parsing": self._local_stats("menu_understanding", lambda agent: agent.get_stats()),
+            "checkout": self._local_stats("checkout", lambda agent: agent.get_stats()),
+            "pipeline": {
+                "queued_orders": self.queued_orders,
+                "stages": self._local_stats("order_agent", lambda agent: agent.stages.get_stats())
+            },
             "timestamp": datetime.now().isoformat()
         }
+
+    def _local_stats(self, key: str, read_stats) -> Any:
+        agent = self.agents[key]
+        # Agents served from another process keep their stats there
+        if getattr(agent, "is_remote", False):
+            return {"remote": agent.url}
+        return read_stats(agent)
@@ -0,0 +1,121 @@
+import os
+import shutil
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# Modules import each other as top-level packages (agents, a2a), as when run from src/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+@pytest.fixture(autouse=True)
+def span_file(tmp_path, monkeypatch):
+    """Keep spans from instrumented code out of the working tree's .cache."""
+    from agents.tracing import JsonlSpanExporter, Tracer
+    path = tmp_path / "spans.jsonl"
+    monkeypatch.setattr("agents.tracing._tracer", Tracer(JsonlSpanExporter(str(path))))
+    return path
+
+IMAGE_COUNT = 24
+IMAGE_BYTES = 64 * 1024
+FONT_BYTES = 128 * 1024
+# Per-asset server delay, so the load event trails DOMContentLoaded as on a real CDN
+ASSET_DELAY = 0.05
+
+MENU_PAGE = """<!doctype html>
+<html><head><title>Menu</title>
+<style>
+@font-face {{ font-family: Brand; src: url('/font.woff2') format('woff2'); }}
+body {{ font-family: Brand, sans-serif; }}
+</style></head>
+<body>
+<h1>Global Favorites</h1>
+{items}
+</body></html>
+"""
+
+MENU_ITEM = """<div class="item"><img src="/img/{index}.png" width="120" height="90">
+<span>Item {index}</span><button data-testid="add-{index}">Add</button></div>"""
+
+# Keeps a request in flight at all times, like the live order tracker on UberEats
+POLLING_PAGE = """<!doctype html>
+<html><head><title>Tracker</title></head>
+<body><h1>Order status</h1>
+<script>
+(function poll() { fetch('/status').then(function() { setTimeout(poll, 50); }); })();
+</script>
+</body></html>
+"""
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Local stand-in for the store pages the bot drives."""
+
+    def do_GET(self):
+        if self.path == "/menu.html":
+            body = MENU_PAGE.format(items="\n".join(MENU_ITEM.format(index=i) for i in range(IMAGE_COUNT))).encode()
+            content_type = "text/html"
+        elif self.path == "/polling.html":
+            body, content_type = POLLING_PAGE.encode(), "text/html"
+        elif self.path == "/status":
+            time.sleep(0.2)
+            body, content_type = b'{"status": "preparing"}', "application/json"
+        elif self.path.startswith("/img/"):
+            time.sleep(ASSET_DELAY)
+            body, content_type = os.urandom(IMAGE_BYTES), "image/png"
+        elif self.path == "/font.woff2":
+            time.sleep(ASSET_DELAY)
+            body, content_type = os.urandom(FONT_BYTES), "font/woff2"
+        else:
+            self.send_error(404)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture(scope="session")
+def fixture_site():
+    """Base URL of a local server for FixtureHandler's pages."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+@pytest.fixture
+def start_chrome():
+    """Start Chrome with a BrowserProfile; skips the test without Chrome and chromedriver."""
+    webdriver = pytest.importorskip("selenium.webdriver")
+    from selenium.common.exceptions import WebDriverException
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
+
+    drivers = []
+
+    def start(profile):
+        driver_path = os.environ.get("CHROMEDRIVER_PATH") or shutil.which("chromedriver")
+        if driver_path is None:
+            pytest.skip("chromedriver not available")
+
+        options = Options()
+        options.add_argument("--no-sandbox")
+        profile.apply_to_options(options)
+        try:
+            driver = webdriver.Chrome(service=Service(driver_path), options=options)
+        except WebDriverException as e:
+            pytest.skip(f"Chrome could not start: {e.msg}")
+        profile.apply_to_driver(driver)
+        drivers.append(driver)
+        return driver
+
+    yield start
+    for driver in drivers:
+        driver.quit()
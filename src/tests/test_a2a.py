@@ -0,0 +1,119 @@
+"""Round trips between ``a2a.server`` and ``a2a.client`` over localhost."""
+import asyncio
+import socket
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from a2a.client import A2AClient, RemoteAgent
+from a2a.server import A2AServer
+from a2a.types import AgentCapabilities, AgentCard, AgentSkill
+from agents.base_agent import BaseA2AAgent
+from agents.streaming import CART_ITEM_ADDED, emit, stream_call
+from agents.tracing import current_span, get_tracer
+
+def free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("localhost", 0))
+        return probe.getsockname()[1]
+
+class CartAgent(BaseA2AAgent):
+    def __init__(self, port: int):
+        super().__init__("CartAgent", "Adds items to a cart", port)
+        self.messages = []
+
+    def _create_agent_card(self) -> AgentCard:
+        return AgentCard(
+            name="Cart Agent",
+            description="Adds items to a cart",
+            url=f"http://localhost:{self.port}/",
+            version="1.0.0",
+            defaultInputModes=["json"],
+            defaultOutputModes=["json"],
+            capabilities=AgentCapabilities(streaming=True),
+            skills=[AgentSkill(id="cart", name="Cart", description="Adds items", tags=["cart"], examples=[])]
+        )
+
+    async def process_message(self, message):
+        self.messages.append(message)
+        if message.get("fail"):
+            raise RuntimeError("cart service down")
+        for item in message.get("items", []):
+            emit(CART_ITEM_ADDED, self.name, item=item)
+        return {"status": "cart_ready", "items": message.get("items", []), "trace_id": current_span().trace_id}
+
+def run_with_server(scenario):
+    """Serve a CartAgent on a free port and run ``scenario(agent, remote)`` against it."""
+    async def main():
+        agent = CartAgent(free_port())
+        server = A2AServer(agent, port=agent.port)
+        client = A2AClient(timeout=5)
+        await server.start()
+        try:
+            return await scenario(agent, RemoteAgent("cart", f"http://localhost:{agent.port}", client))
+        finally:
+            await client.close()
+            await server.stop()
+    return asyncio.run(main())
+
+def test_message_round_trip_carries_the_trace():
+    async def scenario(agent, remote):
+        with get_tracer().start_span("order") as span:
+            result = await remote.process_message({"items": ["Big Mac"]})
+        return span, result
+
+    span, result = run_with_server(scenario)
+    assert result["status"] == "cart_ready"
+    assert result["items"] == ["Big Mac"]
+    assert result["trace_id"] == span.trace_id
+
+def test_agent_errors_come_back_as_error_results():
+    async def scenario(agent, remote):
+        return await remote.process_message({"fail": True})
+
+    result = run_with_server(scenario)
+    assert result == {"status": "error", "message": "cart service down"}
+
+def test_stream_relays_progress_events():
+    async def scenario(agent, remote):
+        return [event async for event in remote.stream_message({"items": ["Big Mac", "Taro Pie"]})]
+
+    events = run_with_server(scenario)
+    assert [event["type"] for event in events] == ["accepted", CART_ITEM_ADDED, CART_ITEM_ADDED, "result"]
+    assert events[2]["data"] == {"item": "Taro Pie"}
+
+def test_remote_events_join_the_local_stream():
+    async def scenario(agent, remote):
+        return [event async for event in stream_call("OrderAgent", lambda: remote.process_message({"items": ["Big Mac"]}))]
+
+    events = run_with_server(scenario)
+    assert [(event.type, event.agent) for event in events] == [
+        ("accepted", "OrderAgent"), ("accepted", "CartAgent"), (CART_ITEM_ADDED, "CartAgent"), ("result", "OrderAgent")
+    ]
+    assert events[-1].data["status"] == "cart_ready"
+
+def test_card_fetch_and_shared_session():
+    async def scenario(agent, remote):
+        card = await remote.get_agent_card()
+        session = remote.client._get_session()
+        await asyncio.gather(*(remote.process_message({"items": []}) for _ in range(5)))
+        return card, session is remote.client._get_session(), remote.in_flight, len(agent.messages)
+
+    card, same_session, in_flight, handled = run_with_server(scenario)
+    assert card.skills[0].id == "cart"
+    assert card.capabilities.streaming
+    assert same_session
+    assert (in_flight, handled) == (0, 5)
+
+def test_unreachable_agent_returns_an_error():
+    async def scenario():
+        client = A2AClient(timeout=2)
+        try:
+            return await RemoteAgent("cart", f"http://localhost:{free_port()}/", client).process_message({})
+        finally:
+            await client.close()
+
+    result = asyncio.run(scenario())
+    assert result["status"] == "error"
+    assert "unavailable" in result["message"]
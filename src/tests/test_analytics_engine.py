@@ -0,0 +1,96 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from agents.analytics_engine import AnalyticsEngine, QuantileSketch
+
+START = datetime(2026, 10, 14, 0, 0, tzinfo=timezone.utc)
+
+def test_sketch_quantiles_stay_within_relative_accuracy():
+    rng = random.Random(7)
+    values = sorted(rng.lognormvariate(0, 1) for _ in range(5000))
+    sketch = QuantileSketch(relative_accuracy=0.01)
+    for value in values:
+        sketch.add(value)
+
+    for q in (0.5, 0.9, 0.99):
+        exact = values[int(q * (len(values) - 1))]
+        assert abs(sketch.quantile(q) - exact) <= 0.011 * exact
+    assert sketch.summary()["max"] == values[-1]
+
+def test_sketches_merge():
+    left, right, both = QuantileSketch(), QuantileSketch(), QuantileSketch()
+    for value in range(1, 101):
+        (left if value % 2 else right).add(value)
+        both.add(value)
+    left.merge(right)
+    assert left.summary() == both.summary()
+
+def test_window_query_combines_resolutions():
+    engine = AnalyticsEngine()
+    # One event every 10 minutes for two days
+    for minutes in range(0, 2 * 24 * 60, 10):
+        engine.record(START + timedelta(minutes=minutes), "OrderAgent", "info", {"duration": 1.0})
+
+    day = engine.query(START, START + timedelta(days=1))
+    assert day["events"] == 144
+    edges = engine.query(START + timedelta(days=1, hours=20, minutes=5), START + timedelta(days=1, hours=22, minutes=5))
+    assert edges["events"] == 12
+    assert edges["agent_latency"]["OrderAgent"]["count"] == 12
+
+def test_orders_errors_and_stages():
+    engine = AnalyticsEngine()
+    engine.record(START, "OrderAgent", "info", {"order_status": "order_completed", "stages": {"checkout": 2.0}})
+    engine.record(START + timedelta(minutes=1), "OrderAgent", "warning", {"order_status": "order_failed"})
+    engine.record(START + timedelta(minutes=2), "CheckoutAgent", "error", {})
+
+    summary = engine.query(START, START + timedelta(hours=1))
+    assert (summary["orders"], summary["orders_succeeded"], summary["errors"]) == (2, 1, 1)
+    assert summary["success_rate"] == 0.5
+    assert summary["stage_latency"]["checkout"]["p50"] == pytest.approx(2.0, rel=0.01)
+    assert engine.latency_agents == set()
+
+def test_expired_buckets_fall_back_to_the_overlapping_share_of_coarser_ones():
+    engine = AnalyticsEngine(retention={"minute": 60})
+    # One event a minute for the first hour, then the minute buckets expire
+    for minute in range(60):
+        engine.record(START + timedelta(minutes=minute), "OrderAgent", "error" if minute % 2 else "info", {"duration": 1.0})
+    engine.record(START + timedelta(hours=3), "OrderAgent", "info", {})
+    assert START.timestamp() // 60 + 5 not in engine.buckets["minute"]
+
+    minute = engine.query(START + timedelta(minutes=5), START + timedelta(minutes=6))
+    assert minute["events"] == pytest.approx(1)
+    assert minute["agent_latency"]["OrderAgent"]["p50"] == pytest.approx(1.0, rel=0.01)
+    assert minute["approximate"]
+
+    half = engine.query(START, START + timedelta(minutes=30))
+    assert (half["events"], half["errors"]) == (pytest.approx(30), pytest.approx(15))
+
+    whole = engine.query(START, START + timedelta(hours=1))
+    assert whole["events"] == 60
+    assert not whole["approximate"]
+
+def test_latency_recorded_without_an_event():
+    engine = AnalyticsEngine()
+    engine.record_latency(START, "MenuUnderstandingAgent", 0.5)
+
+    summary = engine.query(START, START + timedelta(minutes=1))
+    assert summary["events"] == 0
+    assert summary["agent_latency"]["MenuUnderstandingAgent"]["count"] == 1
+    assert engine.latency_agents == {"MenuUnderstandingAgent"}
+
+def test_late_events_outside_retention_are_ignored():
+    engine = AnalyticsEngine(retention={"minute": 60, "hour": 2, "day": 1})
+    engine.record(START + timedelta(days=3), "OrderAgent", "info", {})
+    engine.record(START, "OrderAgent", "info", {})
+
+    assert sum(len(buckets) for buckets in engine.buckets.values()) == 3
+    assert engine.query(START, START + timedelta(days=4))["events"] == 1
+
+def test_series_fills_empty_buckets():
+    engine = AnalyticsEngine()
+    engine.record(START + timedelta(minutes=90), "OrderAgent", "info", {"order_status": "order_completed"})
+    points = engine.series("hour", START, START + timedelta(hours=3))
+    assert [point["events"] for point in points] == [0, 1, 0]
+    assert points[1]["success_rate"] == 1.0
@@ -0,0 +1,192 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from agents.bot_executor import OrderBotExecutor
+from agents.tracing import get_tracer
+
+class FakeTimer:
+    def report(self):
+        return {"steps": []}
+
+class FakeBot:
+    """Stands in for McDonaldsOrderBot: runs ``outcome`` on the pool thread."""
+
+    def __init__(self, outcomes, log):
+        self.outcomes = outcomes
+        self.log = log
+        self.timer = FakeTimer()
+        self.resumed = None
+        self.cancelled = threading.Event()
+
+    def run_order_process(self, run_id, user_id, items):
+        self.log.append((run_id, user_id, threading.current_thread().name, items))
+        outcome = self.outcomes.pop(0)
+        if outcome == "hang":
+            self.cancelled.wait(5)
+            return False
+        return outcome
+
+    def cancel(self):
+        self.cancelled.set()
+
+class FakeCheckpoints:
+    def __init__(self):
+        self.deleted = []
+
+    def delete(self, run_id):
+        self.deleted.append(run_id)
+
+def make_executor(outcomes, **kwargs):
+    log = []
+    bots = []
+
+    def factory():
+        bot = FakeBot(outcomes, log)
+        bots.append(bot)
+        return bot
+
+    return OrderBotExecutor(factory, shutdown_grace=1.0, **kwargs), log, bots
+
+def test_completed_job_runs_on_a_pool_thread():
+    async def scenario():
+        executor, log, _ = make_executor([True], checkpoints=FakeCheckpoints())
+        result = await executor.run(user_id="alice", items=["Big Mac"])
+        await executor.close()
+        return executor, log, result
+
+    executor, log, result = asyncio.run(scenario())
+    assert result["status"] == "completed"
+    assert log[0][1] == "alice"
+    assert log[0][2].startswith("order-bot")
+    assert log[0][3] == ["Big Mac"]
+    assert executor.checkpoints.deleted == []
+
+def test_failed_run_is_retried_under_the_same_run_id():
+    async def scenario():
+        executor, log, _ = make_executor([False, True], retries=1)
+        result = await executor.run()
+        await executor.close()
+        return executor, log, result
+
+    executor, log, result = asyncio.run(scenario())
+    assert (result["status"], result["attempts"]) == ("completed", 2)
+    assert log[0][0] == log[1][0]
+    assert executor.stats["retries"] == 1
+
+def test_final_failure_deletes_the_checkpoint():
+    async def scenario():
+        executor, log, _ = make_executor([False, False], retries=1, checkpoints=FakeCheckpoints())
+        result = await executor.run()
+        await executor.close()
+        return executor, log, result
+
+    executor, log, result = asyncio.run(scenario())
+    assert result["status"] == "failed"
+    assert executor.checkpoints.deleted == [log[0][0]]
+
+def test_timeout_cancels_the_bot():
+    async def scenario():
+        executor, _, bots = make_executor(["hang"], checkpoints=FakeCheckpoints())
+        result = await executor.run(timeout=0.05)
+        await executor.close()
+        return executor, bots, result
+
+    executor, bots, result = asyncio.run(scenario())
+    assert result["status"] == "timed_out"
+    assert bots[0].cancelled.is_set()
+    assert len(executor.checkpoints.deleted) == 1
+
+def test_cancel_finishes_a_running_job():
+    async def scenario():
+        executor, _, bots = make_executor(["hang"])
+        job_id = await executor.submit()
+        while not bots:
+            await asyncio.sleep(0.01)
+        assert executor.cancel(job_id)
+        assert not executor.cancel(job_id)
+        result = await executor.result(job_id)
+        await executor.close()
+        return bots, result
+
+    bots, result = asyncio.run(scenario())
+    assert result["status"] == "cancelled"
+    assert bots[0].cancelled.is_set()
+
+def test_slow_browser_quit_does_not_block_the_loop():
+    class SlowQuitBot(FakeBot):
+        def cancel(self):
+            # driver.quit() can take as long as Chrome takes to exit
+            time.sleep(0.2)
+            super().cancel()
+
+    async def scenario():
+        bots = []
+        executor = OrderBotExecutor(lambda: bots.append(SlowQuitBot(["hang", "hang"], [])) or bots[-1], shutdown_grace=1.0)
+        job_id = await executor.submit()
+        timed_out = asyncio.create_task(executor.run(timeout=0.05))
+        while not bots:
+            await asyncio.sleep(0.01)
+
+        started = time.monotonic()
+        executor.cancel(job_id)
+        result = await executor.result(job_id)
+        blocked = time.monotonic() - started
+
+        timed_out_result = await timed_out
+        await executor.close()
+        return bots, result, timed_out_result, blocked
+
+    bots, result, timed_out_result, blocked = asyncio.run(scenario())
+    assert blocked < 0.1
+    assert (result["status"], timed_out_result["status"]) == ("cancelled", "timed_out")
+    assert all(bot.cancelled.is_set() for bot in bots)
+
+def test_workers_bound_concurrent_bots():
+    running = {"now": 0, "peak": 0}
+    lock = threading.Lock()
+
+    class SlowBot(FakeBot):
+        def run_order_process(self, run_id, user_id, items):
+            with lock:
+                running["now"] += 1
+                running["peak"] = max(running["peak"], running["now"])
+            time.sleep(0.05)
+            with lock:
+                running["now"] -= 1
+            return True
+
+    async def scenario():
+        executor = OrderBotExecutor(lambda: SlowBot([], []), workers=2)
+        results = await asyncio.gather(*(executor.run() for _ in range(5)))
+        await executor.close()
+        return results
+
+    results = asyncio.run(scenario())
+    assert all(result["status"] == "completed" for result in results)
+    assert running["peak"] == 2
+
+def test_bot_spans_join_the_submitters_trace():
+    class TracedBot(FakeBot):
+        def run_order_process(self, run_id, user_id, items):
+            with get_tracer().start_span("browser.open") as span:
+                self.log.append(span)
+            return True
+
+    async def scenario():
+        log = []
+        executor = OrderBotExecutor(lambda: TracedBot([], log))
+        with get_tracer().start_span("order") as root:
+            await executor.run()
+        await executor.close()
+        return root, log[0]
+
+    root, bot_span = asyncio.run(scenario())
+    assert bot_span.trace_id == root.trace_id
+    assert bot_span.parent_span_id == root.span_id
+
+def test_needs_a_worker():
+    with pytest.raises(ValueError):
+        OrderBotExecutor(lambda: None, workers=0)
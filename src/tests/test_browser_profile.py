@@ -0,0 +1,83 @@
+import os
+import threading
+
+from agents.browser_profile import FONT_PATTERNS, IMAGE_PATTERNS, TRACKER_PATTERNS, BrowserProfile, PageMetrics
+
+class FakeOptions:
+    def __init__(self):
+        self.arguments = []
+        self.page_load_strategy = "normal"
+
+    def add_argument(self, argument):
+        self.arguments.append(argument)
+
+class CdpDriver:
+    def __init__(self, fail=False, metrics=()):
+        self.commands = []
+        self.fail = fail
+        self.metrics = list(metrics)
+
+    def execute_cdp_cmd(self, command, params):
+        if self.fail:
+            raise RuntimeError("CDP not supported")
+        self.commands.append((command, params))
+
+    def execute_script(self, script):
+        return self.metrics.pop(0)
+
+def test_eager_loading_accepts_interactive_documents():
+    assert BrowserProfile().ready_states() == ("interactive", "complete")
+    assert BrowserProfile(page_load_strategy="normal").ready_states() == ("complete",)
+
+def test_blocked_patterns_follow_the_flags():
+    patterns = BrowserProfile(block_trackers=False, blocked_urls=["*ads.example*"]).blocked_url_patterns()
+    assert patterns[0] == "*ads.example*"
+    assert set(IMAGE_PATTERNS + FONT_PATTERNS) <= set(patterns)
+    assert not set(TRACKER_PATTERNS) & set(patterns)
+
+    none = BrowserProfile(block_images=False, block_fonts=False, block_media=False, block_trackers=False)
+    assert none.blocked_url_patterns() == []
+
+def test_each_worker_thread_gets_its_own_profile(tmp_path):
+    profile = BrowserProfile(user_data_dir=str(tmp_path))
+    dirs = []
+    threads = [threading.Thread(target=lambda: dirs.append(profile.profile_dir()), name=f"order-bot_{i}") for i in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(set(dirs)) == 2
+
+    options = FakeOptions()
+    profile.apply_to_options(options, "alice")
+    assert options.page_load_strategy == "eager"
+    assert "--headless=new" in options.arguments
+    assert f"--user-data-dir={profile.profile_dir('alice')}" in options.arguments
+
+def test_users_never_share_a_profile(tmp_path):
+    profile = BrowserProfile(user_data_dir=str(tmp_path))
+    alice, bob = profile.profile_dir("alice"), profile.profile_dir("../bob")
+    assert alice != bob
+    assert alice.startswith(str(tmp_path / "alice"))
+    assert bob.startswith(str(tmp_path))
+
+def test_default_profile_root_is_absolute():
+    assert os.path.isabs(BrowserProfile().user_data_dir)
+
+def test_blocking_is_applied_through_cdp():
+    driver = CdpDriver()
+    BrowserProfile().apply_to_driver(driver)
+    assert driver.commands[0] == ("Network.enable", {})
+    assert driver.commands[1][0] == "Network.setBlockedURLs"
+
+    # Drivers without CDP keep working, unblocked
+    BrowserProfile().apply_to_driver(CdpDriver(fail=True))
+
+def test_page_metrics_count_bytes_per_step():
+    driver = CdpDriver(metrics=[
+        {"origin": 1, "bytes": 1000, "requests": 5, "dom_content_loaded": 0.2, "load": 0.5},
+        {"origin": 1, "bytes": 1500, "requests": 8, "dom_content_loaded": 0.2, "load": 0.5},
+        {"origin": 2, "bytes": 700, "requests": 3, "dom_content_loaded": 0.1, "load": None},
+    ])
+    metrics = PageMetrics()
+    assert [metrics.sample(driver)["bytes"] for _ in range(3)] == [1000, 500, 700]
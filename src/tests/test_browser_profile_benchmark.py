@@ -0,0 +1,46 @@
+"""Fixture benchmark: the lean BrowserProfile against a default Chrome setup.
+
+Serves a menu-like page with heavy images and web fonts from localhost and
+loads it with each profile, comparing bytes transferred, request count and
+time until the bot's waiter considers the page settled. Needs Chrome and
+chromedriver; skipped otherwise. Run with ``pytest -s`` to see the table.
+"""
+import time
+
+import pytest
+
+pytest.importorskip("selenium")
+
+from agents.browser_profile import BrowserProfile, PageMetrics
+from agents.page_waits import PageWaiter
+
+def measure(driver, profile: BrowserProfile, url: str, runs: int = 3):
+    samples = []
+    for _ in range(runs):
+        metrics = PageMetrics()
+        waiter = PageWaiter(driver, ready_states=profile.ready_states())
+        started = time.monotonic()
+        driver.get(url)
+        waiter.settle(timeout=10.0)
+        elapsed = time.monotonic() - started
+        samples.append({**metrics.sample(driver), "settled": elapsed})
+    return {
+        "bytes": min(sample["bytes"] for sample in samples),
+        "requests": min(sample["requests"] for sample in samples),
+        "settled": sorted(sample["settled"] for sample in samples)[len(samples) // 2]
+    }
+
+def test_lean_profile_transfers_less_and_settles_sooner(fixture_site, start_chrome):
+    default = BrowserProfile(page_load_strategy="normal", block_images=False, block_fonts=False,
+                             block_media=False, block_trackers=False, user_data_dir=None)
+    lean = BrowserProfile(user_data_dir=None)
+
+    url = f"{fixture_site}/menu.html"
+    results = {name: measure(start_chrome(profile), profile, url) for name, profile in (("default", default), ("lean", lean))}
+    print()
+    for name, result in results.items():
+        print(f"{name:>8}: {result['bytes'] / 1024:8.1f} KB  {result['requests']:3d} requests  {result['settled']:.2f}s to settle")
+
+    assert results["lean"]["bytes"] < results["default"]["bytes"] / 4
+    assert results["lean"]["requests"] < results["default"]["requests"]
+    assert results["lean"]["settled"] < results["default"]["settled"]
@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from agents.checkout_graph import CheckoutGraph, CheckoutStep, CheckoutStepError
+from agents.checkout_services import LocalRestaurantService
+
+def recording_step(name, log, delay=0.0, depends_on=(), result=None, timeout=10.0):
+    async def run(context):
+        log.append(("start", name))
+        await asyncio.sleep(delay)
+        log.append(("end", name))
+        return result if result is not None else f"{name}:{context['idempotency_key']}"
+    return CheckoutStep(name, run, list(depends_on), timeout)
+
+def test_independent_steps_run_concurrently():
+    log = []
+    started = {}
+
+    def overlapping_step(name, other):
+        async def run(context):
+            started[name].set()
+            # Run one after the other and this wait times out
+            await asyncio.wait_for(started[other].wait(), 1.0)
+            log.append(("end", name))
+            return f"{name}:{context['idempotency_key']}"
+        return CheckoutStep(name, run)
+
+    graph = CheckoutGraph([
+        overlapping_step("address", "payment"),
+        overlapping_step("payment", "address"),
+        recording_step("place_order", log, depends_on=["address", "payment"]),
+    ])
+
+    async def scenario():
+        started.update(address=asyncio.Event(), payment=asyncio.Event())
+        return await graph.run({}, "cart_1")
+
+    results = asyncio.run(scenario())
+    assert results["place_order"] == "place_order:cart_1:place_order"
+    assert log.index(("start", "place_order")) > max(log.index(("end", "address")), log.index(("end", "payment")))
+    assert graph.get_stats()["payment"]["count"] == 1
+
+def test_retry_with_the_same_key_skips_finished_steps():
+    attempts = {"payment": 0, "place_order": 0}
+
+    async def payment(context):
+        attempts["payment"] += 1
+        return "charged"
+
+    async def place_order(context):
+        attempts["place_order"] += 1
+        if attempts["place_order"] == 1:
+            raise ConnectionError("checkout page reloaded")
+        return context["results"]["payment"]
+
+    graph = CheckoutGraph([CheckoutStep("payment", payment), CheckoutStep("place_order", place_order, ["payment"])])
+    with pytest.raises(CheckoutStepError) as failure:
+        asyncio.run(graph.run({}, "cart_1"))
+    assert failure.value.step == "place_order"
+
+    assert asyncio.run(graph.run({}, "cart_1"))["place_order"] == "charged"
+    assert attempts == {"payment": 1, "place_order": 2}
+
+    asyncio.run(graph.run({}, "cart_2"))
+    assert attempts["payment"] == 2
+
+def test_step_timeout_fails_the_checkout():
+    log = []
+    graph = CheckoutGraph([recording_step("payment", log, delay=1.0, timeout=0.01)])
+    with pytest.raises(CheckoutStepError, match="timed out"):
+        asyncio.run(graph.run({}, "cart_1"))
+
+def test_invalid_graphs_are_rejected():
+    log = []
+    with pytest.raises(ValueError, match="cycle"):
+        CheckoutGraph([recording_step("a", log, depends_on=["b"]), recording_step("b", log, depends_on=["a"])])
+    with pytest.raises(ValueError, match="Unknown"):
+        CheckoutGraph([recording_step("a", log, depends_on=["missing"])])
+
+def test_local_order_ids_are_unique_within_a_second():
+    async def scenario():
+        restaurant = LocalRestaurantService()
+        orders = [await restaurant.place_order("cart_1", f"key_{i}") for i in range(50)]
+        repeat = await restaurant.place_order("cart_1", "key_0")
+        return orders, repeat
+
+    orders, repeat = asyncio.run(scenario())
+    assert len({order["order_id"] for order in orders}) == 50
+    assert repeat["order_id"] == orders[0]["order_id"]
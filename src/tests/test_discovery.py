@@ -0,0 +1,66 @@
+"""Skill routing through the registry and the discovery endpoint."""
+import asyncio
+
+import pytest
+
+aiohttp = pytest.importorskip("aiohttp")
+
+from a2a.client import A2AClient
+from a2a.server import A2AServer, DiscoveryServer
+from agents.registry import AgentRegistry
+from test_a2a import CartAgent, free_port
+
+def test_discovery_routes_skills_to_remote_replicas():
+    async def scenario():
+        agents = [CartAgent(free_port()), CartAgent(free_port())]
+        servers = [A2AServer(agent, port=agent.port) for agent in agents]
+        client = A2AClient(timeout=5)
+        registry = AgentRegistry()
+        registry.register_remote("cart", f"http://localhost:{agents[0].port}", client)
+        registry.register_remote("cart", f"http://localhost:{agents[1].port}", client, replica=True)
+        discovery = DiscoveryServer(registry, port=free_port())
+
+        for server in (*servers, discovery):
+            await server.start()
+        try:
+            await registry.refresh_remote_cards()
+            replica = registry.find_by_skill("cart")
+            await replica.process_message({"items": ["Big Mac"]})
+
+            base = f"http://localhost:{discovery.port}"
+            async with aiohttp.ClientSession() as session:
+                async with session.get(f"{base}/.well-known/agents.json") as response:
+                    agents_doc = await response.json()
+                async with session.get(f"{base}/skills/cart") as response:
+                    routed = await response.json()
+                async with session.get(f"{base}/skills/dance") as response:
+                    missing = response.status
+            return agents, agents_doc, routed, missing
+        finally:
+            await client.close()
+            for server in (*servers, discovery):
+                await server.stop()
+
+    agents, agents_doc, routed, missing = asyncio.run(scenario())
+    assert sum(len(agent.messages) for agent in agents) == 1
+    assert [replica["url"] for replica in agents_doc["cart"]["replicas"]] == [f"http://localhost:{a.port}/" for a in agents]
+    assert routed["url"] in {f"http://localhost:{a.port}/" for a in agents}
+    assert missing == 404
+
+def test_shared_tag_is_a_conflict():
+    async def scenario():
+        registry = AgentRegistry()
+        registry.register("cart", lambda: CartAgent(9101))
+        registry.register("cart_backup", lambda: CartAgent(9102))
+        discovery = DiscoveryServer(registry, port=free_port())
+        await discovery.start()
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with session.get(f"http://localhost:{discovery.port}/skills/cart") as response:
+                    return response.status, await response.text()
+        finally:
+            await discovery.stop()
+
+    status, text = asyncio.run(scenario())
+    assert status == 409
+    assert "cart, cart_backup" in text
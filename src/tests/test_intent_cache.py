@@ -0,0 +1,51 @@
+from agents.intent_cache import IntentCache, normalize_request, request_tokens
+
+RESULT = {"items": ["Big Mac"], "quantities": {"Big Mac": 1}}
+
+def make_cache(tmp_path, **kwargs):
+    return IntentCache(path=str(tmp_path / "intent_cache.json"), **kwargs)
+
+def test_normalization_drops_case_punctuation_and_stopwords():
+    assert normalize_request("Get me a Big Mac, please!") == "get me a big mac please"
+    assert request_tokens("McDonald's: order me the Big Mac") == {"mcdonalds", "big", "mac"}
+
+def test_exact_hit_ignores_formatting(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.put("Big Mac please", "v1", RESULT, latency=1.5)
+
+    assert cache.get("big mac, PLEASE", "v1") == RESULT
+    stats = cache.get_stats()
+    assert stats["exact_hits"] == 1
+    assert stats["latency_saved"] == 1.5
+
+def test_similar_requests_hit_above_the_threshold(tmp_path):
+    cache = make_cache(tmp_path, similarity_threshold=0.6)
+    cache.put("spicy nuggets and a pistachio mcflurry", "v1", RESULT, latency=1.0)
+
+    assert cache.get("get me spicy nuggets and pistachio mcflurry", "v1") == RESULT
+    assert cache.get("spicy nuggets", "v1") is None
+    stats = cache.get_stats()
+    assert (stats["similar_hits"], stats["misses"]) == (1, 1)
+
+def test_menu_version_separates_entries(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.put("big mac", "v1", RESULT, latency=1.0)
+    assert cache.get("big mac", "v2") is None
+
+def test_lru_eviction_and_ttl(tmp_path):
+    cache = make_cache(tmp_path, max_entries=2)
+    cache.put("big mac", "v1", RESULT, latency=1.0)
+    cache.put("taro pie", "v1", RESULT, latency=1.0)
+    cache.get("big mac", "v1")
+    cache.put("mcflurry", "v1", RESULT, latency=1.0)
+
+    assert cache.get("taro pie", "v1") is None
+    assert cache.get("big mac", "v1") == RESULT
+
+    cache.ttl = -1
+    assert cache.get("big mac", "v1") is None
+    assert cache.get_stats()["entries"] == 1
+
+def test_entries_survive_a_reload(tmp_path):
+    make_cache(tmp_path).put("big mac", "v1", RESULT, latency=1.0)
+    assert make_cache(tmp_path).get("big mac", "v1") == RESULT
@@ -0,0 +1,47 @@
+from agents.intent_rules import DEFAULT_RULES, LOADED_FRIES, MCFLURRY, MEDIUM_FRIES, NUGGETS, USUAL_ORDER, IntentEngine
+
+def test_longest_phrase_wins():
+    intent = IntentEngine().parse("I want loaded fries")
+    assert intent.items == [LOADED_FRIES]
+    assert intent.matched_phrases == ["loaded fries"]
+
+def test_quantities_and_modifiers_attach_to_the_next_phrase():
+    intent = IntentEngine().parse("two spicy nuggets and an extra large mcflurry")
+    assert intent.items == [NUGGETS, MCFLURRY]
+    assert intent.quantities == {NUGGETS: 2, MCFLURRY: 1}
+    assert intent.modifiers == {MCFLURRY: ["extra", "large"]}
+
+def test_combo_phrases_expand_to_several_items():
+    intent = IntentEngine().parse("the usual please")
+    assert intent.items == USUAL_ORDER
+
+def test_combo_phrases_share_the_usual_order():
+    # The LLM path falls back to USUAL_ORDER too; see test_menu_understanding_agent.py
+    assert USUAL_ORDER == [NUGGETS, MCFLURRY, MEDIUM_FRIES]
+    for phrase in ("usual", "wednesday special", "global menu"):
+        assert DEFAULT_RULES[phrase][0] == USUAL_ORDER
+
+def test_negated_items_are_excluded_everywhere():
+    intent = IntentEngine().parse("the usual but no dessert")
+    assert intent.items == [NUGGETS, MEDIUM_FRIES]
+    assert intent.excluded == [MCFLURRY]
+
+    intent = IntentEngine().parse("without mcflurry, nuggets and a mcflurry")
+    assert intent.items == [NUGGETS]
+    assert MCFLURRY not in intent.quantities
+
+def test_nothing_left_returns_none():
+    engine = IntentEngine()
+    assert engine.parse("no dessert") is None
+    assert engine.parse("something healthy") is None
+
+def test_unrecognized_words_lower_confidence():
+    engine = IntentEngine()
+    clean = engine.parse("pistachio mcflurry")
+    noisy = engine.parse("pistachio mcflurry with oat milk and cinnamon swirl")
+    assert clean.confidence == 0.95
+    assert noisy.confidence < clean.confidence
+
+def test_custom_rules():
+    engine = IntentEngine({"pie": (["Taro Pie"], 0.9)})
+    assert engine.parse("3 pie").quantities == {"Taro Pie": 3}
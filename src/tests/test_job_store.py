@@ -0,0 +1,104 @@
+import asyncio
+import sqlite3
+import time
+from datetime import datetime, timedelta, timezone
+
+from agents.job_store import JobStore
+from agents.schedule_engine import ScheduleEngine
+
+DUE = datetime(2026, 10, 14, 17, 0, tzinfo=timezone.utc)
+
+class FixedClock:
+    def __init__(self, moment):
+        self.moment = moment
+
+    def now(self):
+        return self.moment
+
+    async def sleep(self, seconds):
+        await asyncio.sleep(3600)
+
+def test_jobs_round_trip(tmp_path):
+    store = JobStore(str(tmp_path / "scheduler.db"))
+    store.save_job("weekly", "0 12 * * 3", "America/Chicago", {"content": "usual"}, DUE)
+    store.save_job("daily", "0 8 * * *", "UTC", {}, DUE - timedelta(hours=9), last_run=DUE - timedelta(days=1))
+    store.update_run_times("weekly", DUE + timedelta(days=7), DUE)
+    store.close()
+
+    jobs = JobStore(str(tmp_path / "scheduler.db")).load_jobs()
+    assert [job["job_id"] for job in jobs] == ["daily", "weekly"]
+    assert jobs[1]["payload"] == {"content": "usual"}
+    assert jobs[1]["last_run"] == DUE
+
+def test_a_run_is_claimed_once():
+    store = JobStore(":memory:")
+    assert store.claim_run("weekly", DUE)
+    assert not store.claim_run("weekly", DUE)
+
+    store.finish_run("weekly", DUE, "succeeded", {"status": "order_placed"})
+    assert not store.claim_run("weekly", DUE)
+    assert store.recent_runs("weekly") == [{
+        "job_id": "weekly", "scheduled_for": DUE.isoformat(), "status": "succeeded", "result": {"status": "order_placed"}
+    }]
+
+def test_lapsed_lease_can_be_reclaimed():
+    store = JobStore(":memory:")
+    assert store.claim_run("weekly", DUE, lease=0.01)
+    assert store.expired_runs() == []
+
+    time.sleep(0.02)
+    assert store.expired_runs() == [{"job_id": "weekly", "scheduled_for": DUE}]
+    assert store.claim_run("weekly", DUE, lease=60)
+    assert store.expired_runs() == []
+
+    store.renew_lease("weekly", DUE, lease=0.0)
+    time.sleep(0.01)
+    assert store.claim_run("weekly", DUE)
+
+def test_missed_runs_are_recorded():
+    store = JobStore(":memory:")
+    store.record_missed("weekly", DUE)
+    assert store.recent_runs("weekly")[0]["status"] == "missed"
+    assert not store.claim_run("weekly", DUE)
+
+def test_databases_without_leases_are_migrated(tmp_path):
+    path = str(tmp_path / "scheduler.db")
+    connection = sqlite3.connect(path)
+    connection.execute(
+        "CREATE TABLE runs (job_id TEXT NOT NULL, scheduled_for REAL NOT NULL, status TEXT NOT NULL,"
+        " started_at REAL NOT NULL, finished_at REAL, result TEXT, PRIMARY KEY (job_id, scheduled_for))"
+    )
+    connection.execute("INSERT INTO runs VALUES ('weekly', ?, 'running', 0, NULL, NULL)", (DUE.timestamp(),))
+    connection.commit()
+    connection.close()
+
+    store = JobStore(path)
+    assert store.expired_runs() == [{"job_id": "weekly", "scheduled_for": DUE}]
+
+def test_engine_refires_runs_left_by_a_crashed_process(tmp_path):
+    path = str(tmp_path / "scheduler.db")
+    crashed = JobStore(path)
+    crashed.save_job("weekly", "0 12 * * 3", "UTC", {}, DUE + timedelta(days=7), last_run=DUE)
+    crashed.claim_run("weekly", DUE, lease=0.0)
+    crashed.claim_run("gone", DUE, lease=0.0)
+    crashed.close()
+
+    async def scenario():
+        store = JobStore(path)
+        engine = ScheduleEngine(FixedClock(DUE + timedelta(minutes=30)), store)
+        fired = []
+
+        async def callback(job):
+            fired.append(job.job_id)
+
+        engine.restore_jobs(callback)
+        runner = asyncio.create_task(engine.run())
+        await asyncio.sleep(0.05)
+        await engine.stop()
+        await asyncio.gather(*engine._tasks)
+        return fired, store
+
+    fired, store = asyncio.run(scenario())
+    assert fired == ["weekly"]
+    assert store.recent_runs("weekly")[0]["status"] == "succeeded"
+    assert store.recent_runs("gone")[0]["status"] == "abandoned"
@@ -0,0 +1,144 @@
+import asyncio
+import gzip
+import json
+import os
+
+import pytest
+
+from agents.log_sink import LogSink
+
+def read_segments(directory):
+    entries = []
+    for name in sorted(os.listdir(directory)):
+        with gzip.open(os.path.join(directory, name), "rt", encoding="utf-8") as segment:
+            entries.extend(json.loads(line) for line in segment)
+    return entries
+
+def test_close_flushes_everything_in_batches(tmp_path):
+    async def scenario():
+        sink = LogSink(str(tmp_path), batch_size=10, flush_interval=0.01)
+        for i in range(25):
+            assert await sink.submit({"i": i})
+        await sink.close()
+        return sink.get_stats()
+
+    stats = asyncio.run(scenario())
+    assert [entry["i"] for entry in read_segments(tmp_path)] == list(range(25))
+    assert stats["written"] == 25
+    assert stats["batches"] >= 3
+    assert stats["queue_depth"] == 0
+
+def test_segments_rotate_by_size(tmp_path):
+    async def scenario():
+        sink = LogSink(str(tmp_path), batch_size=1, flush_interval=0.01, max_segment_bytes=50)
+        for i in range(4):
+            await sink.submit({"message": "x" * 30, "i": i})
+        await sink.close()
+        return sink.get_stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["segments"] == len(os.listdir(tmp_path)) == 4
+    assert [entry["i"] for entry in read_segments(tmp_path)] == [0, 1, 2, 3]
+
+def test_drop_policy_counts_overflow(tmp_path):
+    async def scenario():
+        sink = LogSink(str(tmp_path), max_queue=2)
+        results = [await sink.submit({"i": i}) for i in range(5)]
+        await sink.close()
+        return results, sink.get_stats()
+
+    results, stats = asyncio.run(scenario())
+    assert results == [True, True, False, False, False]
+    assert stats["dropped"] == 3
+    assert stats["written"] == 2
+
+def test_block_policy_waits_for_space(tmp_path):
+    async def scenario():
+        sink = LogSink(str(tmp_path), max_queue=2, policy="block", flush_interval=0.01)
+        for i in range(10):
+            await sink.submit({"i": i})
+        await sink.close()
+        return sink.get_stats()
+
+    stats = asyncio.run(scenario())
+    assert (stats["dropped"], stats["written"]) == (0, 10)
+
+def test_restarted_writer_keeps_queued_entries(tmp_path):
+    async def scenario():
+        sink = LogSink(str(tmp_path), flush_interval=0.01)
+        sink.start()
+        queue = sink._queue
+        sink._writer.cancel()
+        await asyncio.gather(sink._writer, return_exceptions=True)
+
+        queue.put_nowait({"i": "queued while down"})
+        await sink.submit({"i": "after restart"})
+        await sink.close()
+        return sink._queue is queue
+
+    assert asyncio.run(scenario())
+    assert [entry["i"] for entry in read_segments(tmp_path)] == ["queued while down", "after restart"]
+
+def test_unknown_policy_raises(tmp_path):
+    with pytest.raises(ValueError):
+        LogSink(str(tmp_path), policy="spill")
+
+def flaky_writer(sink, failures):
+    """Make the first ``failures`` writes raise like a full disk."""
+    write = sink._write
+    calls = {"count": 0}
+
+    def _write(batch):
+        calls["count"] += 1
+        if calls["count"] <= failures:
+            raise OSError("No space left on device")
+        write(batch)
+
+    sink._write = _write
+    return calls
+
+def test_failed_batches_are_retried(tmp_path):
+    async def scenario():
+        sink = LogSink(str(tmp_path), batch_size=5, flush_interval=0.01, retry_interval=0.02)
+        calls = flaky_writer(sink, failures=2)
+        for i in range(5):
+            await sink.submit({"i": i})
+        # Nothing new arrives; the writer must wake up for the retry on its own
+        await asyncio.sleep(0.2)
+        stats = sink.get_stats()
+        await sink.close()
+        return stats, calls["count"]
+
+    stats, calls = asyncio.run(scenario())
+    assert calls == 3
+    assert [entry["i"] for entry in read_segments(tmp_path)] == list(range(5))
+    assert (stats["write_errors"], stats["retries"], stats["backlog"]) == (2, 2, 0)
+    assert (stats["written"], stats["dropped"]) == (5, 0)
+
+def test_backlog_is_bounded_and_keeps_the_newest_entries(tmp_path):
+    async def scenario():
+        sink = LogSink(str(tmp_path), batch_size=4, flush_interval=0.01, max_backlog=6, retry_interval=0.05)
+        calls = flaky_writer(sink, failures=1)
+        for i in range(4):
+            await sink.submit({"i": i})
+        await asyncio.sleep(0.02)
+        for i in range(4, 12):
+            await sink.submit({"i": i})
+        await sink.close()
+        return sink.get_stats()
+
+    stats = asyncio.run(scenario())
+    assert [entry["i"] for entry in read_segments(tmp_path)] == list(range(6, 12))
+    assert (stats["written"], stats["dropped"]) == (6, 6)
+
+def test_close_gives_up_on_a_backlog_it_cannot_write(tmp_path):
+    async def scenario():
+        sink = LogSink(str(tmp_path), flush_interval=0.01, retry_interval=10.0)
+        flaky_writer(sink, failures=100)
+        for i in range(3):
+            await sink.submit({"i": i})
+        await asyncio.wait_for(sink.close(), 1)
+        return sink.get_stats()
+
+    stats = asyncio.run(scenario())
+    assert (stats["written"], stats["dropped"], stats["backlog"]) == (0, 3, 0)
@@ -0,0 +1,89 @@
+"""Benchmark: event-loop latency while logging at a high rate.
+
+A ticker coroutine sleeps 1ms at a time and records how late it wakes up
+while a producer logs ``LOG_BENCHMARK_ENTRIES`` entries (default 20,000)
+in bursts, at ``LOG_BENCHMARK_RATE`` entries per second (default 20,000).
+``none`` discards the entries, which is the floor set by the producer
+itself; with ``inline`` each entry is appended to a gzip file on the loop,
+as a synchronous logger would; with ``sink`` it goes through LogSink.
+The sink's tail latency is bounded by the interpreter's thread switch
+interval while its writer thread serializes a batch. Run with ``pytest -s``
+to see the table.
+"""
+import asyncio
+import gzip
+import json
+import os
+import time
+
+from agents.log_sink import LogSink
+
+ENTRIES = int(os.environ.get("LOG_BENCHMARK_ENTRIES", "20000"))
+RATE = int(os.environ.get("LOG_BENCHMARK_RATE", "20000"))
+BURST = 50
+TICK = 0.001
+
+def make_entry(i):
+    return {"entry_id": i, "agent": "OrderAgent", "level": "info", "message": f"event {i}",
+            "data": {"order_id": i, "items": ["Big Mac", "Medium Fries"]}}
+
+async def measure(log) -> dict:
+    lags = []
+    done = asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(TICK)
+            lags.append(time.perf_counter() - started - TICK)
+
+    async def producer():
+        started = time.perf_counter()
+        for start in range(0, ENTRIES, BURST):
+            for i in range(start, min(start + BURST, ENTRIES)):
+                await log(make_entry(i))
+            # Hold the rate, but never sleep less than a loop iteration
+            await asyncio.sleep(max(0.0, started + (start + BURST) / RATE - time.perf_counter()))
+        done.set()
+
+    started = time.perf_counter()
+    await asyncio.gather(ticker(), producer())
+    lags.sort()
+    return {
+        "p50": lags[len(lags) // 2],
+        "p99": lags[int(len(lags) * 0.99)],
+        "max": lags[-1],
+        "elapsed": time.perf_counter() - started
+    }
+
+def test_sink_keeps_the_event_loop_responsive(tmp_path):
+    async def none():
+        async def log(entry):
+            pass
+
+        return await measure(log)
+
+    async def inline():
+        path = str(tmp_path / "inline.jsonl.gz")
+
+        async def log(entry):
+            with gzip.open(path, "ab") as segment:
+                segment.write((json.dumps(entry) + "\n").encode("utf-8"))
+
+        return await measure(log)
+
+    async def sink():
+        log_sink = LogSink(str(tmp_path / "sink"), flush_interval=0.05, policy="block")
+        result = await measure(log_sink.submit)
+        await log_sink.close()
+        assert log_sink.get_stats()["written"] == ENTRIES
+        return result
+
+    results = {"none": asyncio.run(none()), "inline": asyncio.run(inline()), "sink": asyncio.run(sink())}
+
+    print()
+    for name, result in results.items():
+        print(f"{name:>6}: loop lag p50 {result['p50'] * 1000:6.2f}ms  p99 {result['p99'] * 1000:6.2f}ms  "
+              f"max {result['max'] * 1000:6.2f}ms  ({ENTRIES:,} entries in {result['elapsed']:.2f}s)")
+
+    assert results["sink"]["p50"] < results["inline"]["p50"]
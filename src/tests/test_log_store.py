@@ -0,0 +1,70 @@
+import pytest
+
+from agents.log_store import RECORD_OVERHEAD, LogStore
+
+def fill(store, count, agent="OrderAgent", level="info"):
+    return [store.append(agent, level, f"event {i}") for i in range(count)]
+
+def test_ring_buffer_keeps_the_newest_records():
+    store = LogStore(max_records=3)
+    records = fill(store, 5)
+
+    assert len(store) == 3
+    assert [record.seq for record in store.query()] == [5, 4, 3]
+    assert store.get(records[0].seq) is None
+    assert store.get(records[4].seq) is records[4]
+    counts = store.get_counts()
+    assert (counts["total_events"], counts["retained"], counts["evicted"]) == (5, 3, 2)
+
+def test_indexes_follow_eviction():
+    store = LogStore(max_records=4)
+    store.append("OrderAgent", "info", "a")
+    store.append("CheckoutAgent", "error", "b")
+    store.append("OrderAgent", "error", "c")
+    store.append("OrderAgent", "info", "d")
+    store.append("CheckoutAgent", "info", "e")
+
+    assert [r.message for r in store.query(agent="OrderAgent")] == ["d", "c"]
+    assert [r.message for r in store.query(level="error")] == ["c", "b"]
+    assert [r.message for r in store.query(agent="OrderAgent", level="error")] == ["c"]
+    assert store.query(agent="SchedulerAgent") == []
+
+def test_query_limit_returns_newest_first():
+    store = LogStore()
+    fill(store, 10)
+    assert [r.message for r in store.query(limit=2)] == ["event 9", "event 8"]
+    assert [r.message for r in store.query(agent="OrderAgent", limit=3)] == ["event 9", "event 8", "event 7"]
+
+def test_byte_budget_evicts_oldest_records():
+    store = LogStore(max_records=1000, max_bytes=3 * (RECORD_OVERHEAD + 100))
+    for i in range(5):
+        store.append("A", "info", "x" * 90, {"i": i})
+
+    assert len(store) < 5
+    assert store.retained_bytes <= store.max_bytes
+    assert store.query()[0].data == {"i": 4}
+    assert store.get_counts()["evicted"] == 5 - len(store)
+
+def test_oversized_record_is_still_kept():
+    store = LogStore(max_bytes=100)
+    store.append("A", "info", "small")
+    big = store.append("A", "info", "y" * 10_000)
+    assert store.query() == [big]
+    assert store.retained_bytes == big.size
+
+def test_lifetime_counts_survive_eviction():
+    store = LogStore(max_records=2)
+    fill(store, 3, level="info")
+    fill(store, 2, agent="CheckoutAgent", level="error")
+    counts = store.get_counts()
+    assert counts["levels"] == {"info": 3, "error": 2}
+    assert counts["agents"] == 2
+
+def test_to_dict():
+    record = LogStore().append("OrderAgent", "info", "placed", {"order_id": "1"})
+    assert record.to_dict()["entry_id"] == 1
+    assert record.to_dict()["data"] == {"order_id": "1"}
+
+def test_max_records_must_be_positive():
+    with pytest.raises(ValueError):
+        LogStore(max_records=0)
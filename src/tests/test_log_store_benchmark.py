@@ -0,0 +1,58 @@
+"""Benchmark: LogStore ingest and indexed queries at a million events.
+
+Appends ``LOG_BENCHMARK_EVENTS`` records (default one million) into a store
+bounded at the LoggerAgent defaults, then compares filtered queries through
+the agent/level indexes against a linear scan of the retained records. Run
+with ``pytest -s`` to see the timings.
+"""
+import os
+import time
+from datetime import datetime
+
+from agents.log_store import LogStore
+
+EVENTS = int(os.environ.get("LOG_BENCHMARK_EVENTS", "1000000"))
+QUERIES = 1000
+AGENTS = ["OrderAgent", "WebAutomationAgent", "CheckoutAgent"]
+
+def ingest(store: LogStore) -> float:
+    now = datetime.now()
+    started = time.perf_counter()
+    for i in range(EVENTS):
+        level = "error" if i % 50 == 0 else "info"
+        store.append(AGENTS[i % 3], level, f"event {i}", {"order_id": i, "items": ["Big Mac"]}, timestamp=now)
+    return time.perf_counter() - started
+
+def linear_query(store: LogStore, agent: str, level: str, limit: int):
+    results = []
+    for seq in range(store._next_seq - 1, store._oldest_seq - 1, -1):
+        record = store.get(seq)
+        if record.agent == agent and record.level == level:
+            results.append(record)
+            if len(results) >= limit:
+                break
+    return results
+
+def test_million_event_ingest_and_query():
+    store = LogStore()
+    ingest_time = ingest(store)
+
+    started = time.perf_counter()
+    for _ in range(QUERIES):
+        indexed = store.query(agent="CheckoutAgent", level="error", limit=100)
+    query_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(QUERIES // 100):
+        scanned = linear_query(store, "CheckoutAgent", "error", 100)
+    scan_time = (time.perf_counter() - started) * 100
+
+    print()
+    print(f"ingest: {EVENTS:,} events in {ingest_time:.2f}s ({ingest_time / EVENTS * 1e6:.1f} us/event)")
+    print(f" query: {QUERIES} indexed queries in {query_time:.3f}s, linear scan would take {scan_time:.2f}s")
+
+    assert len(store) == min(EVENTS, store.max_records)
+    assert store.total_events == EVENTS
+    assert store.get_counts()["levels"]["error"] == len(range(0, EVENTS, 50))
+    assert [record.seq for record in indexed] == [record.seq for record in scanned]
+    assert query_time < scan_time
@@ -0,0 +1,134 @@
+import asyncio
+
+import pytest
+
+from agents.mcp_session_pool import MCPSessionPool
+
+class FakeToolset:
+    def __init__(self, number):
+        self.number = number
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+class Factory:
+    def __init__(self):
+        self.opened = []
+
+    async def __call__(self):
+        toolset = FakeToolset(len(self.opened))
+        self.opened.append(toolset)
+        return toolset, ["navigate", "click"]
+
+def test_released_sessions_are_reused():
+    async def scenario():
+        factory = Factory()
+        pool = MCPSessionPool(factory, size=2)
+        async with pool.lease() as first:
+            pass
+        async with pool.lease() as second:
+            pass
+        return factory, pool, first, second
+
+    factory, pool, first, second = asyncio.run(scenario())
+    assert second is first
+    assert second.uses == 2
+    assert len(factory.opened) == 1
+    assert pool.get_stats()["hits"] == 1
+
+def test_failed_lease_closes_the_session():
+    async def scenario():
+        factory = Factory()
+        pool = MCPSessionPool(factory, size=1)
+        with pytest.raises(RuntimeError):
+            async with pool.lease():
+                raise RuntimeError("order failed")
+        async with pool.lease() as session:
+            pass
+        return factory, pool, session
+
+    factory, pool, session = asyncio.run(scenario())
+    assert factory.opened[0].closed
+    assert session.toolset is factory.opened[1]
+    assert pool.get_stats()["failed_releases"] == 1
+
+def test_checkout_waits_when_the_pool_is_full():
+    async def scenario():
+        factory = Factory()
+        pool = MCPSessionPool(factory, size=1)
+        held = await pool.checkout()
+        waiter = asyncio.create_task(pool.checkout())
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+        await pool.release(held)
+        return factory, held, await asyncio.wait_for(waiter, 1)
+
+    factory, held, session = asyncio.run(scenario())
+    assert session is held
+    assert len(factory.opened) == 1
+
+def test_unhealthy_and_expired_sessions_are_replaced():
+    async def scenario():
+        factory = Factory()
+        healthy = {"value": False}
+
+        async def health_check(session):
+            return healthy["value"]
+
+        pool = MCPSessionPool(factory, size=1, health_check=health_check)
+        async with pool.lease():
+            pass
+        async with pool.lease():
+            pass
+
+        pool.idle_timeout = 0.0
+        healthy["value"] = True
+        await asyncio.sleep(0.01)
+        async with pool.lease():
+            pass
+        return factory, pool
+
+    factory, pool = asyncio.run(scenario())
+    stats = pool.get_stats()
+    assert len(factory.opened) == 3
+    assert factory.opened[0].closed and factory.opened[1].closed
+    assert stats["health_failures"] == 1
+    assert stats["evictions"] == 1
+
+def test_factory_error_frees_the_slot():
+    async def scenario():
+        calls = {"count": 0}
+
+        async def flaky_factory():
+            calls["count"] += 1
+            if calls["count"] == 1:
+                raise ConnectionError("npx failed")
+            return FakeToolset(1), ["navigate"]
+
+        pool = MCPSessionPool(flaky_factory, size=1)
+        with pytest.raises(ConnectionError):
+            await pool.checkout()
+        return await asyncio.wait_for(pool.checkout(), 1)
+
+    assert asyncio.run(scenario()).toolset.number == 1
+
+def test_idle_sessions_are_evicted_without_a_checkout():
+    async def scenario():
+        factory = Factory()
+        pool = MCPSessionPool(factory, size=1, idle_timeout=0.02, evict_interval=0.01)
+        async with pool.lease():
+            pass
+        await asyncio.sleep(0.1)
+        evicted = factory.opened[0].closed
+        await pool.close()
+        return evicted, pool
+
+    evicted, pool = asyncio.run(scenario())
+    assert evicted
+    assert pool.get_stats()["evictions"] == 1
+    assert pool._evictor.done()
+
+def test_size_must_be_positive():
+    with pytest.raises(ValueError):
+        MCPSessionPool(Factory(), size=0)
@@ -0,0 +1,118 @@
+"""The Selenium MCP session pool against a real stdio server process.
+
+A small JSON-RPC server stands in for ``selenium-mcp-server``, so the pool
+goes through the same spawn, tool listing and teardown as in production.
+"""
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+pytest.importorskip("google.adk")
+pytest.importorskip("mcp")
+
+from agents.mcp_session_pool import MCPSessionPool
+from agents.web_automation_agent import open_selenium_toolset
+
+FAKE_SERVER = r'''
+import json
+import os
+import sys
+
+events = sys.argv[1]
+
+def record(event):
+    with open(events, "a") as log:
+        log.write(f"{event} {os.getpid()}\n")
+
+def reply(request_id, result):
+    sys.stdout.write(json.dumps({"jsonrpc": "2.0", "id": request_id, "result": result}) + "\n")
+    sys.stdout.flush()
+
+TOOLS = [
+    {"name": name, "description": f"{name} in the browser",
+     "inputSchema": {"type": "object", "properties": {"selector": {"type": "string"}}}}
+    for name in ("navigate", "click")
+]
+
+record("started")
+for line in sys.stdin:
+    message = json.loads(line)
+    method = message.get("method")
+    if "id" not in message:
+        continue
+    if method == "initialize":
+        reply(message["id"], {"protocolVersion": message["params"]["protocolVersion"],
+                              "capabilities": {"tools": {}},
+                              "serverInfo": {"name": "fake-selenium", "version": "1.0.0"}})
+    elif method == "tools/list":
+        reply(message["id"], {"tools": TOOLS})
+    elif method == "tools/call":
+        reply(message["id"], {"content": [{"type": "text", "text": "Done"}], "isError": False})
+    else:
+        reply(message["id"], {})
+record("exited")
+'''
+
+def read_events(path):
+    if not os.path.exists(path):
+        return []
+    with open(path) as log:
+        return [line.split() for line in log.read().splitlines()]
+
+def wait_for_exit(path, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        events = read_events(path)
+        if sum(event == "exited" for event, _ in events) == sum(event == "started" for event, _ in events):
+            return events
+        time.sleep(0.05)
+    return read_events(path)
+
+def make_pool(tmp_path, **kwargs):
+    server = tmp_path / "fake_selenium_mcp.py"
+    server.write_text(FAKE_SERVER)
+    events = str(tmp_path / "events.log")
+
+    async def factory():
+        return await open_selenium_toolset(sys.executable, [str(server), events])
+
+    return MCPSessionPool(factory, **kwargs), events
+
+def test_pool_spawns_reuses_and_stops_the_server(tmp_path):
+    pool, events = make_pool(tmp_path, size=1)
+
+    async def scenario():
+        async with pool.lease() as first:
+            tools = sorted(tool.name for tool in first.tools)
+        async with pool.lease() as second:
+            pass
+        reused = second is first
+        await pool.close()
+        return tools, reused
+
+    tools, reused = asyncio.run(scenario())
+    assert tools == ["click", "navigate"]
+    assert reused
+    assert [event for event, _ in wait_for_exit(events)] == ["started", "exited"]
+
+def test_failed_and_idle_sessions_stop_their_servers(tmp_path):
+    pool, events = make_pool(tmp_path, size=1, idle_timeout=0.1, evict_interval=0.05)
+
+    async def scenario():
+        with pytest.raises(RuntimeError):
+            async with pool.lease():
+                raise RuntimeError("order failed")
+        async with pool.lease():
+            pass
+        # Nothing checks a session out again; the evictor closes it
+        await asyncio.sleep(0.5)
+        stats = pool.get_stats()
+        await pool.close()
+        return stats
+
+    stats = asyncio.run(scenario())
+    assert (stats["failed_releases"], stats["evictions"], stats["idle"]) == (1, 1, 0)
+    assert [event for event, _ in wait_for_exit(events)] == ["started", "exited", "started", "exited"]
@@ -0,0 +1,65 @@
+import threading
+
+from agents.menu_catalog import MenuCatalog, MenuCatalogCache, normalize, trigrams
+from agents.menu_snapshot import MenuItem
+
+def item(item_id, name, section="Menu", text=None):
+    return MenuItem(id=item_id, name=name, price=None, section=section, text=text or name.lower())
+
+MENU = [
+    item("0", "Big Mac"),
+    item("1", "McFlurry with OREO Cookies", section="Desserts"),
+    item("2", "Taro Pie", section="Global Favorites"),
+    item("3", "Crème Brûlée Pie", section="Desserts"),
+    item("4", "Quarter Pounder with Cheese"),
+]
+
+def test_normalize_folds_case_accents_and_punctuation():
+    assert normalize("Crème Brûlée  Pie!") == "creme brulee pie"
+    assert normalize("Fries & Coke") == "fries and coke"
+    assert "  b" in trigrams("Big")
+
+def test_resolve_tolerates_typos_and_accents():
+    catalog = MenuCatalog(MENU)
+    assert catalog.resolve("big mac").name == "Big Mac"
+    assert catalog.resolve("quarter pounder w cheese").name == "Quarter Pounder with Cheese"
+    assert catalog.search("mcflury")[0][0].name == "McFlurry with OREO Cookies"
+    assert catalog.resolve("creme brulee pie").name == "Crème Brûlée Pie"
+    assert catalog.resolve("sushi platter") is None
+
+def test_search_ranks_closest_first():
+    catalog = MenuCatalog(MENU)
+    matches = catalog.search("pie")
+    assert {match.name for match, _ in matches[:2]} == {"Taro Pie", "Crème Brûlée Pie"}
+    assert all(0 < score <= 1 for _, score in matches)
+    assert catalog.search("") == []
+
+def test_with_keyword_matches_sections_and_text():
+    catalog = MenuCatalog(MENU)
+    assert [found.name for found in catalog.with_keyword("global")] == ["Taro Pie"]
+    assert len(catalog.with_keyword("desserts")) == 2
+
+def test_cache_expires_after_ttl():
+    cache = MenuCatalogCache(ttl=60)
+    catalog = MenuCatalog(MENU)
+    cache.put("mcdonalds", catalog)
+    assert cache.get("mcdonalds") is catalog
+
+    catalog.built_at -= 61
+    assert cache.get("mcdonalds") is None
+    assert cache.get_stats() == {"hits": 1, "misses": 1}
+
+def test_cache_is_safe_across_threads():
+    cache = MenuCatalogCache()
+    cache.put("mcdonalds", MenuCatalog(MENU))
+
+    def lookups():
+        for _ in range(500):
+            cache.get("mcdonalds")
+
+    threads = [threading.Thread(target=lookups) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert cache.get_stats()["hits"] == 4000
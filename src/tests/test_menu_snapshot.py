@@ -0,0 +1,59 @@
+from agents.menu_snapshot import SNAPSHOT_SCRIPT, MenuItem, MenuSnapshot
+
+def raw_item(item_id, name, price="$5.99"):
+    return {"id": item_id, "name": name, "price": price, "section": "Global Favorites", "text": name.lower()}
+
+class ScrollingDriver:
+    """Renders a different window of the menu at each scroll position."""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.position = None
+        self.scripts = []
+
+    def execute_script(self, script, *args):
+        self.scripts.append(script)
+        assert script == SNAPSHOT_SCRIPT
+        return self.pages[self.position]
+
+class FakeWaiter:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def scroll_to(self, y):
+        self.driver.position = y
+
+def test_capture_builds_items_in_one_call():
+    driver = ScrollingDriver({None: [raw_item("0", "Big Mac"), raw_item("1", "McFlurry", None)]})
+    snapshot = MenuSnapshot(driver)
+
+    items = snapshot.capture()
+    assert [item.name for item in items] == ["Big Mac", "McFlurry"]
+    assert items[1].price is None
+    assert snapshot.round_trips == 1 and len(driver.scripts) == 1
+
+def test_capture_scrolling_merges_items_by_id():
+    driver = ScrollingDriver({
+        0: [raw_item("0", "Big Mac"), raw_item("1", "McFlurry")],
+        800: [raw_item("1", "McFlurry"), raw_item("2", "Taro Pie")],
+        1600: []
+    })
+    snapshot = MenuSnapshot(driver)
+
+    items = snapshot.capture_scrolling(FakeWaiter(driver), [0, 800, 1600])
+    assert [(item.name, item.scroll_y) for item in items] == [("Big Mac", 0), ("McFlurry", 0), ("Taro Pie", 800)]
+    assert snapshot.round_trips == 3
+
+def test_driver_calls_do_not_grow_with_the_menu():
+    pages = {position: [raw_item(str(i), f"Item {i}") for i in range(position, position + 1000)]
+             for position in (0, 500, 1000)}
+    driver = ScrollingDriver(pages)
+
+    items = MenuSnapshot(driver).capture_scrolling(FakeWaiter(driver), pages)
+    assert len(items) == 2000
+    assert len(driver.scripts) == 3
+
+def test_item_locators():
+    item = MenuItem(id="7", name="Chicken 'n' Cheese", price=None, section=None, text="")
+    assert item.locator == "button[data-mcd-add='7']"
+    assert "normalize-space(text())=\"Chicken 'n' Cheese\"" in item.name_xpath
@@ -0,0 +1,110 @@
+"""Benchmark: WebDriver round trips to read a large menu.
+
+A synthetic menu of ``MENU_BENCHMARK_ITEMS`` items (default 2,000) renders
+a window of items at each scroll position, as the lazy-loaded store page
+does. ``per_element`` is the scan the bot used before MenuSnapshot: one
+``find_elements`` per scroll step, then ``find_element`` and ``.text`` on
+every button. ``snapshot`` is MenuSnapshot plus a MenuCatalog lookup. The
+fake driver counts every WebDriver command and sleeps
+``MENU_BENCHMARK_RTT_MS`` per command (default 0.2) to stand in for the
+chromedriver round trip. Run with ``pytest -s`` to see the table.
+"""
+import os
+import time
+
+from agents.menu_catalog import MenuCatalog
+from agents.menu_snapshot import SNAPSHOT_SCRIPT, MenuSnapshot
+
+ITEMS = int(os.environ.get("MENU_BENCHMARK_ITEMS", "2000"))
+RTT = float(os.environ.get("MENU_BENCHMARK_RTT_MS", "0.2")) / 1000
+POSITIONS = range(0, 3000, 500)
+WANTED = ["Item 7", f"Item {ITEMS // 2}", f"Item {ITEMS - 1}"]
+
+ADD_BUTTONS = "//button[contains(@aria-label, 'Add') or contains(text(), '+') or contains(@data-testid, 'add')]"
+ITEM_CONTAINER = "./ancestor::*[contains(@class, 'item') or contains(@data-testid, 'item')]"
+
+def visible_items(position):
+    """Indexes rendered at a scroll position: a window that overlaps the next one by a quarter."""
+    window = ITEMS // len(POSITIONS)
+    start = POSITIONS.index(position) * window
+    return range(start, min(ITEMS, start + window + window // 4))
+
+class CountingDriver:
+    def __init__(self):
+        self.calls = 0
+        self.position = 0
+
+    def command(self):
+        self.calls += 1
+        time.sleep(RTT)
+
+    def find_elements(self, by, locator):
+        self.command()
+        assert locator == ADD_BUTTONS
+        return [FakeButton(self, index) for index in visible_items(self.position)]
+
+    def execute_script(self, script, *args):
+        self.command()
+        assert script == SNAPSHOT_SCRIPT
+        return [{"id": str(index), "name": f"Item {index}", "price": "$5.99", "section": "Menu",
+                 "text": f"item {index}\n$5.99"} for index in visible_items(self.position)]
+
+class FakeButton:
+    def __init__(self, driver, index):
+        self.driver = driver
+        self.index = index
+
+    def find_element(self, by, locator):
+        self.driver.command()
+        assert locator == ITEM_CONTAINER
+        return FakeContainer(self.driver, self.index)
+
+class FakeContainer:
+    def __init__(self, driver, index):
+        self.driver = driver
+        self.index = index
+
+    @property
+    def text(self):
+        self.driver.command()
+        return f"Item {self.index}\n$5.99"
+
+class FakeWaiter:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def scroll_to(self, y):
+        self.driver.position = y
+
+def per_element(driver, wanted):
+    found = []
+    for position in POSITIONS:
+        FakeWaiter(driver).scroll_to(position)
+        for button in driver.find_elements("xpath", ADD_BUTTONS):
+            item_text = button.find_element("xpath", ITEM_CONTAINER).text.lower()
+            if any(f"{name.lower()}\n" in item_text for name in wanted) and button.index not in found:
+                found.append(button.index)
+    return found
+
+def snapshot(driver, wanted):
+    catalog = MenuCatalog(MenuSnapshot(driver).capture_scrolling(FakeWaiter(driver), POSITIONS))
+    return [int(catalog.resolve(name).id) for name in wanted]
+
+def measure(scan):
+    driver = CountingDriver()
+    started = time.perf_counter()
+    found = scan(driver, WANTED)
+    return {"found": sorted(found), "calls": driver.calls, "elapsed": time.perf_counter() - started}
+
+def test_snapshot_reads_the_menu_in_one_call_per_scroll_step():
+    results = {"per_element": measure(per_element), "snapshot": measure(snapshot)}
+
+    print()
+    for name, result in results.items():
+        print(f"{name:>11}: {result['calls']:6,} WebDriver calls  {result['elapsed'] * 1000:8.1f}ms  "
+              f"({ITEMS:,} items, {len(POSITIONS)} scroll steps)")
+
+    assert results["snapshot"]["found"] == results["per_element"]["found"] == sorted(int(name.split()[1]) for name in WANTED)
+    assert results["snapshot"]["calls"] == len(POSITIONS)
+    # Two commands per rendered button, and every item is rendered at least once
+    assert results["per_element"]["calls"] >= 2 * ITEMS
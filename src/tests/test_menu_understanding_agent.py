@@ -0,0 +1,37 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("google.adk")
+
+from agents.intent_cache import IntentCache
+from agents.intent_rules import USUAL_ORDER
+from agents.menu_understanding_agent import MenuUnderstandingAgent
+
+class FakeLlm:
+    def __init__(self, reply):
+        self.reply = reply
+        self.prompts = []
+
+    async def process_message(self, prompt):
+        self.prompts.append(prompt)
+        return self.reply
+
+def make_agent(tmp_path, reply, threshold=0.75):
+    return MenuUnderstandingAgent(
+        llm_agent=FakeLlm(reply),
+        response_cache=IntentCache(str(tmp_path / "intents.json")),
+        rule_confidence_threshold=threshold
+    )
+
+@pytest.mark.parametrize("request_text", ["my usual", "the wednesday special", "something from the global menu"])
+def test_rules_and_llm_agree_on_the_usual(tmp_path, request_text):
+    rules = make_agent(tmp_path / "rules", '{"parsed_items": []}')
+    # A threshold above any rule confidence sends every request to the LLM
+    llm = make_agent(tmp_path / "llm", '{"parsed_items": ["global menu rotation"]}', threshold=1.01)
+
+    by_rules = asyncio.run(rules.process_message({"user_input": request_text}))
+    by_llm = asyncio.run(llm.process_message({"user_input": request_text}))
+
+    assert rules.intent_paths["rules"] == 1 and llm.intent_paths["llm"] == 1
+    assert by_rules["parsed_items"] == by_llm["parsed_items"] == USUAL_ORDER
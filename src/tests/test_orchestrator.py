@@ -0,0 +1,90 @@
+"""Load tests for ``process_user_orders`` with stub agents in place of the pipeline."""
+import asyncio
+import os
+import time
+
+from agents.registry import AgentRegistry
+from orchestrator import McDonaldsA2AOrchestrator
+
+ORDERS = int(os.environ.get("ORCHESTRATOR_LOAD_ORDERS", "2000"))
+
+class StubUserProxy:
+    """Takes ``delay`` per order and records how many orders run at once."""
+
+    def __init__(self, delay=0.001):
+        self.name = "UserProxyAgent"
+        self.in_flight = 0
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self.handled = 0
+
+    async def process_message(self, message):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            if message["content"].startswith("fail"):
+                raise RuntimeError("menu service down")
+            self.handled += 1
+            return {"status": "order_completed", "content": message["content"]}
+        finally:
+            self.active -= 1
+
+def make_orchestrator(proxy):
+    registry = AgentRegistry()
+    registry.register("user_proxy", lambda: proxy)
+    return McDonaldsA2AOrchestrator(registry)
+
+def test_batch_runs_with_bounded_concurrency_in_input_order():
+    proxy = StubUserProxy()
+    orchestrator = make_orchestrator(proxy)
+    inputs = [f"fail {i}" if i % 100 == 0 else f"order {i}" for i in range(ORDERS)]
+    peak_queued = 0
+
+    async def watch():
+        nonlocal peak_queued
+        while True:
+            peak_queued = max(peak_queued, orchestrator.queued_orders)
+            await asyncio.sleep(0)
+
+    async def scenario():
+        watcher = asyncio.create_task(watch())
+        started = time.perf_counter()
+        results = await orchestrator.process_user_orders(inputs, concurrency=8)
+        elapsed = time.perf_counter() - started
+        watcher.cancel()
+        return results, elapsed
+
+    results, elapsed = asyncio.run(scenario())
+    print(f"\n{ORDERS:,} orders at concurrency 8 in {elapsed:.2f}s ({ORDERS / elapsed:,.0f} orders/s)")
+
+    assert [result.get("content") for result in results[1:100]] == inputs[1:100]
+    assert results[0]["status"] == "error" and "menu service down" in results[0]["message"]
+    assert proxy.handled == ORDERS - len(range(0, ORDERS, 100))
+    assert proxy.peak == 8
+    # The queue holds 2 * concurrency orders, plus the one the producer waits to put
+    assert peak_queued <= 17
+    assert orchestrator.queued_orders == 0
+
+def test_cancelled_batch_leaves_no_queued_orders():
+    proxy = StubUserProxy(delay=0.05)
+    orchestrator = make_orchestrator(proxy)
+
+    async def scenario():
+        batch = asyncio.create_task(orchestrator.process_user_orders([f"order {i}" for i in range(100)], concurrency=2))
+        await asyncio.sleep(0.01)
+        queued = orchestrator.queued_orders
+        batch.cancel()
+        try:
+            await batch
+        except asyncio.CancelledError:
+            pass
+        # Give the cancelled workers a turn to finish
+        await asyncio.sleep(0)
+        return queued
+
+    queued = asyncio.run(scenario())
+    assert queued > 0
+    assert orchestrator.queued_orders == 0
+    assert proxy.active == 0
@@ -0,0 +1,100 @@
+import asyncio
+
+from agents.order_agent import OrderAgent
+from agents.registry import AgentRegistry
+
+class StubPeer:
+    """Answers pipeline messages by type, optionally after a delay or waiting on an event."""
+
+    def __init__(self, name, replies, gates=None, delays=None):
+        self.name = name
+        self.in_flight = 0
+        self.replies = replies
+        self.gates = gates or {}
+        self.delays = delays or {}
+        self.messages = []
+
+    async def process_message(self, message):
+        kind = message.get("type", "log")
+        self.messages.append(kind)
+        if kind in self.gates:
+            await self.gates[kind].wait()
+        await asyncio.sleep(self.delays.get(kind, 0))
+        reply = self.replies.get(kind, {"status": "ok"})
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+def make_pipeline(menu_gates=None, menu_replies=None, web_replies=None, delays=None, stage_limits=None):
+    delays = delays or {}
+    menu = StubPeer("MenuUnderstandingAgent", {"parse_intent": {"parsed_items": ["Big Mac"]}, **(menu_replies or {})},
+                    menu_gates, delays)
+    web = StubPeer("WebAutomationAgent", {
+        "prepare_session": {"status": "session_ready", "session_id": "session_1"},
+        "place_order": {"status": "ready_for_checkout", "cart_id": "cart_1"},
+        **(web_replies or {})
+    }, delays=delays)
+    checkout = StubPeer("CheckoutAgent", {"complete_checkout": {"status": "checkout_completed", "order_id": "order_1"}})
+    registry = AgentRegistry()
+    registry.register("order_agent", lambda: OrderAgent(stage_limits))
+    registry.register("menu_understanding", lambda: menu)
+    registry.register("web_automation", lambda: web)
+    registry.register("checkout", lambda: checkout)
+    registry.register("logger", lambda: StubPeer("LoggerAgent", {}))
+    return registry.get("order_agent"), menu, web
+
+def test_browser_slot_is_free_while_parsing():
+    parsed = asyncio.Event()
+    agent, _, web = make_pipeline(menu_gates={"parse_intent": parsed}, stage_limits={"parse": 8, "browser": 1, "checkout": 4})
+
+    async def scenario():
+        order = asyncio.create_task(agent.process_message({"user_input": "a Big Mac"}))
+        while "prepare_session" not in web.messages:
+            await asyncio.sleep(0)
+        await asyncio.sleep(0.01)
+        # Navigation is done and parsing is still running: the only browser slot is free
+        browser = agent.stages.get_stats()["browser"]
+        parsed.set()
+        return browser, await order
+
+    browser, result = asyncio.run(scenario())
+    assert (browser["active"], browser["completed"]) == (0, 1)
+    assert result["status"] == "order_completed"
+    assert web.messages == ["prepare_session", "place_order"]
+
+def test_navigation_overlaps_parsing():
+    agent, _, _ = make_pipeline(delays={"parse_intent": 0.1, "prepare_session": 0.1})
+    result = asyncio.run(agent.process_message({"user_input": "a Big Mac"}))
+
+    timings = result["timings"]
+    assert timings["parse_navigate_overlap"] > 0
+    # Run one after the other, add-to-cart would wait for the sum of both
+    assert timings["critical_path_to_cart"] < timings["parse_time"] + timings["navigate_time"]
+    assert timings["total_time"] >= timings["critical_path_to_cart"]
+
+def test_failed_parse_releases_the_prepared_session():
+    agent, _, web = make_pipeline(menu_replies={"parse_intent": RuntimeError("LLM quota exceeded")})
+    result = asyncio.run(agent.process_message({"user_input": "a Big Mac"}))
+
+    assert result["status"] == "error"
+    assert web.messages == ["prepare_session", "release_session"]
+
+def test_cancelled_order_releases_the_prepared_session():
+    parsed = asyncio.Event()
+    agent, _, web = make_pipeline(menu_gates={"parse_intent": parsed})
+
+    async def scenario():
+        order = asyncio.create_task(agent.process_message({"user_input": "a Big Mac"}))
+        while "prepare_session" not in web.messages:
+            await asyncio.sleep(0)
+        await asyncio.sleep(0.01)
+        order.cancel()
+        try:
+            await order
+        except asyncio.CancelledError:
+            return True
+        return False
+
+    assert asyncio.run(scenario())
+    assert web.messages == ["prepare_session", "release_session"]
+    assert agent.stages.get_stats()["parse"]["failed"] == 1
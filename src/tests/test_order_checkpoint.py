@@ -0,0 +1,70 @@
+import os
+import time
+
+import pytest
+
+pytest.importorskip("cryptography")
+from cryptography.fernet import Fernet
+
+from agents.order_checkpoint import ORDER_STEPS, CheckpointStore, OrderCheckpoint
+
+@pytest.fixture
+def key():
+    return Fernet.generate_key()
+
+def checkpoint(**kwargs):
+    return OrderCheckpoint(run_id="bot_job_1_ab12", **kwargs)
+
+def test_round_trip_is_encrypted(tmp_path, key):
+    store = CheckpointStore(str(tmp_path), key=key)
+    store.save(checkpoint(
+        completed=ORDER_STEPS[:3], url="https://www.ubereats.com/store/mcd", cookies=[{"name": "sid", "value": "secret"}],
+        cart_items=["Big Mac"], step_durations={"navigate_to_ubereats": 2.0, "set_delivery_address": 3.5}
+    ))
+
+    raw = (tmp_path / "bot_job_1_ab12.checkpoint").read_bytes()
+    assert b"secret" not in raw and b"ubereats" not in raw
+    loaded = store.load("bot_job_1_ab12")
+    assert loaded.last_step == "search_mcdonalds"
+    assert loaded.cart_items == ["Big Mac"]
+    assert loaded.time_invested == 5.5
+
+def test_missing_and_old_checkpoints_load_as_none(tmp_path, key):
+    store = CheckpointStore(str(tmp_path), key=key, max_age=60)
+    assert store.load("bot_job_9") is None
+
+    store.save(checkpoint())
+    store.max_age = 0.0
+    time.sleep(0.01)
+    assert store.load("bot_job_1_ab12") is None
+    assert os.listdir(tmp_path) == []
+
+def test_unreadable_checkpoints_are_deleted(tmp_path, key):
+    CheckpointStore(str(tmp_path), key=key).save(checkpoint())
+    (tmp_path / "other.checkpoint").write_bytes(b"plain json from an older version")
+
+    store = CheckpointStore(str(tmp_path), key=Fernet.generate_key())
+    assert store.load("bot_job_1_ab12") is None
+    assert store.load("other") is None
+    assert os.listdir(tmp_path) == []
+
+def test_prune_removes_abandoned_checkpoints(tmp_path, key):
+    store = CheckpointStore(str(tmp_path), key=key)
+    store.save(checkpoint())
+    old = time.time() - 3600
+    os.utime(tmp_path / "bot_job_1_ab12.checkpoint", (old, old))
+
+    CheckpointStore(str(tmp_path), key=key, max_age=1800)
+    assert os.listdir(tmp_path) == []
+
+def test_resume_stats(tmp_path, key):
+    store = CheckpointStore(str(tmp_path), key=key)
+    saved = store.record_resume(checkpoint(completed=ORDER_STEPS[:2], step_durations={"a": 4.0, "b": 6.0}), restore_time=1.5)
+    store.save(checkpoint())
+    store.record_stale("bot_job_1_ab12")
+
+    stats = store.get_stats()
+    assert saved == 8.5
+    assert (stats["resumes"], stats["steps_skipped"], stats["stale"]) == (1, 2, 1)
+    assert stats["avg_time_saved"] == 8.5
+    assert store.load("bot_job_1_ab12") is None
@@ -0,0 +1,89 @@
+import time
+
+import pytest
+
+pytest.importorskip("selenium")
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+from agents.page_waits import NETWORK_PROBE_SCRIPT, PageWaiter, StepTimer
+
+class FakeDriver:
+    """Answers the waiter's scripts from a scripted page state."""
+
+    def __init__(self, ready_states=("complete",), network=((5, 0),)):
+        self.ready_states = list(ready_states)
+        self.network = list(network)
+        self.calls = 0
+
+    def execute_script(self, script, *args):
+        self.calls += 1
+        if script == "return document.readyState":
+            return self.ready_states.pop(0) if len(self.ready_states) > 1 else self.ready_states[0]
+        if script == NETWORK_PROBE_SCRIPT:
+            return list(self.network.pop(0) if len(self.network) > 1 else self.network[0])
+        raise AssertionError(f"Unexpected script: {script}")
+
+def fast_waiter(driver, **kwargs):
+    return PageWaiter(driver, timeout=1.0, initial_interval=0.001, max_interval=0.01, **kwargs)
+
+def test_until_returns_the_first_truthy_value():
+    results = iter([None, WebDriverException("stale"), 0, "found"])
+
+    def condition(driver):
+        value = next(results)
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+    assert fast_waiter(FakeDriver()).until(condition) == "found"
+
+def test_until_raises_and_poll_returns_none_on_timeout():
+    waiter = fast_waiter(FakeDriver())
+    with pytest.raises(TimeoutException):
+        waiter.until(lambda d: False, timeout=0.02)
+    assert waiter.poll(lambda d: False, timeout=0.02) is None
+
+def test_document_ready_honours_ready_states():
+    driver = FakeDriver(ready_states=["loading", "interactive"])
+    with pytest.raises(TimeoutException):
+        fast_waiter(driver).document_ready(timeout=0.02)
+
+    driver = FakeDriver(ready_states=["loading", "interactive"])
+    assert fast_waiter(driver, ready_states=("interactive", "complete")).document_ready()
+
+def test_network_idle_waits_for_quiet_network():
+    driver = FakeDriver(network=[(3, 2), (5, 1), (6, 0)])
+    started = time.monotonic()
+    assert fast_waiter(driver).network_idle(idle_time=0.02)
+    assert time.monotonic() - started >= 0.02
+
+def test_settle_never_exceeds_its_timeout():
+    # A page that keeps requesting resources never goes idle
+    counter = iter(range(10_000))
+    driver = FakeDriver()
+    driver.execute_script = lambda script, *args: "complete" if "readyState" in script else [next(counter), 0]
+
+    started = time.monotonic()
+    fast_waiter(driver).settle(timeout=0.1)
+    assert time.monotonic() - started < 0.3
+
+def test_settle_scale_stretches_the_bound():
+    counter = iter(range(10_000))
+    driver = FakeDriver()
+    driver.execute_script = lambda script, *args: "complete" if "readyState" in script else [next(counter), 0]
+
+    started = time.monotonic()
+    fast_waiter(driver, settle_scale=3.0).settle(timeout=0.05)
+    assert 0.15 <= time.monotonic() - started < 0.4
+
+def test_step_timer_records_failures():
+    timer = StepTimer()
+    with timer.step("open"):
+        pass
+    with pytest.raises(ValueError):
+        with timer.step("click"):
+            raise ValueError("missing button")
+
+    report = timer.report()
+    assert [(s["step"], s["ok"]) for s in report["steps"]] == [("open", True), ("click", False)]
+    assert report["total_duration"] >= 0
@@ -0,0 +1,66 @@
+"""Fixture benchmark: polled page waits against the fixed sleeps they replaced.
+
+Loads the local fixture menu page in Chrome and scrolls through it as the
+bot does, once with the old ``time.sleep`` calls (3s after navigation, 1s
+per scroll step) and once with PageWaiter. Also checks, on a page that is
+never idle, that ``settle`` gives up at its bound and that ``settle_scale``
+stretches it. Needs Chrome and chromedriver; skipped otherwise. Run with
+``pytest -s`` to see the table.
+"""
+import time
+
+import pytest
+
+pytest.importorskip("selenium")
+
+from agents.browser_profile import BrowserProfile
+from agents.page_waits import PageWaiter
+
+SCROLL_POSITIONS = range(0, 3000, 500)
+
+def sleeps(driver, url):
+    driver.get(url)
+    time.sleep(3)
+    for position in SCROLL_POSITIONS:
+        driver.execute_script(f"window.scrollTo(0, {position});")
+        time.sleep(1)
+
+def polled(driver, url, profile):
+    waiter = PageWaiter(driver, ready_states=profile.ready_states())
+    driver.get(url)
+    waiter.settle()
+    for position in SCROLL_POSITIONS:
+        waiter.scroll_to(position)
+
+def timed(scan, *args):
+    started = time.monotonic()
+    scan(*args)
+    return time.monotonic() - started
+
+def test_polled_waits_beat_fixed_sleeps(fixture_site, start_chrome):
+    profile = BrowserProfile(user_data_dir=None)
+    driver = start_chrome(profile)
+    url = f"{fixture_site}/menu.html"
+
+    results = {"sleeps": timed(sleeps, driver, url), "polled": timed(polled, driver, url, profile)}
+    print()
+    for name, elapsed in results.items():
+        print(f"{name:>7}: {elapsed:.2f}s to load and scroll the menu")
+    print(f"speedup: {results['sleeps'] / results['polled']:.1f}x")
+
+    assert results["polled"] < results["sleeps"] / 2
+
+def test_settle_on_a_busy_page_is_bounded_and_scalable(fixture_site, start_chrome):
+    profile = BrowserProfile(user_data_dir=None)
+    driver = start_chrome(profile)
+    driver.get(f"{fixture_site}/polling.html")
+
+    def settle(scale):
+        waiter = PageWaiter(driver, ready_states=profile.ready_states(), settle_scale=scale)
+        return timed(waiter.settle, 0.5)
+
+    capped, scaled = settle(1.0), settle(2.0)
+    print(f"\nbusy page: settle(0.5) took {capped:.2f}s, {scaled:.2f}s with settle_scale=2")
+
+    assert 0.5 <= capped < 1.0
+    assert 1.0 <= scaled < 1.5
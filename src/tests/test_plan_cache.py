@@ -0,0 +1,163 @@
+import asyncio
+import os
+import threading
+from types import SimpleNamespace
+
+from agents.plan_cache import (
+    PLAN_FORMAT, PlanCache, build_plan, expand_plan, layout_key, observe, record_tool_call, record_tool_calls
+)
+
+STORE = "https://www.ubereats.com/store/mcdonalds"
+
+def text_response(text, error=False):
+    return {"content": [{"type": "text", "text": text}], "isError": error}
+
+def call(tool, args, url=STORE, cart=None, ok=True):
+    observed = {"url": url} if url else {}
+    if cart is not None:
+        observed["cart_count"] = cart
+    return {"tool": tool, "args": args, "ok": ok, "observed": observed}
+
+def recorded_run(items, start_cart=0):
+    calls = [call("navigate", {"url": "https://ubereats.com"}, url="https://www.ubereats.com"),
+             call("type", {"selector": "#search", "text": "McDonald's"}, cart=start_cart)]
+    cart = start_cart
+    for item in items:
+        cart += 1
+        calls += [call("type", {"selector": "#menu-search", "text": item}),
+                  call("click", {"selector": f"button[aria-label='Add {item}']"}, cart=cart)]
+    calls.append(call("click", {"selector": "#checkout"}, url=f"{STORE}/checkout"))
+    return calls
+
+class FakeTool:
+    """Browser tool whose responses report the page and the cart, as the Selenium MCP tools do."""
+
+    def __init__(self, name, browser):
+        self.name = name
+        self.browser = browser
+
+    async def run_async(self, args, tool_context):
+        self.browser["contexts"].append(tool_context)
+        if self.name == "click" and "Add" in args.get("selector", ""):
+            if not any(item in args["selector"] for item in self.browser["sold_out"]):
+                self.browser["cart"] += 1
+        if self.name == "click" and args.get("selector") == "#checkout":
+            self.browser["url"] = f"{STORE}/checkout"
+        elif self.name == "type":
+            self.browser["url"] = STORE
+        return text_response(f"Done. Current page: {self.browser['url']}?ref=1 Cart ({self.browser['cart']})")
+
+def browser_tools(sold_out=()):
+    browser = {"url": "https://www.ubereats.com", "cart": 0, "sold_out": set(sold_out), "contexts": []}
+    return [FakeTool(name, browser) for name in ("navigate", "type", "click")], browser
+
+def test_observe_reads_url_and_cart_count():
+    assert observe(text_response(f"Navigated to {STORE}/?q=1#top. Cart (3 items)")) == {"url": STORE, "cart_count": 3}
+    assert observe(None) == {}
+
+def test_record_tool_call_only_inside_a_recording():
+    tool = SimpleNamespace(name="click")
+    record_tool_call(tool, {"selector": "#a"}, None, text_response("ok"))
+    seen = []
+    with record_tool_calls(on_call=seen.append) as calls:
+        record_tool_call(tool, {"selector": "#a"}, None, text_response("failed", error=True))
+    assert calls == seen
+    assert calls[0]["ok"] is False
+
+def test_build_plan_generalizes_item_steps():
+    plan = build_plan(recorded_run(["Big Mac", "Taro Pie"]), ["Big Mac", "Taro Pie"])
+    assert [step["tool"] for step in plan["prefix"]] == ["navigate", "type"]
+    assert plan["per_item"][1]["args"] == {"selector": "button[aria-label='Add {item}']"}
+    assert plan["per_item"][1]["expect"] == {"url": STORE}
+    assert plan["suffix"][0]["expect"] == {"url": f"{STORE}/checkout"}
+    assert plan["cart_delta"] == 1
+
+    steps = expand_plan(plan, ["McFlurry"])
+    assert steps[3]["args"]["selector"] == "button[aria-label='Add McFlurry']"
+    assert steps[2].get("item_start") and steps[3]["item_end"] == "McFlurry"
+
+def test_build_plan_rejects_runs_that_do_not_generalize():
+    calls = recorded_run(["Big Mac", "Taro Pie"])
+    calls.insert(5, call("scroll", {"y": 800}))
+    assert build_plan(calls, ["Big Mac", "Taro Pie"]) is None
+    assert build_plan(recorded_run(["Big Mac"]), ["McFlurry"]) is None
+
+def test_failed_calls_are_left_out_of_plans():
+    calls = recorded_run(["Big Mac"])
+    calls.insert(2, call("click", {"selector": "#popup"}, ok=False))
+    plan = build_plan(calls, ["Big Mac"])
+    assert "#popup" not in str(plan)
+
+def replay(plan, items, tmp_path, sold_out=()):
+    tools, browser = browser_tools(sold_out)
+    calls = []
+    cache = PlanCache(str(tmp_path / "plans.json"))
+    failed = asyncio.run(cache.replay(plan, tools, items, calls, tool_context_factory=lambda: "ctx"))
+    return failed, calls, browser, cache.get_stats()
+
+def test_replay_checks_postconditions(tmp_path):
+    plan = build_plan(recorded_run(["Big Mac", "Taro Pie"]), ["Big Mac", "Taro Pie"])
+
+    failed, calls, browser, stats = replay(plan, ["McFlurry", "Hash Brown", "Apple Pie"], tmp_path)
+    assert failed is None
+    assert len(calls) == 9 and browser["cart"] == 3
+    assert set(browser["contexts"]) == {"ctx"}
+    assert stats["full_replays"] == 1
+
+    failed, calls, browser, stats = replay(plan, ["McFlurry", "Hash Brown"], tmp_path, sold_out={"Hash Brown"})
+    assert failed["args"] == {"selector": "button[aria-label='Add Hash Brown']"}
+    assert "expected +1" in failed["error"]
+    assert len(calls) == 5
+    assert stats["handoffs"] == 1
+
+def test_replay_stops_on_an_unexpected_page(tmp_path):
+    plan = build_plan(recorded_run(["Big Mac"]), ["Big Mac"])
+    plan["suffix"][0]["expect"] = {"url": f"{STORE}/cart"}
+    failed, _, _, _ = replay(plan, ["Big Mac"], tmp_path)
+    assert failed["tool"] == "click" and "expected page" in failed["error"]
+
+def test_plans_persist_and_expire(tmp_path):
+    path = str(tmp_path / "plans.json")
+    layout = layout_key([SimpleNamespace(name="click"), SimpleNamespace(name="navigate")])
+    cache = PlanCache(path)
+    cache.put("mcdonalds", "order", layout, recorded_run(["Big Mac"]), ["Big Mac"])
+
+    reloaded = PlanCache(path)
+    assert reloaded.get("mcdonalds", "order", layout)["format"] == PLAN_FORMAT
+    assert reloaded.get("mcdonalds", "order", "other-layout") is None
+
+    reloaded._plans[f"mcdonalds:order:{layout}"]["format"] = PLAN_FORMAT - 1
+    assert reloaded.get("mcdonalds", "order", layout) is None
+    assert PlanCache(path).get_stats()["plans"] == 0
+
+def test_unrecordable_runs_are_counted(tmp_path):
+    cache = PlanCache(str(tmp_path / "plans.json"))
+    cache.put("mcdonalds", "order", "layout", [], [])
+    assert cache.get_stats()["unrecordable"] == 1
+
+def test_concurrent_writers_keep_the_cache_consistent(tmp_path):
+    path = str(tmp_path / "plans.json")
+    cache = PlanCache(path)
+    errors = []
+
+    def writer(worker):
+        try:
+            for i in range(20):
+                cache.put("mcdonalds", f"order-{worker}-{i}", "layout", recorded_run(["Big Mac"]), ["Big Mac"])
+                cache.get("mcdonalds", f"order-{worker}-{i}", "layout")
+                if i % 2:
+                    cache.invalidate("mcdonalds", f"order-{worker}-{i}", "layout")
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=writer, args=(worker,)) for worker in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = cache.get_stats()
+    assert errors == []
+    assert (stats["recorded"], stats["lookups"], stats["hits"], stats["plans"]) == (80, 80, 80, 40)
+    assert os.listdir(tmp_path) == ["plans.json"]
+    assert PlanCache(path).get_stats()["plans"] == 40
@@ -0,0 +1,31 @@
+import pytest
+
+from agents.registry import AgentRegistry
+
+class FakeAgent:
+    def __init__(self, name):
+        self.name = name
+
+def test_agents_are_built_once_and_see_the_registry():
+    built = []
+    registry = AgentRegistry()
+    registry.register("order_agent", lambda: built.append(1) or FakeAgent("order"))
+
+    agent = registry.get("order_agent")
+    assert registry.get("order_agent") is agent
+    assert agent.registry is registry
+    assert len(built) == 1
+
+def test_unknown_key_raises():
+    registry = AgentRegistry()
+    with pytest.raises(KeyError):
+        registry.get("missing")
+
+def test_instances_share_one_agent_per_key():
+    registry = AgentRegistry()
+    registry.register("order_agent", lambda: FakeAgent("order"))
+    registry.register("checkout", lambda: FakeAgent("checkout"))
+
+    instances = registry.instances()
+    assert list(instances) == ["order_agent", "checkout"]
+    assert instances["checkout"] is registry.get("checkout")
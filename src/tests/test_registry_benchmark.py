@@ -0,0 +1,105 @@
+"""Benchmark: per-order cost of resolving peers as the order count grows.
+
+Runs ``REGISTRY_BENCHMARK_ORDERS`` orders (default 10,000) through
+OrderAgent with stub peers. ``registry`` resolves peers through one
+AgentRegistry, as the agents do now. ``per_order`` re-registers every peer
+before each order, so each order builds its own menu, web, checkout and
+logger agents, as OrderAgent did before the registry. Reports the mean
+time per order in the first and last thousand orders and how many agents
+the registry holds at the end. Run with ``pytest -s`` to see the table.
+"""
+import asyncio
+import logging
+import os
+import time
+
+from a2a.types import AgentCapabilities, AgentCard, AgentSkill
+from agents.base_agent import BaseA2AAgent
+from agents.order_agent import OrderAgent
+from agents.registry import AgentRegistry
+
+ORDERS = int(os.environ.get("REGISTRY_BENCHMARK_ORDERS", "10000"))
+WINDOW = min(1000, ORDERS // 4)
+
+REPLIES = {
+    "parse_intent": {"status": "parsed", "parsed_items": ["Big Mac"]},
+    "prepare_session": {"status": "session_ready", "session_id": "session_1"},
+    "place_order": {"status": "ready_for_checkout", "cart_id": "cart_1"},
+    "complete_checkout": {"status": "checkout_completed", "order_id": "order_1"}
+}
+
+class StubAgent(BaseA2AAgent):
+    def __init__(self, name):
+        super().__init__(name, f"Stub {name}", 9100)
+
+    def _create_agent_card(self) -> AgentCard:
+        return AgentCard(
+            name=self.name,
+            description=self.description,
+            url=f"http://localhost:{self.port}/",
+            version="1.0.0",
+            defaultInputModes=["json"],
+            defaultOutputModes=["json"],
+            capabilities=AgentCapabilities(streaming=False),
+            skills=[AgentSkill(id=self.name.lower(), name=self.name, description="", tags=[], examples=[])]
+        )
+
+    async def process_message(self, message):
+        return REPLIES.get(message.get("type"), {"status": "logged"})
+
+PEERS = {
+    "menu_understanding": "MenuUnderstandingAgent",
+    "web_automation": "WebAutomationAgent",
+    "checkout": "CheckoutAgent",
+    "logger": "LoggerAgent"
+}
+
+def register_peers(registry):
+    for key, name in PEERS.items():
+        registry.register(key, lambda name=name: StubAgent(name))
+
+async def run_orders(rebuild_peers: bool):
+    registry = AgentRegistry()
+    registry.register("order_agent", OrderAgent)
+    register_peers(registry)
+    order_agent = registry.get("order_agent")
+
+    durations = []
+    for i in range(ORDERS):
+        if rebuild_peers:
+            register_peers(registry)
+        started = time.perf_counter()
+        result = await order_agent.process_message({"user_input": f"order {i}"})
+        durations.append(time.perf_counter() - started)
+        assert result["status"] == "order_completed"
+    return registry, durations
+
+def measure(rebuild_peers: bool):
+    # Per-order info logs would dominate the timings
+    logging.disable(logging.INFO)
+    try:
+        registry, durations = asyncio.run(run_orders(rebuild_peers))
+    finally:
+        logging.disable(logging.NOTSET)
+    return {
+        "first": sum(durations[:WINDOW]) / WINDOW,
+        "last": sum(durations[-WINDOW:]) / WINDOW,
+        "instances": sum(len(registry.replicas(key)) for key in registry.keys()),
+        "handlers": len(logging.getLogger("MenuUnderstandingAgent").handlers)
+    }
+
+def test_registry_overhead_stays_flat():
+    results = {"registry": measure(rebuild_peers=False), "per_order": measure(rebuild_peers=True)}
+
+    print()
+    for name, result in results.items():
+        print(f"{name:>9}: first {WINDOW:,} orders {result['first'] * 1e6:7.1f}us/order  "
+              f"last {WINDOW:,} {result['last'] * 1e6:7.1f}us/order  "
+              f"{result['instances']} agents held  ({ORDERS:,} orders)")
+
+    registry = results["registry"]
+    assert registry["instances"] == 1 + len(PEERS)
+    # The logger handler is attached once per agent name, however many agents are built
+    assert results["per_order"]["handlers"] == registry["handlers"] == 1
+    # Generous bound: timer noise, not growth, is what varies between windows
+    assert registry["last"] < registry["first"] * 2
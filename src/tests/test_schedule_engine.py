@@ -0,0 +1,136 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from agents.job_store import JobStore
+from agents.schedule_engine import CronExpression, ScheduleEngine
+
+CHICAGO = ZoneInfo("America/Chicago")
+
+class FakeClock:
+    """Jumps forward by the requested delay instead of sleeping."""
+
+    def __init__(self, start: datetime):
+        self.current = start
+
+    def now(self) -> datetime:
+        return self.current
+
+    async def sleep(self, seconds: float):
+        self.current += timedelta(seconds=seconds)
+        await asyncio.sleep(0)
+
+async def run_until_stopped(engine, timeout=1.0):
+    # stop() cancels the loop task, as it does for the scheduler agent
+    runner = asyncio.create_task(engine.run())
+    await asyncio.wait({runner}, timeout=timeout)
+    assert runner.done()
+
+@pytest.mark.parametrize("expression, after, expected", [
+    ("0 12 * * 3", datetime(2026, 10, 14, 12, 0), datetime(2026, 10, 21, 12, 0)),
+    ("0 12 * * 3", datetime(2026, 10, 13, 9, 30), datetime(2026, 10, 14, 12, 0)),
+    ("*/15 9-17 * * 1-5", datetime(2026, 10, 16, 17, 50), datetime(2026, 10, 19, 9, 0)),
+    ("0-30/10 * * * *", datetime(2026, 10, 16, 8, 30), datetime(2026, 10, 16, 9, 0)),
+    ("0 0 29 2 *", datetime(2026, 3, 1), datetime(2028, 2, 29, 0, 0)),
+    ("0 8 1,15 * *", datetime(2026, 10, 1, 8, 0), datetime(2026, 10, 15, 8, 0)),
+    ("0 12 * * 7", datetime(2026, 10, 16, 0, 0), datetime(2026, 10, 18, 12, 0)),
+])
+def test_next_after(expression, after, expected):
+    assert CronExpression(expression).next_after(after) == expected
+
+def test_restricted_day_fields_match_either():
+    # The 13th of the month or any Friday
+    cron = CronExpression("0 9 13 * 5")
+    assert cron.next_after(datetime(2026, 10, 10, 10, 0)) == datetime(2026, 10, 13, 9, 0)
+    assert cron.next_after(datetime(2026, 10, 13, 10, 0)) == datetime(2026, 10, 16, 9, 0)
+
+@pytest.mark.parametrize("expression", ["0 12 * *", "60 * * * *", "* * 0 * *", "*/0 * * * *", "5-1 * * * *", "0 0 31 2 *"])
+def test_invalid_expressions_raise(expression):
+    with pytest.raises(ValueError):
+        CronExpression(expression).next_after(datetime(2026, 1, 1))
+
+def test_wall_clock_survives_dst():
+    cron = CronExpression("0 12 * * 3")
+    before = datetime(2026, 10, 28, 13, 0, tzinfo=CHICAGO)
+    after_change = cron.next_after(before)
+    assert after_change == datetime(2026, 11, 4, 12, 0, tzinfo=CHICAGO)
+    assert after_change.utcoffset() != before.utcoffset()
+
+def test_engine_fires_due_jobs_in_order():
+    async def scenario():
+        clock = FakeClock(datetime(2026, 10, 14, 16, 0, tzinfo=timezone.utc))
+        engine = ScheduleEngine(clock)
+        fired = []
+
+        async def callback(job):
+            fired.append((job.job_id, clock.now()))
+            if len(fired) == 3:
+                await engine.stop()
+
+        engine.add_job("hourly", "0 * * * *", callback, "UTC")
+        engine.add_job("noon_chicago", "0 12 * * *", callback, "America/Chicago")
+        await run_until_stopped(engine)
+        return fired
+
+    fired = asyncio.run(scenario())
+    assert [job_id for job_id, _ in fired] == ["hourly", "noon_chicago", "hourly"]
+    assert fired[1][1] == datetime(2026, 10, 14, 17, 0, tzinfo=timezone.utc)
+
+def test_adding_an_earlier_job_wakes_the_loop():
+    async def scenario():
+        clock = FakeClock(datetime(2026, 10, 14, 16, 0, tzinfo=timezone.utc))
+        engine = ScheduleEngine(clock)
+        fired = []
+
+        async def callback(job):
+            fired.append(job.job_id)
+            await engine.stop()
+
+        # The loop sleeps on an event; the clock only advances when the delay elapses
+        clock.sleep = lambda seconds: asyncio.sleep(3600)
+        engine.add_job("weekly", "0 12 * * 3", callback, "UTC")
+        runner = asyncio.create_task(engine.run())
+        await asyncio.sleep(0.01)
+
+        clock.current = datetime(2026, 10, 14, 16, 59, 59, tzinfo=timezone.utc)
+        engine.add_job("soon", "0 17 * * *", callback, "UTC")
+        clock.current += timedelta(seconds=1)
+        await asyncio.wait({runner}, timeout=1)
+        return fired
+
+    assert asyncio.run(scenario()) == ["soon"]
+
+def test_missed_runs_outside_the_catch_up_window_are_skipped(tmp_path):
+    async def scenario():
+        store = JobStore(str(tmp_path / "scheduler.db"))
+        clock = FakeClock(datetime(2026, 10, 14, 20, 0, tzinfo=timezone.utc))
+        engine = ScheduleEngine(clock, store, catch_up_window=timedelta(hours=2))
+        fired = []
+
+        async def callback(job):
+            fired.append(job.job_id)
+
+        engine.add_job("late", "0 12 * * *", callback, "UTC", next_run=datetime(2026, 10, 14, 12, 0, tzinfo=timezone.utc))
+        engine.add_job("recent", "0 19 * * *", callback, "UTC", next_run=datetime(2026, 10, 14, 19, 0, tzinfo=timezone.utc))
+        await engine._fire_due(clock.now())
+        await asyncio.gather(*engine._tasks)
+        return fired, await engine.store_call(store.recent_runs, "late"), await engine.store_call(store.recent_runs, "recent")
+
+    fired, late_runs, recent_runs = asyncio.run(scenario())
+    assert fired == ["recent"]
+    assert [run["status"] for run in late_runs] == ["missed"]
+    assert [run["status"] for run in recent_runs] == ["succeeded"]
+
+def test_stop_waits_for_the_loop():
+    async def scenario():
+        engine = ScheduleEngine(FakeClock(datetime(2026, 10, 14, tzinfo=timezone.utc)))
+        runner = asyncio.create_task(engine.run())
+        await asyncio.sleep(0.01)
+        with pytest.raises(RuntimeError):
+            await engine.run()
+        await engine.stop()
+        return runner.done()
+
+    assert asyncio.run(scenario())
@@ -0,0 +1,78 @@
+import json
+import threading
+
+from agents.selector_cache import SelectorCache, to_locator, xpath_literal
+
+SELECTORS = ["button[data-testid='checkout']", "div.cart button:contains('Checkout')", "//button[text()='Go']"]
+
+class FakeWaiter:
+    """Resolves the locator at ``winner`` on the first poll, or nothing."""
+
+    def __init__(self, winner=None):
+        self.winner = winner
+        self.locators = None
+
+    def poll(self, condition, timeout):
+        return condition(self)
+
+    def execute_script(self, script, locators):
+        self.locators = locators
+        for index, locator in enumerate(locators):
+            if locator[1] == self.winner:
+                return [index, f"element:{self.winner}"]
+        return None
+
+def test_to_locator():
+    assert to_locator("//button") == ("xpath", "//button")
+    assert to_locator("div.cart button:contains('Check \\'out')") == ("text", "div.cart button", "Check 'out")
+    assert to_locator("button.add") == ("css", "button.add")
+
+def test_xpath_literal_quotes():
+    assert xpath_literal("Big Mac") == "'Big Mac'"
+    assert xpath_literal("McDonald's") == '"McDonald\'s"'
+    assert xpath_literal("a'b\"c") == "concat('a', \"'\", 'b\"c')"
+
+def test_last_winner_is_tried_first(tmp_path):
+    cache = SelectorCache(str(tmp_path / "selectors.json"))
+    waiter = FakeWaiter("div.cart button")
+
+    assert cache.resolve(waiter, "checkout", SELECTORS) == "element:div.cart button"
+    assert waiter.locators[0][0] == "css"
+    assert cache.order("checkout", SELECTORS)[0] == SELECTORS[1]
+
+    cache.resolve(waiter, "checkout", SELECTORS)
+    stats = cache.get_stats()["checkout"]
+    assert (stats["hits"], stats["misses"], stats["lookups"]) == (1, 1, 2)
+
+def test_not_found_is_counted(tmp_path):
+    cache = SelectorCache(str(tmp_path / "selectors.json"))
+    assert cache.resolve(FakeWaiter(), "checkout", SELECTORS) is None
+    assert cache.get_stats()["checkout"]["not_found"] == 1
+
+def test_writes_are_batched_until_flush(tmp_path):
+    path = tmp_path / "selectors.json"
+    cache = SelectorCache(str(path), save_interval=3600)
+    cache.record("checkout", SELECTORS[2])
+    assert not path.exists()
+
+    cache.flush()
+    assert json.loads(path.read_text())["checkout"]["last"] == SELECTORS[2]
+    assert SelectorCache(str(path)).order("checkout", SELECTORS)[0] == SELECTORS[2]
+
+def test_concurrent_resolves_keep_consistent_stats(tmp_path):
+    cache = SelectorCache(str(tmp_path / "selectors.json"), save_interval=0.0)
+
+    def lookups():
+        waiter = FakeWaiter("button[data-testid='checkout']")
+        for _ in range(200):
+            cache.resolve(waiter, "checkout", SELECTORS)
+
+    threads = [threading.Thread(target=lookups) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = cache.get_stats()["checkout"]
+    assert stats["lookups"] == stats["hits"] + stats["misses"] == 1600
+    assert cache.entries["checkout"]["hits"][SELECTORS[0]] == 1600
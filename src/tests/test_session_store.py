@@ -0,0 +1,83 @@
+import os
+import stat
+import time
+
+import pytest
+
+pytest.importorskip("cryptography")
+from cryptography.fernet import Fernet
+
+from agents.session_store import KEY_ENV, SessionSnapshot, SessionStore, load_fernet
+
+@pytest.fixture
+def key():
+    return Fernet.generate_key()
+
+def snapshot(**kwargs):
+    return SessionSnapshot(user_id="alice", address="1 Main St", **kwargs)
+
+def test_round_trip_is_encrypted(tmp_path, key):
+    store = SessionStore(str(tmp_path), key=key)
+    store.save(snapshot(cookies=[{"name": "sid", "value": "secret-session"}], local_storage={"locale": "en"}))
+
+    raw = (tmp_path / "alice.session").read_bytes()
+    assert b"secret-session" not in raw
+    loaded = store.load("alice")
+    assert loaded.cookies == [{"name": "sid", "value": "secret-session"}]
+    assert loaded.local_storage == {"locale": "en"}
+    assert store.get_stats()["saved"] == 1
+
+def test_cart_state_is_never_saved(tmp_path, key):
+    store = SessionStore(str(tmp_path), key=key)
+    store.save(snapshot(
+        cookies=[{"name": "sid", "value": "1"}, {"name": "uev2.cart_id", "value": "2"}, {"name": "Basket", "value": "3"}],
+        local_storage={"locale": "en", "persistedCheckout": "{}", "cartItems": "[]"}
+    ))
+    loaded = store.load("alice")
+    assert [cookie["name"] for cookie in loaded.cookies] == ["sid"]
+    assert loaded.local_storage == {"locale": "en"}
+
+def test_expired_and_stale_snapshots_are_discarded(tmp_path, key):
+    store = SessionStore(str(tmp_path), key=key, ttl=0.01)
+    store.save(snapshot())
+    time.sleep(0.02)
+    assert store.load("alice") is None
+
+    store.ttl = 60
+    store.save(snapshot())
+    store.invalidate("alice")
+    assert store.load("alice") is None
+    stats = store.get_stats()
+    assert (stats["expired"], stats["stale"], stats["misses"]) == (1, 1, 1)
+
+def test_snapshot_under_another_key_is_dropped(tmp_path, key):
+    SessionStore(str(tmp_path), key=key).save(snapshot())
+    store = SessionStore(str(tmp_path), key=Fernet.generate_key())
+    assert store.load("alice") is None
+    assert not (tmp_path / "alice.session").exists()
+    assert store.get_stats()["unreadable"] == 1
+
+def test_live_cookies_skip_expired_ones():
+    now = time.time()
+    session = snapshot(cookies=[{"name": "a", "expiry": now - 1}, {"name": "b", "expiry": now + 60}, {"name": "c"}])
+    assert [cookie["name"] for cookie in session.live_cookies()] == ["b", "c"]
+
+def test_user_ids_cannot_escape_the_directory(tmp_path, key):
+    store = SessionStore(str(tmp_path / "sessions"), key=key)
+    store.save(SessionSnapshot(user_id="../alice", address=""))
+    assert os.listdir(tmp_path) == ["sessions"]
+
+def test_key_file_is_created_private_and_reused(tmp_path, monkeypatch):
+    monkeypatch.delenv(KEY_ENV, raising=False)
+    key_path = tmp_path / "config" / "state.key"
+    first = load_fernet(key_path=str(key_path))
+    token = first.encrypt(b"cookie")
+
+    assert stat.S_IMODE(key_path.stat().st_mode) == 0o600
+    assert load_fernet(key_path=str(key_path)).decrypt(token) == b"cookie"
+
+def test_environment_key_wins(tmp_path, monkeypatch, key):
+    monkeypatch.setenv(KEY_ENV, key.decode())
+    token = Fernet(key).encrypt(b"cookie")
+    assert load_fernet(key_path=str(tmp_path / "unused.key")).decrypt(token) == b"cookie"
+    assert not (tmp_path / "unused.key").exists()
@@ -0,0 +1,83 @@
+"""Replica balancing and skill lookup in the registry."""
+import pytest
+
+from a2a.types import AgentCapabilities, AgentCard, AgentSkill
+from agents.registry import AgentRegistry
+
+def make_card(name, skills):
+    return AgentCard(
+        name=name,
+        description=name,
+        url=f"http://localhost:9999/{name}/",
+        version="1.0.0",
+        defaultInputModes=["json"],
+        defaultOutputModes=["json"],
+        capabilities=AgentCapabilities(streaming=False),
+        skills=[AgentSkill(id=skill_id, name=skill_id, description="", tags=tags, examples=[])
+                for skill_id, tags in skills]
+    )
+
+class FakeAgent:
+    def __init__(self, name, skills=()):
+        self.name = name
+        self.in_flight = 0
+        self.agent_card = make_card(name, skills)
+
+def test_replicas_need_a_registered_agent():
+    with pytest.raises(KeyError):
+        AgentRegistry().add_replica("missing", lambda: FakeAgent("x"))
+
+def test_get_prefers_the_least_loaded_replica():
+    registry = AgentRegistry()
+    registry.register("web", lambda: FakeAgent("web-1"))
+    registry.add_replica("web", lambda: FakeAgent("web-2"))
+    first, second = registry.replicas("web")
+
+    first.in_flight = 3
+    assert registry.get("web") is second
+    second.in_flight = 5
+    assert registry.get("web") is first
+
+def test_equally_loaded_replicas_rotate():
+    registry = AgentRegistry()
+    registry.register("web", lambda: FakeAgent("web-1"))
+    registry.add_replica("web", lambda: FakeAgent("web-2"))
+
+    picked = {registry.get("web").name for _ in range(4)}
+    assert picked == {"web-1", "web-2"}
+
+def test_find_by_skill_id_and_tag():
+    registry = AgentRegistry()
+    registry.register("checkout", lambda: FakeAgent("checkout", [("payment", ["pay", "checkout"])]))
+    registry.register("order_agent", lambda: FakeAgent("order", [("orders", ["order", "pay"])]))
+
+    assert registry.find_by_skill("payment").name == "checkout"
+    assert registry.find_by_skill("checkout").name == "checkout"
+    with pytest.raises(KeyError):
+        registry.find_by_skill("dance")
+
+def test_tag_shared_by_several_agents_is_ambiguous():
+    registry = AgentRegistry()
+    registry.register("checkout", lambda: FakeAgent("checkout", [("payment", ["pay"])]))
+    registry.register("order_agent", lambda: FakeAgent("order", [("orders", ["pay"])]))
+
+    with pytest.raises(ValueError):
+        registry.find_by_skill("pay")
+
+def test_register_resets_the_skill_index():
+    registry = AgentRegistry()
+    registry.register("checkout", lambda: FakeAgent("checkout", [("payment", [])]))
+    assert registry.find_by_skill("payment").name == "checkout"
+
+    registry.register("checkout", lambda: FakeAgent("checkout", [("refunds", [])]))
+    with pytest.raises(KeyError):
+        registry.find_by_skill("payment")
+
+def test_describe_lists_replica_load():
+    registry = AgentRegistry()
+    registry.register("web", lambda: FakeAgent("web-1"))
+    registry.add_replica("web", lambda: FakeAgent("web-2"))
+    registry.replicas("web")[1].in_flight = 2
+
+    replicas = registry.describe()["web"]["replicas"]
+    assert [replica["in_flight"] for replica in replicas] == [0, 2]
@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+
+from agents.stage_limiter import StageLimiter
+
+def test_each_stage_caps_its_own_concurrency():
+    async def scenario():
+        limiter = StageLimiter({"browser": 2, "parse": 4})
+        peak = {"browser": 0, "parse": 0}
+        active = {"browser": 0, "parse": 0}
+
+        async def work(stage):
+            async with limiter.stage(stage):
+                active[stage] += 1
+                peak[stage] = max(peak[stage], active[stage])
+                await asyncio.sleep(0.01)
+                active[stage] -= 1
+
+        await asyncio.gather(*(work("browser") for _ in range(6)), *(work("parse") for _ in range(6)))
+        return limiter, peak
+
+    limiter, peak = asyncio.run(scenario())
+    assert peak == {"browser": 2, "parse": 4}
+    stats = limiter.get_stats()
+    assert stats["browser"]["completed"] == 6
+    assert stats["browser"]["max_waiting"] >= 4
+    assert stats["browser"]["queue_depth"] == 0
+    assert stats["browser"]["avg_wait_time"] > stats["parse"]["avg_wait_time"]
+
+def test_failures_are_counted_and_release_the_slot():
+    async def scenario():
+        limiter = StageLimiter({"checkout": 1})
+        with pytest.raises(RuntimeError):
+            async with limiter.stage("checkout"):
+                raise RuntimeError("card declined")
+        async with limiter.stage("checkout"):
+            pass
+        return limiter.get_stats()["checkout"]
+
+    stats = asyncio.run(scenario())
+    assert (stats["failed"], stats["completed"], stats["active"]) == (1, 1, 0)
+
+def test_cancelled_waiter_leaves_the_queue():
+    async def scenario():
+        limiter = StageLimiter({"browser": 1})
+        async with limiter.stage("browser"):
+            async def waiter():
+                async with limiter.stage("browser"):
+                    pass
+
+            task = asyncio.create_task(waiter())
+            await asyncio.sleep(0.01)
+            assert limiter.stats["browser"]["waiting"] == 1
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        return limiter.stats["browser"]
+
+    stats = asyncio.run(scenario())
+    assert (stats["waiting"], stats["completed"]) == (0, 1)
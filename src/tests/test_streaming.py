@@ -0,0 +1,68 @@
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+from agents.streaming import CART_ITEM_ADDED, CART_READY, emit, stream_call, streaming_active
+
+async def collect(call):
+    return [event async for event in stream_call("OrderAgent", call)]
+
+def test_events_arrive_in_order_and_end_with_the_result():
+    async def call():
+        emit(CART_ITEM_ADDED, "WebAutomationAgent", item="Big Mac")
+        await asyncio.sleep(0)
+        emit(CART_READY, "WebAutomationAgent", items=1)
+        return {"status": "order_completed"}
+
+    events = asyncio.run(collect(call))
+    assert [event.type for event in events] == ["accepted", CART_ITEM_ADDED, CART_READY, "result"]
+    assert events[-1].data == {"status": "order_completed"}
+
+def test_errors_end_the_stream_with_an_error_event():
+    async def call():
+        raise RuntimeError("browser crashed")
+
+    events = asyncio.run(collect(call))
+    assert [event.type for event in events] == ["accepted", "error"]
+    assert events[-1].data == {"message": "browser crashed"}
+
+def test_worker_threads_emit_into_the_callers_stream():
+    def bot():
+        for item in ("Big Mac", "Taro Pie"):
+            emit(CART_ITEM_ADDED, "McDonaldsOrderBot", item=item)
+        return {"status": "cart_ready"}
+
+    async def call():
+        context = contextvars.copy_context()
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            return await asyncio.get_running_loop().run_in_executor(pool, context.run, bot)
+
+    events = asyncio.run(collect(call))
+    assert [event.data.get("item") for event in events if event.type == CART_ITEM_ADDED] == ["Big Mac", "Taro Pie"]
+    assert events[-1].type == "result"
+
+def test_emit_without_a_stream_is_a_no_op():
+    assert not streaming_active()
+    emit(CART_ITEM_ADDED, "WebAutomationAgent", item="Big Mac")
+
+def test_closing_the_stream_cancels_the_call():
+    async def scenario():
+        cancelled = asyncio.Event()
+
+        async def call():
+            emit(CART_ITEM_ADDED, "WebAutomationAgent", item="Big Mac")
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        stream = stream_call("OrderAgent", call)
+        async for event in stream:
+            if event.type == CART_ITEM_ADDED:
+                break
+        await stream.aclose()
+        await asyncio.wait_for(cancelled.wait(), 1)
+        return [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+
+    assert asyncio.run(scenario()) == []
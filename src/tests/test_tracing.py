@@ -0,0 +1,165 @@
+import asyncio
+import contextvars
+import json
+import threading
+
+import pytest
+
+from agents.tracing import (
+    JsonlSpanExporter, Tracer, add_span_listener, current_span, extract, inject, traced_process_message
+)
+
+class MemoryExporter:
+    def __init__(self):
+        self.spans = []
+
+    def export(self, span):
+        self.spans.append(span)
+
+def test_nested_spans_share_a_trace():
+    exporter = MemoryExporter()
+    tracer = Tracer(exporter)
+    with tracer.start_span("order", service="OrderAgent") as root:
+        with tracer.start_span("checkout") as child:
+            assert current_span() is child
+        assert current_span() is root
+    assert current_span() is None
+
+    child_span, root_span = exporter.spans
+    assert child_span.trace_id == root_span.trace_id
+    assert child_span.parent_span_id == root_span.span_id
+    assert child_span.service == "OrderAgent"
+    assert root_span.local_root and not child_span.local_root
+
+def test_errors_mark_the_span():
+    exporter = MemoryExporter()
+    with pytest.raises(ValueError):
+        with Tracer(exporter).start_span("checkout"):
+            raise ValueError("card declined")
+    assert exporter.spans[0].status == "ERROR"
+    assert "card declined" in exporter.spans[0].status_message
+
+def test_traceparent_round_trip():
+    tracer = Tracer(MemoryExporter())
+    assert inject({"content": "hi"}) == {"content": "hi"}
+    with tracer.start_span("send") as span:
+        message = inject({"content": "hi"})
+    context = extract(message)
+    assert (context.trace_id, context.span_id) == (span.trace_id, span.span_id)
+    assert extract({"traceparent": "00-bad-01"}) is None
+
+def test_spans_continue_in_a_copied_context_on_another_thread():
+    exporter = MemoryExporter()
+    tracer = Tracer(exporter)
+
+    def bot_step():
+        with tracer.start_span("browser.add_item"):
+            pass
+
+    with tracer.start_span("order") as root:
+        context = contextvars.copy_context()
+    thread = threading.Thread(target=context.run, args=(bot_step,))
+    thread.start()
+    thread.join()
+
+    assert exporter.spans[-1].trace_id == root.trace_id
+    assert exporter.spans[-1].parent_span_id == root.span_id
+
+def test_traced_process_message_continues_the_remote_trace(monkeypatch):
+    exporter = MemoryExporter()
+    monkeypatch.setattr("agents.tracing._tracer", Tracer(exporter))
+
+    class Agent:
+        name = "CheckoutAgent"
+
+        @traced_process_message
+        async def process_message(self, message):
+            return {"status": "checkout_failed", "message": "no payment method"}
+
+    trace_id, span_id = "a" * 32, "b" * 16
+    asyncio.run(Agent().process_message({"type": "checkout", "traceparent": f"00-{trace_id}-{span_id}-01"}))
+
+    span = exporter.spans[0]
+    assert (span.trace_id, span.parent_span_id, span.kind) == (trace_id, span_id, "server")
+    assert span.attributes["message.type"] == "checkout"
+    assert span.status == "ERROR"
+
+class SpanCollector:
+    def __init__(self):
+        self.spans = []
+
+    def on_span(self, span):
+        self.spans.append(span)
+
+def test_span_listeners_see_successes_and_failures():
+    class Agent:
+        name = "CheckoutAgent"
+
+        @traced_process_message
+        async def process_message(self, message):
+            if message.get("fail"):
+                raise RuntimeError("payment service down")
+            return {"status": "checkout_ready"}
+
+    collector = SpanCollector()
+    add_span_listener(collector)
+    asyncio.run(Agent().process_message({}))
+    with pytest.raises(RuntimeError):
+        asyncio.run(Agent().process_message({"fail": True}))
+
+    assert [span.status for span in collector.spans] == ["UNSET", "ERROR"]
+    assert all(span.end_ns is not None for span in collector.spans)
+
+def test_logger_agent_measures_every_traced_agent(tmp_path):
+    from a2a.types import AgentCapabilities, AgentCard
+    from agents.base_agent import BaseA2AAgent
+    from agents.log_sink import LogSink
+    from agents.logger_agent import LoggerAgent
+
+    class MenuAgent(BaseA2AAgent):
+        def __init__(self):
+            super().__init__("MenuUnderstandingAgent", "Parses orders", 9002)
+
+        def _create_agent_card(self):
+            return AgentCard(name="Menu", description="", url="http://localhost:9002/", version="1.0.0",
+                             defaultInputModes=["json"], defaultOutputModes=["json"],
+                             capabilities=AgentCapabilities(streaming=False), skills=[])
+
+        async def process_message(self, message):
+            await asyncio.sleep(0.01)
+            return {"status": "parsed"}
+
+    async def scenario():
+        logger_agent = LoggerAgent(sink=LogSink(str(tmp_path / "logs")))
+        menu = MenuAgent()
+        for _ in range(3):
+            await menu.process_message({})
+        # Agents that only log, without a traced process_message, have no latency
+        await logger_agent.process_message({"agent": "orchestrator", "message": "started"})
+        analytics = logger_agent.get_analytics()
+        await logger_agent.sink.close()
+        return analytics
+
+    analytics = asyncio.run(scenario())
+    latency = analytics["windows"]["last_hour"]["agent_latency"]["MenuUnderstandingAgent"]
+    assert latency["count"] == 3
+    assert latency["p50"] >= 0.01
+    assert analytics["latency_coverage"] == {"measured": ["MenuUnderstandingAgent"], "unmeasured": ["orchestrator"]}
+
+def test_jsonl_exporter_writes_otlp_batches(tmp_path):
+    path = tmp_path / "spans.jsonl"
+    exporter = JsonlSpanExporter(str(path), batch_size=100)
+    tracer = Tracer(exporter)
+    with tracer.start_span("order", {"items": 2, "rush": True}, service="OrderAgent"):
+        with tracer.start_span("checkout"):
+            pass
+    with tracer.start_span("schedule", service="SchedulerAgent"):
+        pass
+    exporter.flush()
+
+    requests = [json.loads(line) for line in path.read_text().splitlines()]
+    assert len(requests) == 2
+    spans = requests[0]["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert [span["name"] for span in spans] == ["checkout", "order"]
+    assert {"key": "items", "value": {"intValue": "2"}} in spans[1]["attributes"]
+    assert requests[1]["resourceSpans"][0]["resource"]["attributes"][0]["value"]["stringValue"] == "SchedulerAgent"
@@ -0,0 +1,117 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("google.adk")
+
+from agents.plan_cache import PlanCache
+from agents.web_automation_agent import WebAutomationAgent
+
+class FakePool:
+    def __init__(self):
+        self.leased = 0
+        self.released = []
+
+    async def checkout(self):
+        self.leased += 1
+        return SimpleNamespace(tools=[], uses=1, number=self.leased)
+
+    async def release(self, session, failed=False):
+        self.released.append((session.number, failed))
+
+def make_agent(tmp_path, run_browser_task, prepared_ttl=300.0):
+    pool = FakePool()
+    agent = WebAutomationAgent(selenium_pool=pool, plan_cache=PlanCache(str(tmp_path / "plans.json")),
+                               prepared_ttl=prepared_ttl)
+    agent._build_web_agent = lambda tools: object()
+    agent._run_browser_task = run_browser_task
+    return agent, pool
+
+async def browse(session, web_agent, task, restaurant, prompt, items):
+    return f"{task} done"
+
+def test_prepared_session_is_used_by_place_order(tmp_path):
+    agent, pool = make_agent(tmp_path, browse)
+
+    async def scenario():
+        prepared = await agent.process_message({"type": "prepare_session"})
+        placed = await agent.process_message({"type": "place_order", "order_details": ["Big Mac"],
+                                              "session_id": prepared["session_id"]})
+        return prepared, placed
+
+    prepared, placed = asyncio.run(scenario())
+    assert prepared["status"] == "session_ready"
+    assert placed["automation_log"] == "add_items done"
+    assert pool.leased == 1 and pool.released == [(1, False)]
+    assert agent.prepared_sessions == {}
+
+def test_failed_navigation_releases_the_session(tmp_path):
+    async def broken(*args):
+        raise RuntimeError("page did not load")
+
+    agent, pool = make_agent(tmp_path, broken)
+    result = asyncio.run(agent.process_message({"type": "prepare_session"}))
+
+    assert result["status"] == "prepare_failed"
+    assert pool.released == [(1, True)]
+    assert agent.prepared_sessions == {}
+
+def test_cancelled_navigation_releases_the_session(tmp_path):
+    async def hang(*args):
+        await asyncio.Event().wait()
+
+    agent, pool = make_agent(tmp_path, hang)
+
+    async def scenario():
+        prepare = asyncio.create_task(agent.process_message({"type": "prepare_session"}))
+        while not pool.leased:
+            await asyncio.sleep(0)
+        prepare.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await prepare
+
+    asyncio.run(scenario())
+    assert pool.released == [(1, True)]
+    assert agent.prepared_sessions == {}
+
+def test_release_session_returns_an_unclaimed_session(tmp_path):
+    agent, pool = make_agent(tmp_path, browse)
+
+    async def scenario():
+        prepared = await agent.process_message({"type": "prepare_session"})
+        return await agent.process_message({"type": "release_session", "session_id": prepared["session_id"]})
+
+    assert asyncio.run(scenario())["status"] == "session_released"
+    assert pool.released == [(1, False)]
+    assert agent.prepared_sessions == {}
+
+def test_unclaimed_sessions_expire_after_the_ttl(tmp_path):
+    agent, pool = make_agent(tmp_path, browse, prepared_ttl=0.01)
+
+    async def scenario():
+        first = await agent.process_message({"type": "prepare_session"})
+        await asyncio.sleep(0.02)
+        second = await agent.process_message({"type": "prepare_session"})
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert pool.released == [(1, False)]
+    assert list(agent.prepared_sessions) == [second["session_id"]]
+    assert first["session_id"] != second["session_id"]
+
+def test_failed_add_to_cart_releases_the_prepared_session(tmp_path):
+    async def navigate_only(session, web_agent, task, *args):
+        if task == "add_items":
+            raise RuntimeError("item sold out")
+        return "navigated"
+
+    agent, pool = make_agent(tmp_path, navigate_only)
+
+    async def scenario():
+        prepared = await agent.process_message({"type": "prepare_session"})
+        return await agent.process_message({"type": "place_order", "order_details": ["Big Mac"],
+                                            "session_id": prepared["session_id"]})
+
+    assert asyncio.run(scenario())["status"] == "automation_failed"
+    assert pool.released == [(1, True)]